@@ -7,7 +7,10 @@ import time
 from copy import deepcopy
 from typing import Any, Dict, List, Optional
 import requests
+from app.utils import http_client
 from app.utils.files import check_img
+from app.utils.image_prep import get_image_preparer
+from app.utils.trace import lazy_json, tracing
 JIELONG_REFERER = "https://servicewechat.com/wx8027adefde914aa3/463/page-frame.html"
 JIELONG_REQUEST_REFERER = "https://servicewechat.com/wx8027adefde914aa3"
 JIELONG_USER_AGENT = (
@@ -92,7 +95,7 @@ def get_thread_id_by_url(url: str) -> str:
         raise RuntimeError("请先粘贴有效的接龙分享链接")
     logging.info("[JieLong] ===== PARSE SHARE URL =====")
     logging.info("[JieLong] GET %s", share_url)
-    response = requests.get(share_url, allow_redirects=False, timeout=12)
+    response = http_client.get(share_url, allow_redirects=False, timeout=12)
     location = str(response.headers.get("Location") or "").strip()
     logging.info("[JieLong] redirect: %s", location or "<empty>")
     if not location:
@@ -137,7 +140,7 @@ def _build_qr_openauth_headers() -> Dict[str, str]:
 def exchange_qr_login_token(code: str) -> Dict[str, Any]:
     params = {"code": normalize_login_code(code)}
     _log_request("POST", JIELONG_QR_OPENAUTH_URL, params=params)
-    response = requests.post(
+    response = http_client.post(
         JIELONG_QR_OPENAUTH_URL,
         headers=_build_qr_openauth_headers(),
         params=params,
@@ -157,7 +160,7 @@ def exchange_login_token(
 ) -> Dict[str, Any]:
     capture_payload = capture_payload or {}
     q_code_value = str(q_code or capture_payload.get("qCode") or "")
-    response = requests.post(
+    response = http_client.post(
         JIELONG_LOGIN_URL,
         headers=_build_login_headers(authorization="", capture_payload=capture_payload),
         data=json.dumps(
@@ -177,7 +180,7 @@ def exchange_login_token(
     return data
 def create_qr_login() -> Dict[str, str]:
     now_ms = int(time.time() * 1000)
-    response = requests.get(
+    response = http_client.get(
         JIELONG_QR_CONNECT_URL,
         headers={
             "accept": "application/xml, text/xml, */*; q=0.01",
@@ -230,12 +233,12 @@ def create_qr_login() -> Dict[str, str]:
         "qrcode_url": JIELONG_QR_CODE_URL.format(uuid=uuid),
     }
 def download_qrcode_image(qrcode_url: str) -> bytes:
-    response = requests.get(qrcode_url, timeout=12)
+    response = http_client.get(qrcode_url, timeout=12)
     response.raise_for_status()
     return response.content
 def poll_qr_login(uuid: str) -> Dict[str, Any]:
     try:
-        response = requests.get(
+        response = http_client.get(
             JIELONG_QR_POLL_URL,
             headers={
                 "accept": "*/*",
@@ -255,6 +258,7 @@ def poll_qr_login(uuid: str) -> Dict[str, Any]:
             "uuid": str(uuid or "").strip(),
             "_": int(time.time() * 1000),
         },
+        timeout=None,
     )
     except requests.exceptions.ReadTimeout:
         return {
@@ -326,22 +330,22 @@ def _normalize_api_error(message: str) -> str:
 
 
 def _log_request(method: str, url: str, *, params: Optional[Dict[str, Any]] = None, payload: Optional[Dict[str, Any]] = None, token: str = "") -> None:
+    if not tracing(logging.INFO):
+        return
     logging.info("[JieLong] ===== REQUEST =====")
     logging.info("[JieLong] %s %s", method, url)
     if params is not None:
-        logging.info("[JieLong] params: %s", json.dumps(params, ensure_ascii=False, separators=(",", ":")))
+        logging.info("[JieLong] params: %s", lazy_json(params))
     if payload is not None:
-        logging.info("[JieLong] body: %s", json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+        logging.info("[JieLong] body: %s", lazy_json(payload))
     if token:
         logging.info("[JieLong] authorization: %s", _mask_token(token))
 def _log_response(method: str, url: str, data: Any) -> None:
-    try:
-        rendered = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
-    except TypeError:
-        rendered = str(data)
+    if not tracing(logging.INFO):
+        return
     logging.info("[JieLong] ===== RESPONSE =====")
     logging.info("[JieLong] %s %s", method, url)
-    logging.info("[JieLong] data: %s", rendered)
+    logging.info("[JieLong] data: %s", lazy_json(data))
 def _build_headers(token: str, endpoint_key: str) -> Dict[str, str]:
     payload = JIELONG_ENDPOINTS[endpoint_key]["payload"]
     return {
@@ -365,7 +369,7 @@ def _request_json(endpoint_key: str, token: str, params: Optional[Dict[str, Any]
     endpoint = JIELONG_ENDPOINTS[endpoint_key]
     request_params = params or {}
     _log_request("GET", endpoint["url"], params=request_params, token=token)
-    response = requests.get(
+    response = http_client.get(
         endpoint["url"],
         headers=_build_headers(token, endpoint_key),
         params=request_params,
@@ -382,7 +386,7 @@ def _request_json(endpoint_key: str, token: str, params: Optional[Dict[str, Any]
 def _post_json(endpoint_key: str, token: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     endpoint = JIELONG_ENDPOINTS[endpoint_key]
     _log_request("POST", endpoint["url"], payload=payload, token=token)
-    response = requests.post(
+    response = http_client.post(
         endpoint["url"],
         headers=_build_headers(token, endpoint_key),
         data=json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
@@ -557,7 +561,7 @@ def build_local_media_files(image_paths: List[str]) -> List[Dict[str, Any]]:
             }
         )
     return result
-def upload_media_file(token: str, thread_id: int, file_info: Dict[str, Any]) -> Dict[str, Any]:
+def upload_media_file(token: str, thread_id: int, file_info: Dict[str, Any], prepared_image=None) -> Dict[str, Any]:
     local_path = str(file_info.get("LocalPath") or "").strip()
     if not local_path:
         raise RuntimeError("图片上传缺少本地文件路径")
@@ -565,14 +569,18 @@ def upload_media_file(token: str, thread_id: int, file_info: Dict[str, Any]) ->
     source_name = str(file_info.get("FileName") or file_info.get("Name") or os.path.basename(local_path)).strip()
     if not source_name:
         source_name = os.path.basename(local_path)
+    if prepared_image is None:
+        prepared_image = get_image_preparer().prepare(local_path)
+    source_name = prepared_image.file_name(os.path.splitext(source_name)[0])
     policy_resp = fetch_attachment_cos_upload_policy(token, thread_id, source_name)
     policy_data = policy_resp.get("Data") or {}
     upload_host = str(policy_data.get("Host") or "").strip()
     if not upload_host:
         raise RuntimeError("未获取到接龙图片上传地址")
-    mime = str(file_info.get("ContentType") or mimetypes.guess_type(local_path)[0] or "image/jpeg")
-    with open(local_path, "rb") as file_obj:
-        response = requests.post(
+    mime = str(prepared_image.mime or file_info.get("ContentType") or mimetypes.guess_type(local_path)[0] or "image/jpeg")
+    started = time.perf_counter()
+    with open(prepared_image.path, "rb") as file_obj:
+        response = http_client.post(
             upload_host,
             data={
                 "key": policy_data.get("Key") or "",
@@ -594,6 +602,7 @@ def upload_media_file(token: str, thread_id: int, file_info: Dict[str, Any]) ->
             },
             timeout=30,
         )
+    logging.info(f"📤 接龙图片上传 {prepared_image.size / 1024:.0f}KB，耗时 {(time.perf_counter() - started) * 1000:.0f}ms")
     response.raise_for_status()
     upload_data = response.json()
     if upload_data.get("Type") != "000001":
@@ -606,6 +615,17 @@ def prepare_submit_payload(token: str, payload: Dict[str, Any]) -> Dict[str, Any
     thread_id = int(prepared.get("ThreadId") or 0)
     if not thread_id:
         raise RuntimeError("未找到提交可用的 threadId")
+    # 先并行预处理全部待上传图片，再逐个上传
+    local_paths = [
+        str(file_info.get("LocalPath") or "").strip()
+        for record in prepared.get("RecordValues") or []
+        for file_info in record.get("Files") or []
+    ]
+    local_paths = list(dict.fromkeys(path for path in local_paths if path))
+    prepared_images = dict(zip(
+        local_paths,
+        get_image_preparer().prepare_many([check_img(path) for path in local_paths]),
+    ))
     for record in prepared.get("RecordValues") or []:
         files = record.get("Files") or []
         if not files:
@@ -615,7 +635,8 @@ def prepare_submit_payload(token: str, payload: Dict[str, Any]) -> Dict[str, Any
             if file_info.get("RelativePath") and not file_info.get("LocalPath"):
                 uploaded_files.append(file_info)
                 continue
-            uploaded_files.append(upload_media_file(token, thread_id, file_info))
+            local_path = str(file_info.get("LocalPath") or "").strip()
+            uploaded_files.append(upload_media_file(token, thread_id, file_info, prepared_images.get(local_path)))
         record["Files"] = uploaded_files
         record["HasValue"] = bool(
             record.get("HasValue")
@@ -1,11 +1,30 @@
 import logging
-
-import requests
-
-from app.config.common import XYB_VERSION, XYB_REFERER, AMAP_WEB_KEY
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app.config.common import (
+    AMAP_WEB_KEY,
+    PLAN_CACHE_REFRESH_SECONDS,
+    REGEO_HEDGE_DELAY_SECONDS,
+    REGEO_RACE_MODES,
+    XYB_REFERER,
+    XYB_VERSION,
+)
+from app.utils import http_client
 from app.utils.common import get_timestamp
-from app.utils.files import get_img_file, clear_session_cache
-from app.utils.params import get_header_token, get_device_code
+from app.utils.deadline import Deadline
+from app.utils.files import (
+    clear_session_cache,
+    get_img_file,
+    get_valid_session_cache,
+    save_session_cache,
+    save_session_plan,
+)
+from app.utils.geo_cache import get_provider_latency, get_regeo_cache
+from app.utils.params import get_device_code, get_header_token, get_request_signer
+from app.utils.trace import trace_request, trace_response
 
 TENCENT_MAP_KEY = "GOZBZ-E4L67-6WLXT-PSLBH-2WEZZ-LOFLE"
 
@@ -81,7 +100,7 @@ def _normalize_tencent_regeo(result):
     }
 
 
-def _regeo_tencent(userAgent, location, key=None):
+def _regeo_tencent(userAgent, location, key=None, deadline=None):
     url = "https://apis.map.qq.com/ws/geocoder/v1/"
     headers = {
         "xweb_xhr": "1",
@@ -94,9 +113,9 @@ def _regeo_tencent(userAgent, location, key=None):
         "get_poi": "1",
     }
     try:
-        logging.debug(f"馃洨锔?鍑嗗鍙戣捣璇锋眰銆倁rl:{url}, headers:{headers}, params:{params}")
-        response = requests.get(url, headers=headers, params=params, timeout=5)
-        logging.debug(f"馃摗 鏀跺埌鍝嶅簲:{response} {response.text}")
+        trace_request(url, headers=headers, params=params)
+        response = http_client.get(url, headers=headers, params=params, timeout=5, deadline=deadline)
+        trace_response(response)
         res = response.json()
         if response.status_code == 200 and res.get("status") == 0 and res.get("result"):
             regeocode = _normalize_tencent_regeo(res["result"])
@@ -106,15 +125,137 @@ def _regeo_tencent(userAgent, location, key=None):
             return regeocode
         raise RuntimeError(f"浣嶇疆瑙ｆ瀽澶辫触: {res}")
     except Exception as e:
-        logging.error(f"鑵捐鍦板浘鎺ュ彛璇锋眰澶辫触: {e}")
+        if deadline is None or not deadline.cancelled:
+            logging.error(f"鑵捐鍦板浘鎺ュ彛璇锋眰澶辫触: {e}")
         raise e
 
 
-def regeo(userAgent, location, provider="amap", map_keys=None):
-    map_keys = map_keys if isinstance(map_keys, dict) else {}
-    if _normalize_map_provider(provider) == "tencent":
-        return _regeo_tencent(userAgent, location, map_keys.get("tencent"))
+def _normalize_race_mode(mode):
+    mode = str(mode or "off").strip().lower()
+    return mode if mode in REGEO_RACE_MODES else "off"
+
+
+def _regeo_provider(provider, userAgent, location, map_keys, deadline=None):
+    if provider == "tencent":
+        return _regeo_tencent(userAgent, location, map_keys.get("tencent"), deadline=deadline)
+    return _regeo_amap(userAgent, location, map_keys.get("amap"), deadline=deadline)
+
+
+def _is_valid_regeo(regeocode):
+    component = regeocode.get("addressComponent") or {}
+    return bool(regeocode.get("formatted_address")) and bool(component.get("adcode"))
+
+
+def _regeo_race(userAgent, location, providers, map_keys, mode, hedge_delay=REGEO_HEDGE_DELAY_SECONDS,
+                deadline=None):
+    """
+    同时（race）或延迟（hedge）请求多个地图服务，返回最先得到的有效结果
+    :param providers: 按优先级排好序的服务列表
+    :return: (provider, regeocode)
+    """
+    latency = get_provider_latency()
+    parent = deadline or Deadline()
+
+    def timed(provider, child):
+        started = time.perf_counter()
+        try:
+            result = _regeo_provider(provider, userAgent, location, map_keys, deadline=child)
+        except Exception:
+            # 因对手先返回而被取消的请求不计入耗时统计
+            if not child.cancelled:
+                latency.record(provider, None)
+            raise
+        if not child.cancelled:
+            latency.record(provider, time.perf_counter() - started)
+        return result
+
+    executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="regeo")
+    futures = {}
+    children = []
+    queue = list(providers)
+    errors = []
+    fallback = None
+
+    def submit_next():
+        provider = queue.pop(0)
+        # 每个服务一个子预算，得到结果后取消其余请求并立即断开其连接
+        child = parent.child()
+        children.append(child)
+        future = executor.submit(timed, provider, child)
+        futures[future] = provider
+        return future
+
+    try:
+        submit_next()
+        if mode == "race":
+            while queue:
+                submit_next()
+
+        pending = set(futures)
+        while pending:
+            timeout = hedge_delay if queue else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                provider = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(f"{provider}: {e}")
+                    continue
+                if _is_valid_regeo(result):
+                    return provider, result
+                fallback = fallback or (provider, result)
+            if queue and (not done or not pending):
+                # 首选服务超过对冲延迟仍未返回，或已失败：补发下一个服务
+                logging.info(f"📍 {providers[0]} 未及时返回有效结果，补发请求 {queue[0]}")
+                pending.add(submit_next())
+    finally:
+        for child in children:
+            child.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if fallback:
+        return fallback
+    raise RuntimeError(f"位置解析失败: {'; '.join(errors)}")
 
+
+def regeo(userAgent, location, provider="amap", map_keys=None, use_cache=True, race_mode="off", deadline=None):
+    """
+    逆地理解析，命中 geohash 网格缓存时不发起网络请求
+    :param use_cache: 是否读写本地逆地理缓存
+    :param race_mode: off 仅请求首选服务；hedge 首选服务慢时补发另一个；race 同时请求
+    :param deadline: 任务时间预算（app.utils.deadline.Deadline），为空时使用默认超时
+    :return: 至少包含 formatted_address 与 addressComponent.adcode 的字典
+    """
+    map_keys = map_keys if isinstance(map_keys, dict) else {}
+    provider = _normalize_map_provider(provider)
+    race_mode = _normalize_race_mode(race_mode)
+    if race_mode == "off":
+        providers = [provider]
+    else:
+        others = [p for p in ("amap", "tencent") if p != provider]
+        providers = get_provider_latency().rank([provider, *others])
+
+    cache = get_regeo_cache() if use_cache else None
+    if cache is not None:
+        for candidate in providers:
+            cached = cache.get(candidate, location)
+            if cached:
+                logging.info(f"📍 解析位置(缓存): {cached['formatted_address']}")
+                return cached
+
+    if race_mode == "off":
+        regeocode = _regeo_provider(provider, userAgent, location, map_keys, deadline=deadline)
+    else:
+        provider, regeocode = _regeo_race(userAgent, location, providers, map_keys, race_mode, deadline=deadline)
+        logging.info(f"📍 地图服务 {provider} 最先返回")
+
+    if cache is not None:
+        cache.put(provider, location, regeocode)
+    return regeocode
+
+
+def _regeo_amap(userAgent, location, key=None, deadline=None):
     logging.info('正在调用高德地图解析经纬度...')
     url = "https://restapi.amap.com/v3/geocode/regeo"
     headers = {
@@ -122,17 +263,17 @@ def regeo(userAgent, location, provider="amap", map_keys=None):
         "Referer": XYB_REFERER,
         "User-Agent": userAgent,
     }
-    amap_key = _map_key(map_keys.get("amap"), AMAP_WEB_KEY)
+    amap_key = _map_key(key, AMAP_WEB_KEY)
     params = {
-        "s": "rsx", "platform": "WXJS", "logversion": "2.0", "extensions": "all",
+        "s": "rsx", "platform": "WXJS", "logversion": "2.0", "extensions": "base",
         "sdkversion": "1.2.0", "key": amap_key,
         "appname": amap_key,
         "location": f"{location['longitude']},{location['latitude']}",
     }
     try:
-        logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, params:{params}")
-        response = requests.get(url, headers=headers, params=params, timeout=5)
-        logging.debug(f"📡 收到响应:{response} {response.text}")
+        trace_request(url, headers=headers, params=params)
+        response = http_client.get(url, headers=headers, params=params, timeout=5, deadline=deadline)
+        trace_response(response)
         res = response.json()
         if 'regeocode' in res:
             regeocode = dict(res['regeocode'] or {})
@@ -145,41 +286,35 @@ def regeo(userAgent, location, provider="amap", map_keys=None):
         else:
             raise RuntimeError(f"位置解析失败: {res}")
     except Exception as e:
-        logging.error(f"高德接口请求失败: {e}")
+        if deadline is None or not deadline.cancelled:
+            logging.error(f"高德接口请求失败: {e}")
         raise e
 
 
-def get_plan(userAgent, args):
+def get_plan(userAgent, args, deadline=None):
     logging.info('正在获取实习计划...')
     url = "https://xcx.xybsyw.com/student/clock/GetPlan.action"
     data = {}
-    header_token = get_header_token(data)
-    headers = {
-        "v": XYB_VERSION,
-        "wechat": "1",
-        "xweb_xhr": "1",
-        "content-type": "application/x-www-form-urlencoded",
-        "encryptvalue": args['encryptValue'],
-        "n": header_token['n'],
-        "referer": XYB_REFERER,
-        "m": header_token['m'],
-        "s": header_token['s'],
-        "t": header_token['t'],
-        'user-agent': userAgent,
-    }
+    headers = get_request_signer().build_headers(
+        data,
+        user_agent=userAgent,
+        encrypt_value=args['encryptValue'],
+    )
     cookies = {
         "JSESSIONID": args['sessionId']
     }
 
     try:
-        logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
-        response = requests.post(url, headers=headers, cookies=cookies, data=data, timeout=5)
-        logging.debug(f"📡 收到响应:{response} {response.text}")
+        trace_request(url, headers=headers, data=data, cookies=cookies)
+        response = http_client.post(url, headers=headers, cookies=cookies, data=data, timeout=5, deadline=deadline)
+        trace_response(response)
         res = response.json()
         if not check_session_validity(res):
             handle_invalid_session()
             raise RuntimeError('❌ JSESSIONID已失效，请重新获取code')
         if 'data' in res and res['data']:
+            plan = summarize_plan(res['data'])
+            save_session_plan(args['sessionId'], plan_trainee_id(plan), plan)
             return res['data']
         else:
             raise RuntimeError(f"获取计划失败: {res.get('msg', 'Unknown error')}")
@@ -187,7 +322,63 @@ def get_plan(userAgent, args):
         raise RuntimeError(f"计划接口请求异常: {e}")
 
 
-def get_open_id(config, code):
+def summarize_plan(plan_data):
+    """只保留计划及 dateList 中的标量字段（含 traineeId），用于写入会话缓存"""
+    def scalars(item):
+        return {k: v for k, v in item.items() if isinstance(v, (str, int, float, bool)) or v is None}
+
+    summary = []
+    for plan in plan_data if isinstance(plan_data, list) else []:
+        if not isinstance(plan, dict):
+            continue
+        item = scalars(plan)
+        item['dateList'] = [scalars(d) for d in plan.get('dateList') or [] if isinstance(d, dict)]
+        summary.append(item)
+    return summary
+
+
+def plan_trainee_id(plan_data):
+    try:
+        return plan_data[0]['dateList'][0]['traineeId']
+    except (IndexError, KeyError, TypeError):
+        return None
+
+
+_plan_refreshing = threading.Lock()
+
+
+def _refresh_plan_in_background(userAgent, args):
+    if not _plan_refreshing.acquire(blocking=False):
+        return
+
+    def worker():
+        try:
+            get_plan(userAgent, args)
+            logging.debug("后台刷新实习计划完成")
+        except Exception as e:
+            logging.debug(f"后台刷新实习计划失败: {e}")
+        finally:
+            _plan_refreshing.release()
+
+    threading.Thread(target=worker, name="plan-refresh", daemon=True).start()
+
+
+def get_plan_cached(userAgent, args, deadline=None):
+    """
+    优先使用会话缓存中的实习计划，缓存过旧时在后台刷新
+    会话失效（205/未登录）时 handle_invalid_session 会清除整个会话缓存，计划随之失效
+    :return: 与 get_plan 相同结构的计划列表（缓存命中时为摘要）
+    """
+    cached = get_valid_session_cache()
+    if cached and cached.get('sessionId') == args.get('sessionId') and plan_trainee_id(cached.get('plan')):
+        if time.time() - (cached.get('planTimestamp') or 0) > PLAN_CACHE_REFRESH_SECONDS:
+            _refresh_plan_in_background(userAgent, dict(args))
+        logging.info('✅ 使用缓存的实习计划')
+        return cached['plan']
+    return get_plan(userAgent, args, deadline=deadline)
+
+
+def get_open_id(config, code, deadline=None):
     logging.info("正在获取open_id...")
     headers = {
         "v": XYB_VERSION,
@@ -201,9 +392,10 @@ def get_open_id(config, code):
     data = {"code": code}
 
     try:
-        logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}")
-        response = requests.post(url=url, headers=headers, data=data, allow_redirects=False, timeout=5)
-        logging.debug(f"📡 收到响应:{response} {response.text}")
+        trace_request(url, headers=headers, data=data)
+        response = http_client.post(url=url, headers=headers, data=data, allow_redirects=False, timeout=5,
+                                    deadline=deadline)
+        trace_response(response)
         res = response.json()
         if res.get('code') == '202':
             raise RuntimeError(f'code已失效，请重启小程序。接口响应：{res}')
@@ -212,48 +404,38 @@ def get_open_id(config, code):
         raise RuntimeError(f"获取OpenID失败: {e}")
 
 
-def wx_login(config, openIdData):
+def wx_login(config, openIdData, deadline=None):
     logging.info("正在进行微信登录...")
     data = {
         "openId": openIdData['openId'],
         "unionId": openIdData['unionId']
     }
-    header_token = get_header_token(data)
-    headers = {
-        "wechat": "1",
-        "v": XYB_VERSION,
-        "xweb_xhr": "1",
-        "content-type": "application/x-www-form-urlencoded",
-        "referer": XYB_REFERER,
-        "n": header_token['n'],
-        "devicecode": get_device_code(openId=openIdData['openId'], device=config['device']),
-        "encryptvalue": openIdData['encryptValue'],
-        "m": header_token['m'],
-        "s": header_token['s'],
-        "t": header_token['t'],
-        "user-agent": config['userAgent'],
-    }
+    headers = get_request_signer().build_headers(
+        data,
+        user_agent=config['userAgent'],
+        encrypt_value=openIdData['encryptValue'],
+        device_code=get_device_code(openId=openIdData['openId'], device=config['device']),
+    )
     cookies = {"JSESSIONID": openIdData['sessionId']}
     url = "https://xcx.xybsyw.com/login/login!wx.action"
     try:
-        logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
-        response = requests.post(url, headers=headers, cookies=cookies, data=data, timeout=5)
-        logging.debug(f"📡 收到响应:{response} {response.text}")
+        trace_request(url, headers=headers, data=data, cookies=cookies)
+        response = http_client.post(url, headers=headers, cookies=cookies, data=data, timeout=5, deadline=deadline)
+        trace_response(response)
         res = response.json()
         return res['data']
     except Exception as e:
         raise RuntimeError(f"登录失败: {e}")
 
 
-def login(config, use_cache=True):
+def login(config, use_cache=True, deadline=None):
     """
     登录函数，支持JSESSIONID缓存
     :param config: 配置信息
     :param use_cache: 是否使用缓存，如果为True且缓存有效则直接返回缓存
+    :param deadline: 任务时间预算，为空时使用默认超时
     :return: 登录结果字典
     """
-    from app.utils.files import get_valid_session_cache, save_session_cache
-
     # 尝试使用缓存
     if use_cache:
         cached = get_valid_session_cache()
@@ -272,10 +454,10 @@ def login(config, use_cache=True):
         raise RuntimeError('❌ Code为空，请重新获取！')
 
     ### 获取open_id、union_id等信息
-    openIdData = get_open_id(config=config, code=code)
+    openIdData = get_open_id(config=config, code=code, deadline=deadline)
 
     ### 获取登录参数encryptValue、sessionId
-    login_data = wx_login(config=config, openIdData=openIdData)
+    login_data = wx_login(config=config, openIdData=openIdData, deadline=deadline)
 
     result = {
         'openId': openIdData['openId'],
@@ -300,18 +482,20 @@ def login(config, use_cache=True):
 # ------------------------------拍照签到----------------------------------------
 
 
-def photo_sign_in_or_out(args, config, geo, traineeId, opt):
+def photo_sign_in_or_out(args, config, geo, traineeId, opt, policyData=None, deadline=None):
     # watermark_info(args=args, config=config, traineeId=traineeId)
     logging.info('正在执行拍照签到流程...')
 
-    policyData = commonPostPolicy(args=args, config=config)
+    if policyData is None:
+        policyData = commonPostPolicy(args=args, config=config, deadline=deadline)
 
     timestamp = get_timestamp()
 
     files = get_img_file(timestamp, opt.get('image_path'))
     try:
-        ossData = aliyun_OSS(files=files, timestamp=timestamp, policyData=policyData,config=config)
-        post_new(args=args, config=config, traineeId=traineeId, geo=geo, imgUrl=ossData['key'], opt=opt)
+        ossData = aliyun_OSS(files=files, timestamp=timestamp, policyData=policyData,config=config, deadline=deadline)
+        post_new(args=args, config=config, traineeId=traineeId, geo=geo, imgUrl=ossData['key'], opt=opt,
+                 deadline=deadline)
         # deliver_value(args=args, config=config, traineeId=traineeId)
     finally:
         file_obj = files.get("file", [None, None, None])[1]
@@ -319,38 +503,26 @@ def photo_sign_in_or_out(args, config, geo, traineeId, opt):
             file_obj.close()
 
 
-def watermark_info(args, config, traineeId):
+def watermark_info(args, config, traineeId, deadline=None):
     url = "https://xcx.xybsyw.com/student/clock/postNew!watermarkInfo.action"
 
     data = {
         "traineeId": str(traineeId)
     }
 
-    header_token = get_header_token(data)
-
-    headers = {
-        "content-type": "application/x-www-form-urlencoded",
-        "encryptvalue": args['encryptValue'],
-        "m": header_token['m'],
-        "n": header_token['n'],
-        "s": header_token['s'],
-        "t": header_token['t'],
-        "referer": XYB_REFERER,
-        "user-agent": config['userAgent'],
-        "v": XYB_VERSION,
-        "wechat": "1",
-        "xweb_xhr": "1"
-    }
+    headers = get_request_signer().build_headers(
+        data,
+        user_agent=config['userAgent'],
+        encrypt_value=args['encryptValue'],
+    )
     cookies = {"JSESSIONID": args['sessionId']}
 
-    logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
-    response = requests.post(url, headers=headers, cookies=cookies, data=data)
-    logging.debug(f"📡 收到响应:{response} {response.text}")
-
-    logging.info(f"{response} {response.text}")
+    trace_request(url, headers=headers, data=data, cookies=cookies)
+    response = http_client.post(url, headers=headers, cookies=cookies, data=data, deadline=deadline)
+    trace_response(response, level=logging.INFO)
 
 
-def commonPostPolicy(args, config):
+def commonPostPolicy(args, config, deadline=None):
     logging.info('正在获取上传凭证...')
     url = "https://xcx.xybsyw.com/uploadfile/commonPostPolicy.action"
 
@@ -360,30 +532,19 @@ def commonPostPolicy(args, config):
         "publicRead": "true"
     }
 
-    header_token = get_header_token(data)
-    headers = {
-        "content-type": "application/x-www-form-urlencoded",
-        "devicecode": get_device_code(openId=args['openId'], device=config['device']),
-        "encryptvalue": args['encryptValue'],
-        "m": header_token['m'],
-        "n": header_token['n'],
-        "referer": XYB_REFERER,
-        "s": header_token['s'],
-        "t": header_token['t'],
-        "user-agent": config['userAgent'],
-        "v": XYB_VERSION,
-        "wechat": "1",
-        "xweb_xhr": "1"
-    }
+    headers = get_request_signer().build_headers(
+        data,
+        user_agent=config['userAgent'],
+        encrypt_value=args['encryptValue'],
+        device_code=get_device_code(openId=args['openId'], device=config['device']),
+    )
     cookies = {
         "JSESSIONID": args['sessionId']
     }
 
-    logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
-    response = requests.post(url, headers=headers, cookies=cookies, data=data)
-    logging.debug(f"📡 收到响应:{response} {response.text}")
-
-    logging.info(f"{response} {response.text}")
+    trace_request(url, headers=headers, data=data, cookies=cookies)
+    response = http_client.post(url, headers=headers, cookies=cookies, data=data, deadline=deadline)
+    trace_response(response, level=logging.INFO)
 
     res = response.json()
     if response.status_code != 200 or res['code'] != "200":
@@ -392,7 +553,7 @@ def commonPostPolicy(args, config):
     return res['data']
 
 
-def aliyun_OSS(files, timestamp, policyData,config):
+def aliyun_OSS(files, timestamp, policyData,config, deadline=None):
     logging.info('正在上传至阿里云OSS...')
 
     url = policyData['host']
@@ -416,9 +577,12 @@ def aliyun_OSS(files, timestamp, policyData,config):
         "callback": policyData['callback'],
     }
 
-    logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, files:{files}")
-    response = requests.post(url, data=data, files=files, headers=headers)
-    logging.debug(f"📡 收到响应:{response} {response.text}")
+    trace_request(url, headers=headers, data=data, files=files)
+    started = time.perf_counter()
+    response = http_client.post(url, data=data, files=files, headers=headers, timeout=30, deadline=deadline)
+    upload_size = os.path.getsize(files["file"][1].name)
+    logging.info(f"📤 图片上传 {upload_size / 1024:.0f}KB，耗时 {(time.perf_counter() - started) * 1000:.0f}ms")
+    trace_response(response)
 
     if response.status_code != 200:
         raise RuntimeError(f"aliyun_OSS请求异常, {response} {response.text}")
@@ -427,7 +591,7 @@ def aliyun_OSS(files, timestamp, policyData,config):
     return res['vo']
 
 
-def post_new(args, config, traineeId, geo, imgUrl, opt):
+def post_new(args, config, traineeId, geo, imgUrl, opt, deadline=None):
     url = "https://xcx.xybsyw.com/student/clock/PostNew.action"
 
     data = {
@@ -448,65 +612,47 @@ def post_new(args, config, traineeId, geo, imgUrl, opt):
         "addressId": "null"
     }
 
-    header_token = get_header_token(data)
-    headers = {
-        "content-type": "application/x-www-form-urlencoded",
-        "devicecode": get_device_code(openId=args['openId'], device=config['device']),
-        "encryptvalue": args['encryptValue'],
-        "m": header_token['m'],
-        "n": header_token['n'],
-        "referer": XYB_REFERER,
-        "s": header_token['s'],
-        "t": header_token['t'],
-        "user-agent": config['userAgent'],
-        "v": XYB_VERSION,
-        "wechat": "1",
-        "xweb_xhr": "1"
-    }
+    headers = get_request_signer().build_headers(
+        data,
+        user_agent=config['userAgent'],
+        encrypt_value=args['encryptValue'],
+        device_code=get_device_code(openId=args['openId'], device=config['device']),
+    )
     cookies = {"JSESSIONID": args['sessionId']}
 
-    logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
-    response = requests.post(url, headers=headers, cookies=cookies, data=data)
-    logging.debug(f"📡 收到响应:{response} {response.text}")
+    trace_request(url, headers=headers, data=data, cookies=cookies)
+    response = http_client.post(url, headers=headers, cookies=cookies, data=data, deadline=deadline)
+    trace_response(response)
 
     res = response.json()
     if response.status_code != 200 or res['code'] != "200":
         raise RuntimeError(f"post_new请求异常, {response} {response.text}")
 
 
-def deliver_value(args, config, traineeId):
+def deliver_value(args, config, traineeId, deadline=None):
     url = "https://xcx.xybsyw.com/student/DeliverValue!post.action"
 
     data = {
         "traineeId": str(traineeId)
     }
 
-    header_token = get_header_token(data)
-    headers = {
-        "content-type": "application/x-www-form-urlencoded",
-        "encryptvalue": args['encryptValue'],
-        "m": header_token['m'],
-        "n": header_token['n'],
-        "referer": XYB_REFERER,
-        "s": header_token['s'],
-        "t": header_token['t'],
-        "user-agent": config['userAgent'],
-        "v": XYB_VERSION,
-        "wechat": "1",
-        "xweb_xhr": "1"
-    }
+    headers = get_request_signer().build_headers(
+        data,
+        user_agent=config['userAgent'],
+        encrypt_value=args['encryptValue'],
+    )
     cookies = {"JSESSIONID": args['sessionId']}
 
-    logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
-    response = requests.post(url, headers=headers, cookies=cookies, data=data)
-    logging.debug(f"📡 收到响应:{response} {response.text}")
+    trace_request(url, headers=headers, data=data, cookies=cookies)
+    response = http_client.post(url, headers=headers, cookies=cookies, data=data, deadline=deadline)
+    trace_response(response)
 
     res = response.json()
     if response.status_code != 200 or res['code'] != "200":
         raise RuntimeError(f"deliver_value请求异常, {response} {response.text}")
 
 
-def simple_sign_in_or_out(args, geo, traineeId, config, opt):
+def simple_sign_in_or_out(args, geo, traineeId, config, opt, deadline=None):
     logging.info(f'正在调用接口进行: {opt["action"]}...')
     url = "https://xcx.xybsyw.com/student/clock/Post.action"
     device = config['device']
@@ -528,9 +674,9 @@ def simple_sign_in_or_out(args, geo, traineeId, config, opt):
     cookies = {"JSESSIONID": args['sessionId']}
 
     try:
-        logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
-        response = requests.post(url, data=data, headers=headers, cookies=cookies, timeout=5)
-        logging.debug(f"📡 收到响应:{response} {response.text}")
+        trace_request(url, headers=headers, data=data, cookies=cookies)
+        response = http_client.post(url, data=data, headers=headers, cookies=cookies, timeout=5, deadline=deadline)
+        trace_response(response)
         res = response.json()
 
         if not check_session_validity(res):
@@ -573,28 +719,19 @@ def load_blog_year(args, config):
         "traineeId": str(args.get('traineeId', ''))
     }
 
-    header_token = get_header_token(data)
-    headers = {
-        "content-type": "application/x-www-form-urlencoded",
-        "encryptvalue": args['encryptValue'],
-        "m": header_token['m'],
-        "n": header_token['n'],
-        "referer": XYB_REFERER,
-        "s": header_token['s'],
-        "t": header_token['t'],
-        "user-agent": config['userAgent'],
-        "v": XYB_VERSION,
-        "wechat": "1",
-        "xweb_xhr": "1"
-    }
+    headers = get_request_signer().build_headers(
+        data,
+        user_agent=config['userAgent'],
+        encrypt_value=args['encryptValue'],
+    )
     cookies = {
         "JSESSIONID": args['sessionId']
     }
 
     try:
-        logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
-        response = requests.post(url, headers=headers, cookies=cookies, data=data, timeout=10)
-        logging.debug(f"📡 收到响应:{response} {response.text}")
+        trace_request(url, headers=headers, data=data, cookies=cookies)
+        response = http_client.post(url, headers=headers, cookies=cookies, data=data, timeout=10)
+        trace_response(response)
         res = response.json()
 
         if not check_session_validity(res):
@@ -622,28 +759,19 @@ def load_blog_date(args, config, year, month):
         "id": ""
     }
 
-    header_token = get_header_token(data)
-    headers = {
-        "content-type": "application/x-www-form-urlencoded",
-        "encryptvalue": args['encryptValue'],
-        "m": header_token['m'],
-        "n": header_token['n'],
-        "referer": XYB_REFERER,
-        "s": header_token['s'],
-        "t": header_token['t'],
-        "user-agent": config['userAgent'],
-        "v": XYB_VERSION,
-        "wechat": "1",
-        "xweb_xhr": "1"
-    }
+    headers = get_request_signer().build_headers(
+        data,
+        user_agent=config['userAgent'],
+        encrypt_value=args['encryptValue'],
+    )
     cookies = {
         "JSESSIONID": args['sessionId']
     }
 
     try:
-        logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
-        response = requests.post(url, headers=headers, cookies=cookies, data=data, timeout=10)
-        logging.debug(f"📡 收到响应:{response} {response.text}")
+        trace_request(url, headers=headers, data=data, cookies=cookies)
+        response = http_client.post(url, headers=headers, cookies=cookies, data=data, timeout=10)
+        trace_response(response)
         res = response.json()
 
         if not check_session_validity(res):
@@ -678,29 +806,20 @@ def submit_blog(args, config, blog_title, blog_body, start_date, end_date, blog_
         "blogId": "undefined"
     }
 
-    header_token = get_header_token(data)
-    headers = {
-        "content-type": "application/x-www-form-urlencoded",
-        "devicecode": get_device_code(openId=args['openId'], device=config['device']),
-        "encryptvalue": args['encryptValue'],
-        "m": header_token['m'],
-        "n": header_token['n'],
-        "referer": XYB_REFERER,
-        "s": header_token['s'],
-        "t": header_token['t'],
-        "user-agent": config['userAgent'],
-        "v": XYB_VERSION,
-        "wechat": "1",
-        "xweb_xhr": "1"
-    }
+    headers = get_request_signer().build_headers(
+        data,
+        user_agent=config['userAgent'],
+        encrypt_value=args['encryptValue'],
+        device_code=get_device_code(openId=args['openId'], device=config['device']),
+    )
     cookies = {
         "JSESSIONID": args['sessionId']
     }
 
     try:
-        logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
-        response = requests.post(url, headers=headers, cookies=cookies, data=data, timeout=10)
-        logging.debug(f"📡 收到响应:{response} {response.text}")
+        trace_request(url, headers=headers, data=data, cookies=cookies)
+        response = http_client.post(url, headers=headers, cookies=cookies, data=data, timeout=10)
+        trace_response(response)
         res = response.json()
 
         if not check_session_validity(res):
@@ -733,21 +852,12 @@ def xyb_completion(args, config, prompt, on_delta=None):
         "type": "0",
         "aiSessionMsgType": "4"
     }
-    header_token = get_header_token(data)
-    headers = {
-        "content-type": "application/x-www-form-urlencoded",
-        "devicecode": get_device_code(openId=args['openId'], device=config['device']),
-        "encryptvalue": args['encryptValue'],
-        "m": header_token['m'],
-        "n": header_token['n'],
-        "referer": XYB_REFERER,
-        "s": header_token['s'],
-        "t": header_token['t'],
-        "user-agent": config['userAgent'],
-        "v": XYB_VERSION,
-        "wechat": "1",
-        "xweb_xhr": "1"
-    }
+    headers = get_request_signer().build_headers(
+        data,
+        user_agent=config['userAgent'],
+        encrypt_value=args['encryptValue'],
+        device_code=get_device_code(openId=args['openId'], device=config['device']),
+    )
     cookies = {
         "JSESSIONID": args['sessionId']
     }
@@ -755,7 +865,7 @@ def xyb_completion(args, config, prompt, on_delta=None):
 
     try:
         import json
-        response = requests.post(url, data=data, headers=headers, cookies=cookies, timeout=60)
+        response = http_client.post(url, data=data, headers=headers, cookies=cookies, timeout=60)
         res = response.json()
 
         if res.get('code') == '200' and 'data' in res:
@@ -783,30 +893,21 @@ def blog_list(args, config, page, blogType="1"):
         "reviewStatus": "null",
         "page": str(page)
     }
-    header_token = get_header_token(data)
-    headers = {
-        "content-type": "application/x-www-form-urlencoded",
-        "devicecode": get_device_code(openId=args['openId'], device=config['device']),
-        "encryptvalue": args['encryptValue'],
-        "m": header_token['m'],
-        "n": header_token['n'],
-        "referer": XYB_REFERER,
-        "s": header_token['s'],
-        "t": header_token['t'],
-        "user-agent": config['userAgent'],
-        "v": XYB_VERSION,
-        "wechat": "1",
-        "xweb_xhr": "1"
-    }
+    headers = get_request_signer().build_headers(
+        data,
+        user_agent=config['userAgent'],
+        encrypt_value=args['encryptValue'],
+        device_code=get_device_code(openId=args['openId'], device=config['device']),
+    )
     cookies = {
         "JSESSIONID": args['sessionId']
     }
     url = "https://xcx.xybsyw.com/student/blog/BlogList.action"
 
     try:
-        logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
-        response = requests.post(url, headers=headers, cookies=cookies, data=data, timeout=10)
-        logging.debug(f"📡 收到响应:{response} {response.text}")
+        trace_request(url, headers=headers, data=data, cookies=cookies)
+        response = http_client.post(url, headers=headers, cookies=cookies, data=data, timeout=10)
+        trace_response(response)
         res = response.json()
 
         if not check_session_validity(res):
@@ -49,6 +49,40 @@ API_URL = "https://langoo.cn"
 
 # 代理地址
 MITM_PROXY = "127.0.0.1:13140"
+# mitm 运行方式："subprocess" 独立进程运行 mitmdump；"inprocess" 在本进程线程内运行 DumpMaster
+MITM_ENGINE = "subprocess"
+# 只解密 addon 中声明的目标域名，其余 TLS 连接透传（False 时解密全部，便于排查）
+MITM_TLS_PASSTHROUGH = True
+# mitm 生命周期："always" 常驻；"on_demand" 获取 code 时启动，空闲 MITM_IDLE_SHUTDOWN_SECONDS 后停止
+MITM_LIFECYCLE = "always"
+MITM_IDLE_SHUTDOWN_SECONDS = 300
+# on_demand 模式下，定时打卡需要新 code 时提前多少秒预热 mitm
+MITM_PREWARM_SECONDS = 15
+
+# HTTP 连接池：按 host 复用 keep-alive 连接
+HTTP_POOL_CONNECTIONS = 8
+HTTP_POOL_MAXSIZE = 8
+HTTP_MAX_RETRIES = 0
+# 未显式指定 timeout 的请求使用的默认超时（连接, 读取），单位秒
+HTTP_DEFAULT_TIMEOUT = (5, 15)
+# 是否读取系统/环境变量代理；API 请求默认直连，避免在切换系统代理期间绕回本机 mitm
+HTTP_TRUST_ENV = False
+# 请求跟踪日志：关闭后 API 模块不再记录请求参数和响应体；响应体只解码前 BODY_LIMIT 字节
+HTTP_TRACE_ENABLED = True
+HTTP_TRACE_BODY_LIMIT = 2048
+# 跟踪日志中需要脱敏的字段名（不区分大小写）
+HTTP_TRACE_REDACT_KEYS = (
+    "JSESSIONID", "sessionId", "encryptValue", "openId", "unionId", "devicecode", "authorization",
+    "cookie", "token", "key", "appname", "signature", "policy", "OSSAccessKeyId",
+)
+
+# 系统代理状态缓存：后端支持变更通知时（Windows 注册表）仅按长间隔兜底刷新，否则按短间隔刷新
+PROXY_STATE_REFRESH_SECONDS = 5
+PROXY_STATE_NOTIFY_REFRESH_SECONDS = 60
+# 抓取 code 时的系统代理方式："global" 全局代理到 mitm；"pac" 系统指向本机 PAC，只有抓取域名经过 mitm
+PROXY_MODE = "global"
+PAC_SERVER_HOST = "127.0.0.1"
+PAC_SERVER_PORT = 13142
 
 # code 本地接收服务（保留兼容）
 CODE_RECEIVER_HOST = "127.0.0.1"
@@ -81,6 +115,8 @@ MITM_RESOURCE_DIR = os.path.join(RES_DIR, "mitm")
 MITM_DIR = os.path.join(USER_DATA_DIR, "mitm")
 MITM_CONF_DIR = os.path.join(MITM_DIR, "conf")
 MITM_CERT_STATE_FILE = os.path.join(USER_DATA_DIR, "config", "mitm_cert_state.json")
+# 系统信任库（certutil / security）查询间隔；安装、清理证书或证书文件变化时会立即重新查询
+CERT_TRUST_CHECK_INTERVAL_SECONDS = 300
 
 # 配置文件目录（你如果想放 resources/config/ 也可以）
 CONFIG_FILE = os.path.join(RES_DIR, "config", "config.json")
@@ -101,9 +137,40 @@ JOURNAL_HISTORY_FILE = os.path.join(JOURNAL_DIR, "history.json")
 # 日志目录
 LOG_DIR = os.path.join(RES_DIR, "logs")
 PACKET_LOG_FILE = os.path.join(LOG_DIR, "mitm_packet.log")
+# 界面日志：低于该级别的记录不进入界面；缓冲写满丢弃最旧记录；每帧最多刷新一次；控制台最多保留的行数
+GUI_LOG_LEVEL = "INFO"
+GUI_LOG_BUFFER_SIZE = 2000
+GUI_LOG_FRAME_MS = 50
+GUI_LOG_MAX_BLOCKS = 5000
+# 应用日志文件：后台线程写入，按大小轮转；导出日志时按时间范围从这些文件中读取
+APP_LOG_FILE = os.path.join(LOG_DIR, "app.log")
+APP_LOG_LEVEL = "INFO"
+APP_LOG_MAX_BYTES = 2 * 1024 * 1024
+APP_LOG_BACKUPS = 5
 
 # 会话缓存文件
 SESSION_CACHE_FILE = os.path.join(RES_DIR, "cache", "session_cache.json")
+# 会话缓存中的实习计划超过该时长后，命中缓存时会在后台刷新
+PLAN_CACHE_REFRESH_SECONDS = 30 * 60
+# 单次签到流程（登录到提交）的总时间预算，每个 HTTP 请求的超时不超过剩余预算
+SIGN_TASK_BUDGET_SECONDS = 90
+
+# 逆地理解析缓存：按 geohash 网格复用解析结果（精度 7 约为 150m 见方）
+REGEO_CACHE_FILE = os.path.join(RES_DIR, "cache", "regeo_cache.json")
+REGEO_CACHE_PRECISION = 7
+REGEO_CACHE_TTL_SECONDS = 7 * 24 * 3600
+REGEO_CACHE_MAX_ENTRIES = 256
+# 地图服务竞速：off 仅请求首选服务；hedge 首选服务超过延迟未返回时再请求另一个；race 同时请求
+REGEO_RACE_MODES = ("off", "hedge", "race")
+REGEO_HEDGE_DELAY_SECONDS = 0.8
+REGEO_LATENCY_FILE = os.path.join(RES_DIR, "cache", "regeo_latency.json")
+
+# 上传图片预处理：长边缩放到 MAX_EDGE 以内，按 QUALITY 重新编码为 JPEG 并去除元数据
+IMAGE_PREP_CACHE_DIR = os.path.join(RES_DIR, "cache", "img_prepared")
+IMAGE_PREP_MAX_EDGE = 1600
+IMAGE_PREP_JPEG_QUALITY = 82
+IMAGE_PREP_CACHE_MAX_FILES = 32
+IMAGE_PREP_MAX_WORKERS = 2
 
 # mitm addons
 ADDONS_DIR = os.path.join(MITM_RESOURCE_DIR, "addons")
@@ -1,33 +1,156 @@
 import logging
+import queue
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
 
-from PySide6.QtCore import Signal, QObject
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtGui import QColor, QTextCharFormat, QTextCursor
+from PySide6.QtWidgets import QPlainTextEdit
 
+from app.config.common import GUI_LOG_BUFFER_SIZE, GUI_LOG_FRAME_MS, GUI_LOG_LEVEL, GUI_LOG_MAX_BLOCKS
 
-class QTextEditLogger(logging.Handler, QObject):
-    append_signal = Signal(str, str)
+LEVEL_COLORS = {
+    "DEBUG": "#888888",
+    "INFO": "#58D68D",
+    "WARNING": "#F4D03F",
+    "ERROR": "#EC7063",
+    "CRITICAL": "#EC7063",
+}
+DEFAULT_COLOR = "#E0E0E0"
 
-    def __init__(self, widget):
+
+class LogRingBuffer:
+    """线程安全的有界缓冲：写满后丢弃最旧的记录，UI 每帧一次性取走"""
+
+    def __init__(self, capacity: int = GUI_LOG_BUFFER_SIZE):
+        self._items = deque(maxlen=capacity)
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def push(self, item) -> bool:
+        """
+        :return: 写入前缓冲是否为空（为空时需要唤醒 UI）
+        """
+        with self._lock:
+            was_empty = not self._items
+            if len(self._items) == self._items.maxlen:
+                self._dropped += 1
+            self._items.append(item)
+            return was_empty
+
+    def drain(self) -> tuple[list, int]:
+        with self._lock:
+            items = list(self._items)
+            dropped = self._dropped
+            self._items.clear()
+            self._dropped = 0
+        return items, dropped
+
+
+class _BufferHandler(logging.Handler):
+    """在监听线程中格式化记录并写入缓冲，不直接触碰界面"""
+
+    def __init__(self, buffer: LogRingBuffer, on_pending):
         super().__init__()
-        QObject.__init__(self)
-        self.widget = widget
-        self.append_signal.connect(self.append_text)
+        self.buffer = buffer
+        self.on_pending = on_pending
 
     def emit(self, record):
-        msg = self.format(record)
-        self.append_signal.emit(record.levelname, msg)
-
-    def append_text(self, level, msg):
-        color = "#E0E0E0"
-        if level == "INFO":
-            color = "#58D68D"
-        elif level == "WARNING":
-            color = "#F4D03F"
-        elif level == "ERROR":
-            color = "#EC7063"
-        elif level == "DEBUG":
-            color = "#888888"
-
-        sb = self.widget.verticalScrollBar()
+        try:
+            msg = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        if self.buffer.push((record.levelname, msg)):
+            self.on_pending()
+
+
+class LogConsole(QPlainTextEdit):
+    """只读日志控制台：按级别着色，行数有上限，旧内容自动淘汰"""
+
+    def __init__(self, max_blocks: int = GUI_LOG_MAX_BLOCKS, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_blocks)
+        self._formats = {}
+
+    def _format(self, level: str) -> QTextCharFormat:
+        fmt = self._formats.get(level)
+        if fmt is None:
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(LEVEL_COLORS.get(level, DEFAULT_COLOR)))
+            self._formats[level] = fmt
+        return fmt
+
+    def append_records(self, records, dropped: int = 0):
+        if not records and not dropped:
+            return
+        sb = self.verticalScrollBar()
         at_bottom = sb.value() >= (sb.maximum() - 10)
-        self.widget.append(f'<span style="color:{color}; font-family:Consolas; font-size:10pt;">{msg}</span>')
-        if at_bottom: sb.setValue(sb.maximum())
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        first = self.document().isEmpty()
+        if dropped:
+            records = [("WARNING", f"… 日志过多，已丢弃 {dropped} 条")] + list(records)
+        for level, msg in records:
+            if not first:
+                cursor.insertText("\n")
+            first = False
+            cursor.insertText(msg, self._format(level))
+        cursor.endEditBlock()
+        if at_bottom:
+            sb.setValue(sb.maximum())
+
+
+class GuiLogPipeline(QObject):
+    """GUI 日志管道：QueueHandler 只负责入队，监听线程格式化后写入环形缓冲，
+    UI 线程每帧最多刷新一次，一次编辑追加所有新记录。"""
+
+    _pending = Signal()
+
+    def __init__(self, view: LogConsole, level=GUI_LOG_LEVEL, capacity: int = GUI_LOG_BUFFER_SIZE,
+                 frame_ms: int = GUI_LOG_FRAME_MS, formatter: logging.Formatter | None = None, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.buffer = LogRingBuffer(capacity)
+        self.sink = _BufferHandler(self.buffer, self._pending.emit)
+        self.sink.setFormatter(formatter or logging.Formatter('%(asctime)s - %(message)s', "%H:%M:%S"))
+        self.queue = queue.SimpleQueue()
+        # 低于界面级别的记录在调用线程直接丢弃，不做任何格式化
+        self.handler = QueueHandler(self.queue)
+        self.handler.setLevel(level)
+        self.listener = QueueListener(self.queue, self.sink)
+        self._logger = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(frame_ms)
+        self._timer.timeout.connect(self.flush)
+        self._pending.connect(self._schedule)
+
+    def set_level(self, level):
+        self.handler.setLevel(level)
+
+    def install(self, logger: logging.Logger | None = None):
+        self._logger = logger or logging.getLogger()
+        self._logger.addHandler(self.handler)
+        self.listener.start()
+
+    def uninstall(self):
+        """可在任意线程调用：摘除 handler 并停止监听线程"""
+        if self._logger is None:
+            return
+        self._logger.removeHandler(self.handler)
+        self._logger = None
+        self.listener.stop()
+
+    def _schedule(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        records, dropped = self.buffer.drain()
+        self.view.append_records(records, dropped)
@@ -0,0 +1,146 @@
+import os
+import re
+
+from PySide6.QtGui import QColor, QSyntaxHighlighter, QTextCharFormat, QTextCursor
+from PySide6.QtWidgets import QPlainTextEdit
+
+
+def _format(color: str, bold: bool = False) -> QTextCharFormat:
+    fmt = QTextCharFormat()
+    fmt.setForeground(QColor(color))
+    if bold:
+        fmt.setFontWeight(700)
+    return fmt
+
+
+class PacketLogHighlighter(QSyntaxHighlighter):
+    """按行内标记着色，替代逐行拼接 HTML"""
+
+    RULES = (
+        (re.compile(r"^\d{2}:\d{2}:\d{2}"), _format("#5C6370")),
+        (re.compile(r"\[MITM\]\[HOST\].*"), _format("#8A93B8")),
+        (re.compile(r"\[MITM\]\[REQ\]"), _format("#7FDBFF", bold=True)),
+        (re.compile(r"\[MITM\]\[RESP?\]"), _format("#58D68D", bold=True)),
+        (re.compile(r"\[MITM\]\[ERR\].*"), _format("#EC7063")),
+        (re.compile(r"(送达|捕获)[^|]*"), _format("#F4D03F", bold=True)),
+        (re.compile(r"失败.*"), _format("#EC7063")),
+    )
+
+    def highlightBlock(self, text: str):
+        for pattern, fmt in self.RULES:
+            for match in pattern.finditer(text):
+                self.setFormat(match.start(), match.end() - match.start(), fmt)
+
+
+class PacketLogConsole(QPlainTextEdit):
+    """只读的抓包日志控制台：行数有上限，每次刷新只做一次文档编辑"""
+
+    def __init__(self, max_blocks: int = 2000, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_blocks)
+        self.highlighter = PacketLogHighlighter(self.document())
+
+    def append_lines(self, text: str):
+        text = text.rstrip("\n")
+        if not text:
+            return
+        sb = self.verticalScrollBar()
+        at_bottom = sb.value() >= (sb.maximum() - 10)
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        if not self.document().isEmpty():
+            cursor.insertText("\n")
+        cursor.insertText(text)
+        cursor.endEditBlock()
+        if at_bottom:
+            sb.setValue(sb.maximum())
+
+
+class LogTail:
+    """增量读取日志文件新增的完整行。
+
+    每次最多读取 max_bytes；落后超过 max_backlog 时直接跳到末尾附近（控制台行数有限，旧内容也显示不下）。
+    文件轮转（inode 变化）时先从 .1 读完旧文件剩余的行再从新文件开头继续；
+    文件被截断（同一文件变小）时从头开始。
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024, max_backlog: int = 512 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_backlog = max_backlog
+        self._pos = 0
+        self._identity = None
+
+    def reset(self):
+        self._pos = 0
+        self._identity = None
+
+    def read(self) -> tuple[bool, str]:
+        """
+        :return: (文件是否被截断、需要清空显示, 新增的完整行)
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False, ""
+        identity = (stat.st_dev, stat.st_ino)
+        truncated = False
+        drained = ""
+        if identity != self._identity:
+            if self._identity is not None:
+                drained = self._drain_rotated()
+            self._identity = identity
+            self._pos = 0
+        elif stat.st_size < self._pos:
+            truncated = True
+            self._pos = 0
+        return truncated, drained + self._read_new(self.path, stat.st_size)
+
+    def _drain_rotated(self) -> str:
+        """轮转后旧文件改名为 path.1，读完上次位置之后剩余的行"""
+        rotated = f"{self.path}.1"
+        try:
+            stat = os.stat(rotated)
+        except OSError:
+            return ""
+        if (stat.st_dev, stat.st_ino) != self._identity:
+            return ""
+        parts = []
+        while self._pos < stat.st_size:
+            pos = self._pos
+            parts.append(self._read_new(rotated, stat.st_size))
+            if self._pos == pos:
+                break
+        return "".join(parts)
+
+    def _read_new(self, path: str, size: int) -> str:
+        if size <= self._pos:
+            return ""
+        skipped = 0
+        if size - self._pos > self.max_backlog:
+            skipped = size - self.max_bytes - self._pos
+            self._pos = size - self.max_bytes
+
+        try:
+            with open(path, "rb") as f:
+                f.seek(self._pos)
+                chunk = f.read(self.max_bytes)
+        except OSError:
+            return ""
+
+        if skipped:
+            # 跳到中间位置时丢弃第一行不完整的部分
+            newline = chunk.find(b"\n")
+            chunk = chunk[newline + 1:] if newline >= 0 else b""
+            self._pos += newline + 1 if newline >= 0 else 0
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return ""
+        self._pos += end + 1
+        text = chunk[:end + 1].decode("utf-8", errors="replace")
+        if skipped:
+            text = f"… 已跳过 {skipped // 1024} KB 日志\n{text}"
+        return text
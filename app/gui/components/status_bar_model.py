@@ -0,0 +1,124 @@
+from datetime import datetime
+
+from app.config.common import MITM_PROXY
+
+OK_COLOR = "#58D68D"
+WARN_COLOR = "#F4D03F"
+ERROR_COLOR = "#EC7063"
+PLAIN_COLOR = "#FFF"
+
+
+def _render_time(v):
+    return f"🕔 当前时间: <span style='color:{PLAIN_COLOR}'>{v['time']}</span>"
+
+
+def _render_pid(v):
+    return f"🟢 PID: <span style='color:{OK_COLOR}'>{v['pid']}</span>"
+
+
+def _render_net(v):
+    net_type = str(v['net'])
+    net_color = ERROR_COLOR if net_type == "拨号上网" else OK_COLOR
+    return f"📶 网络: <span style='color:{net_color}'>{net_type}</span>"
+
+
+def _render_speed(v):
+    return (
+        f"🚀 速率: <span style='color:{OK_COLOR}'>↓ {v.get('speed_d', 0):.0f}K</span>"
+        f" <span style='color:{OK_COLOR}'>↑ {v.get('speed_u', 0):.0f}K</span>"
+    )
+
+
+def _render_ip(v):
+    return f"💻 IP: <span style='color:{PLAIN_COLOR}'>{v['ip']}</span>"
+
+
+def _render_proxy(v):
+    proxy = v['proxy']
+    if proxy == MITM_PROXY:
+        return f"🔗 代理: <span style='color:{OK_COLOR}'>{proxy}</span>"
+    if proxy:
+        return f"🔗 代理: <span style='color:{WARN_COLOR}'>{proxy}</span>"
+    return f"🔗 代理: <span style='color:{WARN_COLOR}'>直连</span>"
+
+
+def _render_mitm(v):
+    if v['mitm']:
+        return f"🛡️ Mitm: <span style='color:{OK_COLOR}'>运行中</span>"
+    return f"⚙️ Mitm: <span style='color:{WARN_COLOR}'>未启动</span>"
+
+
+def _render_cert(v):
+    cert_detail = v.get('cert_detail') or ""
+    detail_text = f"（{cert_detail}）" if cert_detail else ""
+    if v['cert']:
+        return f"🔒 证书: <span style='color:{OK_COLOR}'>正常{detail_text}</span>"
+    return f"⚠️ 证书: <span style='color:{WARN_COLOR}'>异常{detail_text}</span>"
+
+
+def _render_session(v):
+    cache = v['session'] or {}
+    session_id = cache.get('sessionId')
+    if not session_id:
+        return f"🗝️ SESSION: <span style='color:{WARN_COLOR}'>未获取</span>"
+    masked_id = f"...{session_id[-4:]}" if len(session_id) >= 4 else session_id
+    timestamp = cache.get('timestamp', 0)
+    if not timestamp:
+        return f"🗝️ SESSION: <span style='color:{OK_COLOR}'>{masked_id}</span>"
+    time_str = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+    return (
+        f"🗝️ SESSION: <span style='color:{OK_COLOR}'>{masked_id}</span> "
+        f"<span style='color:{OK_COLOR}'>({time_str})</span>"
+    )
+
+
+# 标签 -> (依赖的字段, 渲染函数)
+STATUS_FIELDS = {
+    'time': (('time',), _render_time),
+    'pid': (('pid',), _render_pid),
+    'net': (('net',), _render_net),
+    'speed': (('speed_d', 'speed_u'), _render_speed),
+    'ip': (('ip',), _render_ip),
+    'proxy': (('proxy',), _render_proxy),
+    'mitm': (('mitm',), _render_mitm),
+    'cert': (('cert', 'cert_detail'), _render_cert),
+    'session': (('session',), _render_session),
+}
+
+
+class StatusBarModel:
+    """状态栏视图模型：保存每个字段的最新值和每个标签最后一次渲染的 HTML。
+
+    apply() 只重新渲染依赖字段发生变化的标签，且仅在 HTML 与上次不同时才 setText，
+    避免每秒重排全部富文本标签。
+    """
+
+    def __init__(self, labels: dict):
+        self.labels = labels
+        self._values = {}
+        self._rendered = {}
+
+    def apply(self, data: dict) -> int:
+        """
+        :param data: MonitorThread 发送的（部分）字段
+        :return: 实际调用 setText 的标签数
+        """
+        changed = {key for key, value in data.items() if key not in self._values or self._values[key] != value}
+        if not changed:
+            return 0
+        self._values.update({key: data[key] for key in changed})
+
+        updated = 0
+        for name, (fields, render) in STATUS_FIELDS.items():
+            label = self.labels.get(name)
+            if label is None or changed.isdisjoint(fields):
+                continue
+            if fields[0] not in self._values:
+                continue
+            html = render(self._values)
+            if self._rendered.get(name) == html:
+                continue
+            self._rendered[name] = html
+            label.setText(html)
+            updated += 1
+        return updated
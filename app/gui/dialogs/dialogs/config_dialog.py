@@ -218,9 +218,18 @@ class ConfigDialog(QDialog):
         map_provider_combo.currentIndexChanged.connect(lambda: setattr(self, 'is_modified', True))
         form.addRow("地图服务", map_provider_combo)
         self.inputs['mapProvider'] = map_provider_combo
+        map_race_combo = NoWheelComboBox()
+        map_race_combo.addItems(["off", "hedge", "race"])
+        map_race_mode = str(input_conf.get('mapRaceMode', 'off')).strip().lower()
+        idx = map_race_combo.findText(map_race_mode)
+        map_race_combo.setCurrentIndex(idx if idx >= 0 else 0)
+        map_race_combo.currentIndexChanged.connect(lambda: setattr(self, 'is_modified', True))
+        form.addRow("地图竞速", map_race_combo)
+        self.inputs['mapRaceMode'] = map_race_combo
         self.add_row(form, "高德 API Key", "amapApiKey", map_api_keys.get('amap', ''))
         self.add_row(form, "腾讯 API Key", "tencentApiKey", map_api_keys.get('tencent', ''))
         self.add_tip(form, "提示：地图 Key 留空时使用内置默认 Key；填入后优先使用自定义 Key。")
+        self.add_tip(form, "提示：地图竞速 hedge 表示首选服务较慢时自动请求另一个服务，race 表示同时请求两个服务，取最先返回的结果。")
         self.add_tip(form, "提示：安卓选 android，iPhone 选 ios。")
 
         ua_row = QHBoxLayout()
@@ -313,6 +322,7 @@ class ConfigDialog(QDialog):
             inp['userAgent'] = build_user_agent(device)
             inp['location'] = {'longitude': self.inputs['lng'].text(), 'latitude': self.inputs['lat'].text()}
             inp['mapProvider'] = self.get_input_value('mapProvider').lower() or 'amap'
+            inp['mapRaceMode'] = self.get_input_value('mapRaceMode').lower() or 'off'
             map_api_keys = {
                 'amap': self.get_input_value('amapApiKey'),
                 'tencent': self.get_input_value('tencentApiKey')
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+from PySide6.QtCore import QDateTime, Qt
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QDateTimeEdit,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QVBoxLayout,
+)
+
+from app.gui.components.no_wheel_combo import NoWheelComboBox
+
+RANGE_PRESETS = (
+    ("最近 1 小时", timedelta(hours=1)),
+    ("最近 24 小时", timedelta(days=1)),
+    ("最近 7 天", timedelta(days=7)),
+    ("全部日志", None),
+    ("自定义时间段", "custom"),
+)
+
+
+class LogExportDialog(QDialog):
+    """选择导出日志的时间范围以及是否 gzip 压缩"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("导出日志")
+        self.resize(380, 280)
+        self._setup_style()
+        self._setup_ui()
+
+    def _setup_style(self):
+        self.setStyleSheet("""
+            QDialog {
+                background: #10121B;
+                color: #E8EBFF;
+            }
+            QLabel, QCheckBox {
+                color: #8F95B2;
+                font-weight: 600;
+            }
+            QComboBox, QDateTimeEdit {
+                background: #181B2A;
+                border: 1px solid #2D3250;
+                border-radius: 10px;
+                padding: 8px 12px;
+                color: #F5F6FF;
+            }
+            QComboBox:focus, QDateTimeEdit:focus {
+                border-color: #6E7BFF;
+            }
+            QDateTimeEdit:disabled {
+                color: #5A5F7A;
+            }
+            QPushButton#SubmitBtn {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #4E8BFF, stop:1 #A24DFF);
+                color: white;
+                border: none;
+                border-radius: 22px;
+                padding: 10px 18px;
+                font-weight: bold;
+                letter-spacing: 1px;
+            }
+        """)
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
+
+        self.cb_range = NoWheelComboBox()
+        self.cb_range.addItems([label for label, _ in RANGE_PRESETS])
+        self.cb_range.currentIndexChanged.connect(self._on_range_changed)
+        layout.addWidget(QLabel("时间范围"))
+        layout.addWidget(self.cb_range)
+
+        now = QDateTime.currentDateTime()
+        self.dt_start = QDateTimeEdit(now.addSecs(-3600))
+        self.dt_end = QDateTimeEdit(now)
+        for edit in (self.dt_start, self.dt_end):
+            edit.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+            edit.setCalendarPopup(True)
+        row = QHBoxLayout()
+        row.addWidget(self.dt_start)
+        row.addWidget(QLabel("至"))
+        row.addWidget(self.dt_end)
+        layout.addLayout(row)
+
+        self.chk_gzip = QCheckBox("gzip 压缩（.gz）")
+        layout.addWidget(self.chk_gzip)
+        layout.addStretch()
+
+        btn_row = QHBoxLayout()
+        btn_row.addStretch()
+        btn_cancel = QPushButton("取消")
+        btn_cancel.clicked.connect(self.reject)
+        btn_ok = QPushButton("选择保存位置")
+        btn_ok.setObjectName("SubmitBtn")
+        btn_ok.setCursor(Qt.PointingHandCursor)
+        btn_ok.clicked.connect(self.accept)
+        btn_row.addWidget(btn_cancel)
+        btn_row.addWidget(btn_ok)
+        layout.addLayout(btn_row)
+
+        self._on_range_changed(self.cb_range.currentIndex())
+
+    def _on_range_changed(self, index: int):
+        custom = RANGE_PRESETS[index][1] == "custom"
+        self.dt_start.setEnabled(custom)
+        self.dt_end.setEnabled(custom)
+
+    def selected_range(self) -> tuple[datetime | None, datetime | None]:
+        preset = RANGE_PRESETS[self.cb_range.currentIndex()][1]
+        if preset == "custom":
+            return self.dt_start.dateTime().toPython(), self.dt_end.dateTime().toPython()
+        if preset is None:
+            return None, None
+        return datetime.now() - preset, None
+
+    @property
+    def compress(self) -> bool:
+        return self.chk_gzip.isChecked()
@@ -16,7 +16,7 @@ class LoadYearDataThread(QThread):
             if self.isInterruptionRequested():
                 return
             with open("debug_crash.txt", "a", encoding="utf-8") as f: f.write("THREAD STEP 1: Thread started\n")
-            from app.apis.xybsyw import login, get_plan, load_blog_year
+            from app.apis.xybsyw import login, get_plan_cached, load_blog_year
 
             # 优先复用打开周记页时已经校验过的登录信息，避免重复触发登录流程日志。
             login_args = dict(self.login_args) if self.login_args else None
@@ -36,7 +36,7 @@ class LoadYearDataThread(QThread):
 
             # 获取traineeId
             with open("debug_crash.txt", "a", encoding="utf-8") as f: f.write("THREAD STEP 4: Getting plan\n")
-            plan_data = get_plan(userAgent=self.config['input']['userAgent'], args=login_args)
+            plan_data = get_plan_cached(userAgent=self.config['input']['userAgent'], args=login_args)
             if self.isInterruptionRequested():
                 return
             with open("debug_crash.txt", "a", encoding="utf-8") as f: f.write("THREAD STEP 5: Plan got\n")
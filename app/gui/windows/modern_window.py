@@ -7,27 +7,20 @@ import time
 import ctypes
 from datetime import datetime, timedelta
 
-from PySide6.QtCore import Qt, QUrl, QTimer
+from PySide6.QtCore import QEvent, Qt, QUrl, QTimer
 from PySide6.QtGui import QDesktopServices, QAction, QIcon
 from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QFrame, QVBoxLayout, QLabel, QGridLayout, QPushButton, \
-    QButtonGroup, QRadioButton, QProgressBar, QSizePolicy, QMessageBox, QApplication, QTextEdit, QDialog, QFileDialog, \
+    QButtonGroup, QRadioButton, QProgressBar, QSizePolicy, QMessageBox, QApplication, QDialog, QFileDialog, \
     QMenu, QSystemTrayIcon, QStyle, QStackedWidget
 
 from app.config.common import QQ_GROUP, PROJECT_VERSION, CONFIG_FILE, MITM_PROXY, PROJECT_NAME, PROJECT_GITHUB, \
-    PACKET_LOG_FILE
-from app.gui.components.log_viewer import QTextEditLogger
+    PACKET_LOG_FILE, MITM_PREWARM_SECONDS
+from app.gui.components.log_viewer import GuiLogPipeline, LogConsole
+from app.gui.components.packet_log_console import LogTail, PacketLogConsole
+from app.gui.components.status_bar_model import StatusBarModel
 from app.gui.components.toast import ToastManager
-from app.gui.dialogs.dialogs.auto_clock_config_dialog import AutoClockConfigDialog
-from app.gui.dialogs.dialogs.config_dialog import ConfigDialog
-from app.gui.dialogs.feedback_dialog import FeedbackDialog
-from app.gui.dialogs.image_manager_dialog import ImageManagerDialog
-from app.gui.dialogs.jielong_dialog import JieLongDialog
-from app.gui.dialogs.photo_sign_dialog import PhotoSignDialog
-from app.gui.dialogs.sponsor_dialog import SponsorSubmitDialog
-from app.gui.dialogs.update_dialog import UpdateDialog
-from app.gui.dialogs.weekly_journal.WeeklyJournalDialog import WeeklyJournalDialog
 from app.mitm.cert_state import summarize_cert_state
-from app.mitm.service import MitmService
+from app.mitm.lifecycle import get_mitm_lifecycle
 from app.utils.commands import (
     check_port_listening,
     flush_dns_cache,
@@ -39,11 +32,30 @@ from app.utils.commands import (
     open_system_proxy_settings,
     open_terminal,
 )
-from app.utils.files import validate_config, read_config
-from app.utils.pushplus import notify_pushplus
+from app.utils.files import validate_config, read_config, session_valid_until
+from app.utils.lazy import LazyRegistry
+from app.utils.session_store import get_session_store
 from app.workers.monitor_thread import MonitorThread
-from app.workers.sign_task import SignTaskThread, GetCodeAndSessionThread
-from app.workers.update_worker import UpdateCheckWorker
+
+
+# 对话框、接龙页面和工作线程（连带 requests/gmssl/qrcode 等依赖）在首次使用时才导入，不占用启动到首帧的时间
+lazy = LazyRegistry({
+    "AutoClockConfigDialog": "app.gui.dialogs.dialogs.auto_clock_config_dialog:AutoClockConfigDialog",
+    "ConfigDialog": "app.gui.dialogs.dialogs.config_dialog:ConfigDialog",
+    "FeedbackDialog": "app.gui.dialogs.feedback_dialog:FeedbackDialog",
+    "ImageManagerDialog": "app.gui.dialogs.image_manager_dialog:ImageManagerDialog",
+    "JieLongDialog": "app.gui.dialogs.jielong_dialog:JieLongDialog",
+    "LogExportDialog": "app.gui.dialogs.log_export_dialog:LogExportDialog",
+    "PhotoSignDialog": "app.gui.dialogs.photo_sign_dialog:PhotoSignDialog",
+    "SponsorSubmitDialog": "app.gui.dialogs.sponsor_dialog:SponsorSubmitDialog",
+    "UpdateDialog": "app.gui.dialogs.update_dialog:UpdateDialog",
+    "WeeklyJournalDialog": "app.gui.dialogs.weekly_journal.WeeklyJournalDialog:WeeklyJournalDialog",
+    "notify_pushplus": "app.utils.pushplus:notify_pushplus",
+    "SignTaskThread": "app.workers.sign_task:SignTaskThread",
+    "GetCodeAndSessionThread": "app.workers.sign_task:GetCodeAndSessionThread",
+    "UpdateCheckWorker": "app.workers.update_worker:UpdateCheckWorker",
+    "LogExportWorker": "app.workers.log_export_worker:LogExportWorker",
+})
 
 
 class ModernWindow(QMainWindow):
@@ -73,16 +85,20 @@ class ModernWindow(QMainWindow):
         self._tray_tip_shown = False
         self.tray_icon = None
         self._last_action_from_tray = False
-        self._packet_log_pos = 0
+        self._packet_log_tail = LogTail(PACKET_LOG_FILE)
         self.packet_log_view = None
         self.packet_log_timer = QTimer(self)
         self.packet_log_timer.setInterval(1200)
         self.packet_log_timer.timeout.connect(self._refresh_packet_log)
+        self._session_version = None
 
-        # 自动守护：monitor 会调用 mitm.start()
-        self.mitm = MitmService()
-        self.monitor = MonitorThread(self.mitm)
+        # 自动守护：monitor 按生命周期模式拉起 mitm（按需模式下空闲后停止）
+        self.mitm_lifecycle = get_mitm_lifecycle()
+        self.mitm = self.mitm_lifecycle.service
+        self._mitm_prewarm_keys = set()
+        self.monitor = MonitorThread(self.mitm_lifecycle)
         self.monitor.data_signal.connect(self.update_status)
+        self.monitor.cert_signal.connect(self._render_cert_status)
         self.monitor.start()
 
         self.setup_style()
@@ -262,6 +278,7 @@ class ModernWindow(QMainWindow):
             l.setTextFormat(Qt.RichText)
             l.setMinimumHeight(22)
             self.lbls[k] = l
+        self.status_model = StatusBarModel(self.lbls)
 
         mon_grid.addWidget(self.lbls['time'], 0, 0)
         mon_grid.addWidget(self.lbls['pid'], 0, 1)
@@ -400,10 +417,7 @@ class ModernWindow(QMainWindow):
 
         l_vbox.addLayout(btn_row2)
 
-        self.jielong_page = JieLongDialog(self)
-
         self.left_stack.addWidget(home_page)
-        self.left_stack.addWidget(self.jielong_page)
         self.show_home_page()
 
         # ------------------------- Right Panel -------------------------
@@ -445,8 +459,7 @@ class ModernWindow(QMainWindow):
         hh.addWidget(btn_clear)
         r_vbox.addWidget(head)
 
-        self.log = QTextEdit()
-        self.log.setReadOnly(True)
+        self.log = LogConsole()
         self.log.setObjectName("LogView")
         r_vbox.addWidget(self.log)
 
@@ -465,8 +478,7 @@ class ModernWindow(QMainWindow):
         packet_hh.addWidget(btn_clear_packet)
         r_vbox.addWidget(packet_head)
 
-        self.packet_log_view = QTextEdit()
-        self.packet_log_view.setReadOnly(True)
+        self.packet_log_view = PacketLogConsole()
         self.packet_log_view.setObjectName("PacketLogView")
         self.packet_log_view.setMaximumHeight(140)
         r_vbox.addWidget(self.packet_log_view)
@@ -475,9 +487,8 @@ class ModernWindow(QMainWindow):
         hbox.addWidget(right, 65)
         root.addLayout(hbox, 1)
 
-        self.log_h = QTextEditLogger(self.log)
-        self.log_h.setFormatter(logging.Formatter('%(asctime)s - %(message)s', "%H:%M:%S"))
-        logging.getLogger().addHandler(self.log_h)
+        self.log_h = GuiLogPipeline(self.log, parent=self)
+        self.log_h.install()
         self._init_packet_log()
 
         # 初始化JSESSIONID显示
@@ -498,42 +509,16 @@ class ModernWindow(QMainWindow):
     def _refresh_packet_log(self):
         if self.packet_log_view is None:
             return
-        if not os.path.exists(PACKET_LOG_FILE):
-            return
-
-        try:
-            file_size = os.path.getsize(PACKET_LOG_FILE)
-            if file_size < self._packet_log_pos:
-                self._packet_log_pos = 0
-                self.packet_log_view.clear()
-
-            if file_size == self._packet_log_pos:
-                return
-
-            with open(PACKET_LOG_FILE, "r", encoding="utf-8") as f:
-                f.seek(self._packet_log_pos)
-                new_content = f.read()
-                self._packet_log_pos = f.tell()
-        except OSError:
-            return
-
-        if not new_content.strip():
-            return
-
-        sb = self.packet_log_view.verticalScrollBar()
-        at_bottom = sb.value() >= (sb.maximum() - 10)
-        for line in new_content.splitlines():
-            self.packet_log_view.append(
-                f'<span style="color:#7FDBFF; font-family:Consolas; font-size:9.5pt;">{line}</span>'
-            )
-
-        if at_bottom:
-            sb.setValue(sb.maximum())
+        # 每次最多读取固定字节数，新增内容一次性追加，界面开销与日志大小无关
+        truncated, text = self._packet_log_tail.read()
+        if truncated:
+            self.packet_log_view.clear()
+        self.packet_log_view.append_lines(text)
 
     def clear_packet_log(self):
         if self.packet_log_view is not None:
             self.packet_log_view.clear()
-        self._packet_log_pos = 0
+        self._packet_log_tail.reset()
         try:
             os.makedirs(os.path.dirname(PACKET_LOG_FILE), exist_ok=True)
             with open(PACKET_LOG_FILE, "w", encoding="utf-8"):
@@ -648,6 +633,9 @@ class ModernWindow(QMainWindow):
             self.update_worker.requestInterruption()
             self._stop_thread_fast(self.update_worker)
 
+        if hasattr(self, "log_h"):
+            self.log_h.uninstall()
+
     @staticmethod
     def _stop_thread_fast(thread, soft_timeout_ms: int = 350, hard_timeout_ms: int = 250):
         if not thread or not thread.isRunning():
@@ -681,7 +669,7 @@ class ModernWindow(QMainWindow):
         reply = QMessageBox.question(
             self,
             "确认操作",
-            "确定要清空日志吗？此操作不可恢复！",
+            "确定要清空日志显示吗？已写入日志文件的记录仍可通过导出日志获取。",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
@@ -1034,51 +1022,40 @@ class ModernWindow(QMainWindow):
         self._render_cert_status(cert_ok, cert_detail)
 
     def update_status(self, data):
-        self.lbls['time'].setText(f"🕔 当前时间: <span style='color:#FFF'>{datetime.now().strftime('%H:%M:%S')}</span>")
-        self.lbls['pid'].setText(f"🟢 PID: <span style='color:#58D68D'>{os.getpid()}</span>")
-
-        # 使用后台线程传来的数据
-        net_type = str(data['net'])
-        net_color = "#EC7063" if net_type == "拨号上网" else "#58D68D"
-        self.lbls['net'].setText(f"📶 网络: <span style='color:{net_color}'>{net_type}</span>")
-
-        self.lbls['speed'].setText(
-            f"🚀 速率: <span style='color:#58D68D'>↓ {data['speed_d']:.0f}K</span>"
-            f" <span style='color:#58D68D'>↑ {data['speed_u']:.0f}K</span>"
-        )
-
-        self.lbls['ip'].setText(f"💻 IP: <span style='color:#FFF'>{data['ip']}</span>")
+        # 后台线程只发送发生变化的字段，视图模型再跳过渲染结果未变的标签
+        self.status_model.apply(data)
+        if 'time' in data:
+            # 更新session显示，确保清除过期session后状态栏能及时更新
+            self._update_session_display()
 
-        proxy = data['proxy']
-        if proxy == "127.0.0.1:13140":
-            self.lbls['proxy'].setText(f"🔗 代理: <span style='color:#58D68D'>{proxy}</span>")
-        elif proxy:
-            self.lbls['proxy'].setText(f"🔗 代理: <span style='color:#F4D03F'>{proxy}</span>")
-        else:
-            self.lbls['proxy'].setText("🔗 代理: <span style='color:#F4D03F'>直连</span>")
+    def _sync_monitor_mode(self):
+        """把窗口可见性与任务状态同步给 MonitorThread，决定各监控项的采样频率"""
+        if not hasattr(self, "monitor"):
+            return
+        self.monitor.set_visible(self.isVisible() and not self.isMinimized())
+        self.monitor.set_capture_active(self.is_running or self.is_getting_code)
 
-        self.lbls['mitm'].setText(
-            "🛡️ Mitm: <span style='color:#58D68D'>运行中</span>" if data['mitm']
-            else "⚙️ Mitm: <span style='color:#F4D03F'>未启动</span>"
-        )
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._sync_monitor_mode()
 
-        self._render_cert_status(data['cert'], data.get('cert_detail', ''))
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._sync_monitor_mode()
 
-        # 更新session显示，确保清除过期session后状态栏能及时更新
-        self._update_session_display()
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self._sync_monitor_mode()
 
     def _render_cert_status(self, cert_ok: bool, cert_detail: str = ""):
-        detail_text = f"（{cert_detail}）" if cert_detail else ""
-        if cert_ok:
-            self.lbls['cert'].setText(f"🔒 证书: <span style='color:#58D68D'>正常{detail_text}</span>")
-        else:
-            self.lbls['cert'].setText(f"⚠️ 证书: <span style='color:#F4D03F'>异常{detail_text}</span>")
+        self.status_model.apply({'cert': cert_ok, 'cert_detail': cert_detail})
 
     def open_config(self):
         if not os.path.exists(CONFIG_FILE):
             ToastManager.instance().show("config.json 文件不存在", "error")
             return
-        ConfigDialog(CONFIG_FILE, self).exec()
+        lazy.ConfigDialog(CONFIG_FILE, self).exec()
         self._load_auto_clock_settings()
         return None
 
@@ -1086,14 +1063,14 @@ class ModernWindow(QMainWindow):
         if not os.path.exists(CONFIG_FILE):
             ToastManager.instance().show("config.json 文件不存在", "error")
             return
-        if AutoClockConfigDialog(CONFIG_FILE, self).exec() == QDialog.Accepted:
+        if lazy.AutoClockConfigDialog(CONFIG_FILE, self).exec() == QDialog.Accepted:
             self._load_auto_clock_settings()
 
     def show_support(self):
-        SponsorSubmitDialog(self).exec()  # SupportDialog(self).exec()
+        lazy.SponsorSubmitDialog(self).exec()  # SupportDialog(self).exec()
 
     def show_feedback(self):
-        FeedbackDialog(self).exec()
+        lazy.FeedbackDialog(self).exec()
 
     def flush_dns(self):
         if flush_dns_cache():
@@ -1124,7 +1101,11 @@ class ModernWindow(QMainWindow):
         ToastManager.instance().show(f"QQ群号 {QQ_GROUP} 已复制", "success")
 
     def _switch_left_page(self, page_name: str):
-        if page_name == "jielong" and self.jielong_page is not None:
+        if page_name == "jielong":
+            if self.jielong_page is None:
+                # 接龙页面首次打开时才创建
+                self.jielong_page = lazy.JieLongDialog(self)
+                self.left_stack.addWidget(self.jielong_page)
             self.left_stack.setCurrentWidget(self.jielong_page)
             self.btn_nav_jielong.setChecked(True)
             return
@@ -1138,23 +1119,34 @@ class ModernWindow(QMainWindow):
         self._switch_left_page("jielong")
 
     def open_image_manager(self):
-        ImageManagerDialog(self).exec()
+        lazy.ImageManagerDialog(self).exec()
 
     def export_log(self):
-        """导出日志到文件"""
-        filename, _ = QFileDialog.getSaveFileName(self, "导出日志", "log.txt", "Text Files (*.txt);;All Files (*)")
-        if filename:
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(self.log.toPlainText())
-                ToastManager.instance().show("日志导出成功", "success")
-            except Exception as e:
-                ToastManager.instance().show(f"导出失败: {str(e)}", "error")
+        """按时间范围从日志文件导出（界面清空后历史仍在）"""
+        if hasattr(self, 'log_export_worker') and self.log_export_worker.isRunning():
+            ToastManager.instance().show("正在导出日志，请稍候...", "info")
+            return
+        dialog = lazy.LogExportDialog(self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        start, end = dialog.selected_range()
+        compress = dialog.compress
+        default_name = f"log_{datetime.now():%Y%m%d_%H%M%S}.txt" + (".gz" if compress else "")
+        file_filter = "Gzip Files (*.gz);;All Files (*)" if compress else "Text Files (*.txt);;All Files (*)"
+        filename, _ = QFileDialog.getSaveFileName(self, "导出日志", default_name, file_filter)
+        if not filename:
+            return
+        # 大范围导出可能耗时数秒，放到工作线程，完成后在界面线程提示
+        self.log_export_worker = lazy.LogExportWorker(filename, start, end, compress)
+        self.log_export_worker.result_signal.connect(
+            lambda success, message: ToastManager.instance().show(message, "success" if success else "error")
+        )
+        self.log_export_worker.start()
 
     def check_update(self, silent: bool = False):
         """检查更新"""
         if not silent:
-            UpdateDialog({}, self).exec()
+            lazy.UpdateDialog({}, self).exec()
             return
 
         if hasattr(self, 'update_worker') and self.update_worker.isRunning():
@@ -1163,7 +1155,7 @@ class ModernWindow(QMainWindow):
             return
 
         worker_mode = "latest" if silent else "center"
-        self.update_worker = UpdateCheckWorker(PROJECT_GITHUB, PROJECT_VERSION, mode=worker_mode)
+        self.update_worker = lazy.UpdateCheckWorker(PROJECT_GITHUB, PROJECT_VERSION, mode=worker_mode)
         self.update_worker.result_signal.connect(
             lambda success, data: self.on_update_check_result(success, data, silent)
         )
@@ -1188,7 +1180,7 @@ class ModernWindow(QMainWindow):
                 ToastManager.instance().show(f"发现新版本：{latest_version}", "info")
             return
 
-        UpdateDialog(data, self).exec()
+        lazy.UpdateDialog(data, self).exec()
 
     def open_weekly_journal(self):
         """打开周记对话框，先检查jsessionid是否有效"""
@@ -1207,7 +1199,7 @@ class ModernWindow(QMainWindow):
             except Exception:
                 ToastManager.instance().show("JSESSIONID已失效，请先执行签到操作以获取新的登录信息", "warning")
                 return
-            # 尝试获取计划来验证session
+            # 尝试获取计划来验证session：必须真正请求接口，会话缓存中的计划无法反映服务端是否已失效
             get_plan(userAgent=config['input']['userAgent'], args=login_args)
         except Exception as e:
             error_msg = str(e)
@@ -1222,7 +1214,7 @@ class ModernWindow(QMainWindow):
             self.weekly_journal_dialog.deleteLater()
 
         try:
-            self.weekly_journal_dialog = WeeklyJournalDialog(config.get("model", {}), login_args, self)
+            self.weekly_journal_dialog = lazy.WeeklyJournalDialog(config.get("model", {}), login_args, self)
             self.weekly_journal_dialog.show()
         except Exception as e:
             import traceback
@@ -1255,6 +1247,7 @@ class ModernWindow(QMainWindow):
             return
 
         self.is_getting_code = True
+        self._sync_monitor_mode()
         self.btn_get_code.setText("停止获取")
         self.btn_get_code.setStyleSheet(
             "background: #C0392B; color: white; border-radius: 20px; padding: 10px; font-size: 12pt; font-weight: bold; border: none;")
@@ -1263,7 +1256,7 @@ class ModernWindow(QMainWindow):
         for btn in self.grp.buttons():
             btn.setEnabled(False)
 
-        self.code_worker = GetCodeAndSessionThread(CONFIG_FILE)
+        self.code_worker = lazy.GetCodeAndSessionThread(CONFIG_FILE)
         self.code_worker.finished_signal.connect(self.on_get_code_done)
         self.code_worker.start()
 
@@ -1274,6 +1267,7 @@ class ModernWindow(QMainWindow):
         if success and not notify_from_tray:
             self._bring_to_front_retry(tries=4, delay_ms=350)
         self.is_getting_code = False
+        self._sync_monitor_mode()
         self.btn_get_code.setEnabled(True)
         self.btn_get_code.setText("获取code")
         # 无论成功失败，都恢复原始样式
@@ -1332,26 +1326,12 @@ class ModernWindow(QMainWindow):
 
 
     def _update_session_display(self):
-        """更新JSESSIONID显示"""
-        from app.utils.files import load_session_cache
-        from datetime import datetime
-
-        cache = load_session_cache()
-        if cache and cache.get('sessionId'):
-            session_id = cache['sessionId']
-            timestamp = cache.get('timestamp', 0)
-            masked_id = f"...{session_id[-4:]}" if len(session_id) >= 4 else session_id
-            if timestamp:
-                dt = datetime.fromtimestamp(timestamp)
-                time_str = dt.strftime("%Y-%m-%d %H:%M")
-                self.lbls['session'].setText(
-                    f"🗝️ SESSION: <span style='color:#58D68D'>{masked_id}</span> "
-                    f"<span style='color:#58D68D'>({time_str})</span>"
-                )
-            else:
-                self.lbls['session'].setText(f"🗝️ SESSION: <span style='color:#58D68D'>{masked_id}</span>")
-        else:
-            self.lbls['session'].setText("🗝️ SESSION: <span style='color:#F4D03F'>未获取</span>")
+        """更新JSESSIONID显示（读取内存中的会话缓存，缓存写入后才重新渲染）"""
+        store = get_session_store()
+        if store.version == self._session_version:
+            return
+        self._session_version = store.version
+        self.status_model.apply({'session': store.get()})
 
     def _mode_to_option(self, mode: str, image_path: str = None) -> dict:
         mode_map = {
@@ -1525,6 +1505,7 @@ class ModernWindow(QMainWindow):
 
         self.current_run_source = source
         self.is_running = True
+        self._sync_monitor_mode()
         self.btn_run.setText("停止执行")
         self.btn_run.setStyleSheet("background: #C0392B;")
         self.prog.show()
@@ -1534,7 +1515,7 @@ class ModernWindow(QMainWindow):
 
         logging.info("")
         logging.info(f"{'=' * 10} TASK {source.upper()} {datetime.now().strftime('%H:%M')} {'=' * 10}")
-        self.worker = SignTaskThread(CONFIG_FILE, opt)
+        self.worker = lazy.SignTaskThread(CONFIG_FILE, opt)
         self.worker.finished_signal.connect(self.on_done)
         self.worker.start()
         return True
@@ -1556,6 +1537,7 @@ class ModernWindow(QMainWindow):
                 self.auto_clock_next_trigger[key] = next_dt
 
             if now < next_dt:
+                self._schedule_mitm_prewarm(key, next_dt, now)
                 continue
 
             try:
@@ -1585,6 +1567,26 @@ class ModernWindow(QMainWindow):
                 self._log_next_auto_clock_times()
                 break
 
+    def _schedule_mitm_prewarm(self, key: str, next_dt: datetime, now: datetime):
+        """按需模式下，定时打卡到点时需要新 code 的，提前 MITM_PREWARM_SECONDS 秒启动 mitm"""
+        if not self.mitm_lifecycle.on_demand:
+            return
+        prewarm_key = (key, next_dt)
+        if prewarm_key in self._mitm_prewarm_keys:
+            return
+        # 下一次轮询之后才需要预热的，留给后续轮询处理
+        lead = (next_dt - now).total_seconds() - MITM_PREWARM_SECONDS
+        if lead > self.auto_clock_timer.interval() / 1000:
+            return
+        if session_valid_until() > next_dt.timestamp():
+            return
+        self._mitm_prewarm_keys = {k for k in self._mitm_prewarm_keys if k[1] > now}
+        self._mitm_prewarm_keys.add(prewarm_key)
+        QTimer.singleShot(
+            max(0, int(lead * 1000)),
+            lambda: threading.Thread(target=self.mitm_lifecycle.prewarm, name="mitm-prewarm", daemon=True).start(),
+        )
+
     def _auto_get_code_and_session(self):
         """定时打卡场景下自动获取code和session"""
         if self.is_getting_code:
@@ -1602,6 +1604,7 @@ class ModernWindow(QMainWindow):
             return
 
         self.is_getting_code = True
+        self._sync_monitor_mode()
         self.btn_get_code.setText("停止获取")
         self.btn_get_code.setStyleSheet(
             "background: #C0392B; color: white; border-radius: 20px; padding: 10px; font-size: 12pt; font-weight: bold; border: none;")
@@ -1610,13 +1613,14 @@ class ModernWindow(QMainWindow):
         for btn in self.grp.buttons():
             btn.setEnabled(False)
 
-        self.code_worker = GetCodeAndSessionThread(CONFIG_FILE)
+        self.code_worker = lazy.GetCodeAndSessionThread(CONFIG_FILE)
         self.code_worker.finished_signal.connect(self._on_auto_get_code_done)
         self.code_worker.start()
 
     def _on_auto_get_code_done(self, success, msg):
         """定时打卡自动获取code完成后的回调"""
         self.is_getting_code = False
+        self._sync_monitor_mode()
         self.btn_get_code.setEnabled(True)
         self.btn_get_code.setText("获取code")
         self.btn_get_code.setStyleSheet("")
@@ -1648,7 +1652,7 @@ class ModernWindow(QMainWindow):
                     self._show_tray_message("开始执行失败", "拍照签到/签退需要先显示主窗口进行选择。", False)
                     self._last_action_from_tray = False
                     return
-                dialog = PhotoSignDialog(self)
+                dialog = lazy.PhotoSignDialog(self)
                 if dialog.exec() != QDialog.Accepted:
                     logging.info("用户取消了拍照签到操作")
                     if self._last_action_from_tray:
@@ -1699,6 +1703,7 @@ class ModernWindow(QMainWindow):
                 return
 
             self.is_running = True
+            self._sync_monitor_mode()
             self.btn_run.setText("停止运行")
             self.btn_run.setStyleSheet("background: #C0392B;")
             self.prog.show()
@@ -1710,7 +1715,7 @@ class ModernWindow(QMainWindow):
             checked_id = self.grp.checkedId()
             photo_image = None
             if checked_id in [2, 3]:
-                dialog = PhotoSignDialog(self)
+                dialog = lazy.PhotoSignDialog(self)
                 if dialog.exec() != QDialog.Accepted:
                     logging.info("用户取消了拍照签到操作")
                     return
@@ -1725,7 +1730,7 @@ class ModernWindow(QMainWindow):
             elif checked_id == 3:
                 opt = {"action": "拍照签退", "code": "1", "image_path": photo_image}
 
-            self.worker = SignTaskThread(CONFIG_FILE, opt)
+            self.worker = lazy.SignTaskThread(CONFIG_FILE, opt)
             self.worker.finished_signal.connect(self.on_done)
             self.worker.start()
         else:
@@ -1738,6 +1743,7 @@ class ModernWindow(QMainWindow):
         notify_from_tray = self._last_action_from_tray
         self._last_action_from_tray = False
         self.is_running = False
+        self._sync_monitor_mode()
         self.btn_run.setEnabled(True)
         self.btn_run.setText("开始执行")
         self.btn_run.setStyleSheet("")
@@ -1762,10 +1768,10 @@ class ModernWindow(QMainWindow):
                     config = read_config(CONFIG_FILE)
                     settings = config.get("settings", {})
                     if not settings.get("dont_show_sponsor", False):
-                        SponsorSubmitDialog(self).exec()
+                        lazy.SponsorSubmitDialog(self).exec()
                 except Exception:
                     # 如果读取配置失败，默认显示
-                    SponsorSubmitDialog(self).exec()
+                    lazy.SponsorSubmitDialog(self).exec()
         else:
             if msg != "任务已停止":
                 ToastManager.instance().show(msg, "error")
@@ -1818,7 +1824,7 @@ class ModernWindow(QMainWindow):
     def _send_pushplus_in_thread(tokens: list[str], title: str, content: str):
         for token in tokens:
             try:
-                notify_pushplus(title=title, content=content, token=token)
+                lazy.notify_pushplus(title=title, content=content, token=token)
                 logging.info("PushPlus 推送成功")
             except Exception as exc:
                 logging.warning(f"PushPlus 推送失败: {exc}")
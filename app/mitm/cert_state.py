@@ -1,8 +1,11 @@
 import hashlib
 import json
+import logging
 import os
+import threading
+import time
 
-from app.config.common import MITM_CERT_STATE_FILE, MITM_CONF_DIR
+from app.config.common import CERT_TRUST_CHECK_INTERVAL_SECONDS, MITM_CERT_STATE_FILE, MITM_CONF_DIR
 from app.mitm.runtime_storage import ensure_runtime_mitm_files
 from app.utils.commands import check_cert
 
@@ -10,6 +13,14 @@ STATE_FILE = MITM_CERT_STATE_FILE
 CURRENT_CERT_FILE = os.path.join(MITM_CONF_DIR, "mitmproxy-ca-cert.cer")
 
 
+def _file_signature(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 def _read_state():
     ensure_runtime_mitm_files()
     if not os.path.exists(STATE_FILE):
@@ -28,45 +39,161 @@ def _write_state(payload: dict):
         json.dump(payload, handle, ensure_ascii=False, indent=2)
 
 
-def current_cert_fingerprint():
-    ensure_runtime_mitm_files()
-    if not os.path.exists(CURRENT_CERT_FILE):
-        return ""
-
+def _hash_file(path: str) -> str:
     digest = hashlib.sha256()
-    with open(CURRENT_CERT_FILE, "rb") as handle:
+    with open(path, "rb") as handle:
         for chunk in iter(lambda: handle.read(65536), b""):
             digest.update(chunk)
     return digest.hexdigest()
 
 
-def remember_current_cert_installed():
-    fingerprint = current_cert_fingerprint()
-    if not fingerprint:
-        return False
-
-    _write_state({"sha256": fingerprint})
-    return True
+class CertStateService:
+    """缓存证书状态，避免每秒 hash 证书文件并启动 certutil/security 子进程。
+
+    - 证书指纹按证书文件 (mtime, size) 缓存，文件未变不重新计算；
+    - 已安装指纹按状态文件 (mtime, size) 缓存；
+    - 系统信任库查询按 trust_interval 节流，证书安装/清理或证书文件变化时失效；
+    - 状态变化时通知 subscribe 注册的回调 (cert_ok, detail)。
+    """
+
+    def __init__(
+        self,
+        cert_file: str = CURRENT_CERT_FILE,
+        state_file: str = STATE_FILE,
+        trust_interval: float = CERT_TRUST_CHECK_INTERVAL_SECONDS,
+    ):
+        self.cert_file = cert_file
+        self.state_file = state_file
+        self.trust_interval = trust_interval
+        self._lock = threading.RLock()
+        self._runtime_ready = False
+        self._fingerprint = ("", None)
+        self._installed_sha = ("", None)
+        self._trusted = None
+        self._trusted_at = 0.0
+        self._summary = None
+        self._listeners = []
+
+    def _ensure_runtime(self):
+        if not self._runtime_ready:
+            ensure_runtime_mitm_files()
+            self._runtime_ready = True
+
+    def fingerprint(self) -> str:
+        with self._lock:
+            self._ensure_runtime()
+            signature = _file_signature(self.cert_file)
+            cached, cached_signature = self._fingerprint
+            if signature == cached_signature:
+                return cached
+            # 证书文件被替换（confdir 变化/重新生成），信任库结果也随之失效
+            fingerprint = _hash_file(self.cert_file) if signature else ""
+            self._fingerprint = (fingerprint, signature)
+            self._trusted = None
+            return fingerprint
+
+    def installed_fingerprint(self) -> str:
+        with self._lock:
+            self._ensure_runtime()
+            signature = _file_signature(self.state_file)
+            cached, cached_signature = self._installed_sha
+            if signature == cached_signature:
+                return cached
+            sha = str(_read_state().get("sha256") or "") if signature else ""
+            self._installed_sha = (sha, signature)
+            return sha
+
+    def trust_store_has_cert(self, force: bool = False) -> bool:
+        with self._lock:
+            stale = time.monotonic() - self._trusted_at >= self.trust_interval
+            if force or self._trusted is None or stale:
+                self._trusted = bool(check_cert())
+                self._trusted_at = time.monotonic()
+            return self._trusted
+
+    def invalidate(self):
+        """证书安装、清理或 confdir 变化后调用，下一次查询会重新读取全部状态"""
+        with self._lock:
+            self._fingerprint = ("", None)
+            self._installed_sha = ("", None)
+            self._trusted = None
+            self._runtime_ready = False
+
+    def remember_installed(self) -> bool:
+        fingerprint = self.fingerprint()
+        if not fingerprint:
+            return False
+        _write_state({"sha256": fingerprint})
+        self.invalidate()
+        return True
+
+    def summary(self, force: bool = False):
+        with self._lock:
+            fingerprint = self.fingerprint()
+            if fingerprint and self.installed_fingerprint() == fingerprint:
+                result = (True, "匹配当前 mitm 证书")
+            elif self.trust_store_has_cert(force=force):
+                result = (True, "已安装旧证书")
+            elif fingerprint:
+                result = (False, "未安装当前证书")
+            else:
+                result = (False, "未生成证书")
+            changed = result != self._summary
+            self._summary = result
+            listeners = list(self._listeners) if changed else []
+        for callback in listeners:
+            try:
+                callback(*result)
+            except Exception as e:
+                logging.debug(f"证书状态回调异常: {e}")
+        return result
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_cert_state_service() -> CertStateService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = CertStateService()
+    return _service
+
+
+def invalidate_cert_state():
+    get_cert_state_service().invalidate()
 
 
-def current_cert_matches_installed_state():
-    fingerprint = current_cert_fingerprint()
-    if not fingerprint:
-        return False
-    return _read_state().get("sha256") == fingerprint
+def current_cert_fingerprint():
+    return get_cert_state_service().fingerprint()
 
 
-def summarize_cert_state():
-    current_cert_matches = current_cert_matches_installed_state()
-    cert_installed = check_cert()
+def remember_current_cert_installed():
+    return get_cert_state_service().remember_installed()
 
-    if current_cert_matches:
-        return True, "匹配当前 mitm 证书"
 
-    if cert_installed:
-        return True, "已安装旧证书"
+def current_cert_matches_installed_state():
+    service = get_cert_state_service()
+    fingerprint = service.fingerprint()
+    if not fingerprint:
+        return False
+    return service.installed_fingerprint() == fingerprint
 
-    if current_cert_matches or current_cert_fingerprint():
-        return False, "未安装当前证书"
 
-    return False, "未生成证书"
+def summarize_cert_state(force: bool = False):
+    """
+    :param force: 立即重新查询系统信任库（安装证书前的判断需要实时结果）
+    :return: (cert_ok, detail)
+    """
+    return get_cert_state_service().summary(force=force)
@@ -1,11 +1,25 @@
 import argparse
+import importlib.util
 import os
 
 
-def build_mitmdump_args(args):
+def load_addon_module(path: str, name: str = "signsignin_mitm_addon"):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def addon_allow_hosts(module) -> list:
+    """addon 中定义的需要解密的域名；未定义时返回空列表（全部解密）"""
+    patterns = getattr(module, "allow_hosts_patterns", None)
+    return list(patterns()) if patterns else []
+
+
+def build_mitmdump_args(args, allow_hosts=()):
     addon = os.path.abspath(args.addon)
     confdir = os.path.abspath(args.confdir)
-    return [
+    command = [
         "--listen-host",
         args.host,
         "--listen-port",
@@ -16,6 +30,10 @@ def build_mitmdump_args(args):
         addon,
         "--quiet",
     ]
+    # 只解密目标域名，其余 TLS 连接透传
+    for pattern in allow_hosts:
+        command.extend(["--allow-hosts", pattern])
+    return command
 
 
 def parse_args(argv=None):
@@ -24,6 +42,7 @@ def parse_args(argv=None):
     parser.add_argument("--port", type=int, required=True)
     parser.add_argument("--addon", required=True)
     parser.add_argument("--confdir", required=True)
+    parser.add_argument("--intercept-all", action="store_true", help="解密全部 TLS 连接（调试用）")
     return parser.parse_args(argv)
 
 
@@ -32,7 +51,8 @@ def main(argv=None):
     os.makedirs(os.path.abspath(args.confdir), exist_ok=True)
     from mitmproxy.tools.main import mitmdump
 
-    return mitmdump(build_mitmdump_args(args)) or 0
+    allow_hosts = [] if args.intercept_all else addon_allow_hosts(load_addon_module(os.path.abspath(args.addon)))
+    return mitmdump(build_mitmdump_args(args, allow_hosts)) or 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import os
+import threading
+
+from app.mitm.embedded_runner import addon_allow_hosts, load_addon_module
+
+
+class _ReadyAddon:
+    """running 钩子在代理服务器启动（或启动失败）之后触发，由它显式通知就绪结果"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def running(self):
+        from mitmproxy import ctx
+
+        proxyserver = ctx.master.addons.get("proxyserver")
+        addrs = proxyserver.listen_addrs() if proxyserver else []
+        if addrs:
+            self.engine._signal_ready(True, "")
+        else:
+            self.engine._signal_ready(False, "mitm 代理端口监听失败")
+            ctx.master.shutdown()
+
+
+class InProcessMitmEngine:
+    """在本进程的独立 asyncio 线程里运行 mitmproxy DumpMaster + GetCode addon。
+
+    start() 等待 running 钩子给出的就绪结果，不再轮询端口；stop() 通知 master 退出并等待线程结束。
+    """
+
+    def __init__(self, host: str, port: int, addon: str, confdir: str, tls_passthrough: bool = True):
+        self.host = host
+        self.port = port
+        self.addon = addon
+        self.confdir = confdir
+        self.tls_passthrough = tls_passthrough
+        self.last_error = ""
+        self._master = None
+        self._module = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._ready_ok = False
+
+    def _signal_ready(self, ok: bool, error: str):
+        self._ready_ok = ok
+        if error:
+            self.last_error = error
+        self._ready.set()
+
+    async def _serve(self):
+        from mitmproxy import options
+        from mitmproxy.tools.dump import DumpMaster
+
+        # addon 模块只加载一次：按需模式会反复重启引擎，重复执行会堆积模块对象和 atexit 回调
+        if self._module is None:
+            self._module = load_addon_module(self.addon)
+        module = self._module
+        opts = options.Options(listen_host=self.host, listen_port=self.port, confdir=self.confdir)
+        master = DumpMaster(opts, with_termlog=False, with_dumper=False)
+        if self.tls_passthrough:
+            # 与子进程模式一致：只解密 addon 声明的目标域名
+            opts.update(allow_hosts=addon_allow_hosts(module))
+        # ErrorCheck 在启动出错时调用 sys.exit，在线程里运行时改由 _ReadyAddon 报告失败
+        errorcheck = master.addons.get("errorcheck")
+        if errorcheck:
+            errorcheck.finish()
+            master.addons.remove(errorcheck)
+        master.addons.add(*getattr(module, "addons", []), _ReadyAddon(self))
+        self._master = master
+        try:
+            await master.run()
+        finally:
+            await self._close_servers(master)
+
+    @staticmethod
+    async def _close_servers(master):
+        """master.run 返回时监听端口并不会关闭，需要显式停止代理服务器并等待已有连接结束"""
+        proxyserver = master.addons.get("proxyserver")
+        if proxyserver is not None:
+            await proxyserver.servers.update([])
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current and not task.done()]
+        if pending:
+            await asyncio.wait(pending, timeout=1.0)
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._serve())
+        except BaseException as e:  # SystemExit 等也不能让线程静默退出
+            self.last_error = f"mitm 内置引擎异常退出: {e}"
+            logging.error(self.last_error)
+        finally:
+            self._master = None
+            self._signal_ready(False, "")
+            self._cancel_pending(loop)
+            loop.close()
+
+    @staticmethod
+    def _cancel_pending(loop):
+        """取消仍在处理的客户端连接等任务，保证线程退出时连接已关闭"""
+        pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+    def is_running(self) -> bool:
+        return self._ready_ok and self._thread is not None and self._thread.is_alive()
+
+    def start(self, timeout: float) -> bool:
+        if self.is_running():
+            return True
+        try:
+            import mitmproxy  # noqa: F401
+        except ImportError:
+            self.last_error = "当前环境未安装 mitmproxy，无法使用内置 mitm 引擎"
+            return False
+
+        os.makedirs(self.confdir, exist_ok=True)
+        # mitmproxy 每个连接都会输出 info 日志，避免刷屏界面日志
+        logging.getLogger("mitmproxy").setLevel(logging.WARNING)
+        self.last_error = ""
+        self._ready.clear()
+        self._ready_ok = False
+        self._thread = threading.Thread(target=self._run, name="mitm-inprocess", daemon=True)
+        self._thread.start()
+
+        if not self._ready.wait(timeout):
+            self.last_error = f"mitm 内置引擎 {timeout:.0f}s 内未就绪"
+            self.stop()
+            return False
+        if not self._ready_ok:
+            self.stop()
+        return self._ready_ok
+
+    def stop(self, timeout: float = 5.0):
+        master, thread = self._master, self._thread
+        if master is not None:
+            master.shutdown()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._ready_ok = False
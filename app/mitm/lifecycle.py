@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+
+from app.config.common import MITM_IDLE_SHUTDOWN_SECONDS, MITM_LIFECYCLE
+from app.mitm.service import MitmService
+
+ALWAYS = "always"
+ON_DEMAND = "on_demand"
+
+
+class MitmLifecycle:
+    """决定 mitm 何时运行。
+
+    - always：程序运行期间常驻，由 MonitorThread 守护；
+    - on_demand：获取 code 时才启动（acquire），全部使用方释放并空闲 idle_seconds 后停止；
+      定时打卡需要新 code 时可提前 prewarm。
+    所有启动都经过同一把锁，避免 MonitorThread 与任务线程同时拉起 mitm。
+    """
+
+    def __init__(self, service: MitmService | None = None, mode: str = MITM_LIFECYCLE,
+                 idle_seconds: float = MITM_IDLE_SHUTDOWN_SECONDS):
+        self.service = service or MitmService()
+        self.mode = mode if mode in (ALWAYS, ON_DEMAND) else ALWAYS
+        self.idle_seconds = idle_seconds
+        self._lock = threading.RLock()
+        self._users = 0
+        self._idle_since = None
+
+    @property
+    def on_demand(self) -> bool:
+        return self.mode == ON_DEMAND
+
+    def wanted(self) -> bool:
+        """当前是否需要 mitm 保持运行（供 MonitorThread 判断是否自动拉起）"""
+        with self._lock:
+            return not self.on_demand or self._users > 0 or self._idle_since is not None
+
+    def ensure_running(self) -> bool:
+        with self._lock:
+            if self.service.is_running():
+                return True
+            return self.service.start()
+
+    def acquire(self) -> bool:
+        """开始抓取 code 前调用；返回 mitm 是否已在监听"""
+        with self._lock:
+            self._users += 1
+            self._idle_since = None
+            started = self.ensure_running()
+            if not started:
+                # 启动失败时 mitm 并未运行，只撤销计数，不开始空闲计时
+                self._users = max(0, self._users - 1)
+        return started
+
+    def release(self):
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users == 0:
+                self._idle_since = time.monotonic()
+
+    def prewarm(self) -> bool:
+        """提前启动，若随后没有任务使用，空闲 idle_seconds 后照常停止"""
+        with self._lock:
+            if self._users == 0:
+                self._idle_since = time.monotonic()
+            started = self.ensure_running()
+        if started:
+            logging.info("🛡️ Mitm 已预热，等待定时打卡获取 code")
+        return started
+
+    def stop_if_idle(self) -> bool:
+        """on_demand 模式下空闲超时则停止，返回是否执行了停止"""
+        if not self.on_demand:
+            return False
+        with self._lock:
+            if self._users > 0 or self._idle_since is None:
+                return False
+            if time.monotonic() - self._idle_since < self.idle_seconds:
+                return False
+            self._idle_since = None
+            if not self.service.is_running():
+                return False
+            self.service.stop_mitm()
+        logging.info(f"💤 Mitm 空闲超过 {self.idle_seconds:.0f}s，已停止")
+        return True
+
+
+_lifecycle = None
+_lifecycle_lock = threading.Lock()
+
+
+def get_mitm_lifecycle() -> MitmLifecycle:
+    global _lifecycle
+    if _lifecycle is None:
+        with _lifecycle_lock:
+            if _lifecycle is None:
+                _lifecycle = MitmLifecycle()
+    return _lifecycle
@@ -6,7 +6,8 @@ import subprocess
 import sys
 import time
 
-from app.config.common import ADDONS_DIR, BASE_DIR, LOG_DIR, MITM_CONF_DIR, MITM_PROXY
+from app.config.common import ADDONS_DIR, BASE_DIR, LOG_DIR, MITM_CONF_DIR, MITM_ENGINE, MITM_PROXY, \
+    MITM_TLS_PASSTHROUGH
 from app.mitm.runtime_storage import ensure_runtime_mitm_files
 from app.utils.commands import check_port_listening, get_process_by_port, kill_process_tree, subprocess_creationflags
 
@@ -15,20 +16,33 @@ class MitmService:
     START_TIMEOUT_SECONDS = 6.0
     POLL_INTERVAL_SECONDS = 0.1
 
-    def __init__(self):
+    def __init__(self, engine: str = MITM_ENGINE):
         self.host, port = MITM_PROXY.split(":")
         self.port = int(port)
         self.addon = os.path.join(ADDONS_DIR, "get_code.py")
         self.confdir = MITM_CONF_DIR
         self.start_log = os.path.join(LOG_DIR, "mitm_start.log")
         self.last_error = ""
+        self.engine = engine
+        self._inprocess = None
+        if engine == "inprocess":
+            # 内置引擎依赖 asyncio/mitmproxy，只在启用时导入
+            from app.mitm.inprocess_engine import InProcessMitmEngine
+            self._inprocess = InProcessMitmEngine(
+                self.host, self.port, self.addon, self.confdir, tls_passthrough=MITM_TLS_PASSTHROUGH,
+            )
 
     def is_running(self):
+        if self._inprocess is not None and self._inprocess.is_running():
+            return True
         return check_port_listening(self.host, self.port, 0.05)
 
     def stop_mitm(self):
+        if self._inprocess is not None:
+            self._inprocess.stop()
         proc = get_process_by_port(self.port)
-        if proc:
+        # 内置引擎监听的端口属于本进程，不能按端口结束进程
+        if proc and proc.pid != os.getpid():
             kill_process_tree(proc.pid)
             time.sleep(0.3)
 
@@ -69,8 +83,7 @@ class MitmService:
         return sys.executable
 
     def _build_launch_command(self):
-        common_args = [
-            "--mitm-runner",
+        runner_args = [
             "--host",
             self.host,
             "--port",
@@ -80,13 +93,16 @@ class MitmService:
             "--confdir",
             self.confdir,
         ]
+        if not MITM_TLS_PASSTHROUGH:
+            runner_args.append("--intercept-all")
 
+        # 打包版只有一个可执行文件，由 main.py 在导入 Qt 之前分发 --mitm-runner；
+        # 源码运行时直接以模块方式启动 runner，不经过 main.py
         if getattr(sys, "frozen", False):
-            return [sys.executable, *common_args]
+            return [sys.executable, "--mitm-runner", *runner_args]
 
         python_executable = self._resolve_python_executable()
-        main_script = os.path.join(BASE_DIR, "main.py")
-        return [python_executable, main_script, *common_args]
+        return [python_executable, "-m", "app.mitm.embedded_runner", *runner_args]
 
     @staticmethod
     def _build_env():
@@ -119,6 +135,8 @@ class MitmService:
         os.makedirs(self.confdir, exist_ok=True)
         os.makedirs(os.path.dirname(self.start_log), exist_ok=True)
         self.last_error = ""
+        if self._inprocess is not None:
+            return self._start_inprocess()
         command = self._build_launch_command()
 
         with open(self.start_log, "a", encoding="utf-8") as log_file:
@@ -159,3 +177,10 @@ class MitmService:
         self.last_error = f"mitm 启动失败，请查看日志: {self.start_log}{suffix}"
         logging.error(self.last_error)
         return False
+
+    def _start_inprocess(self):
+        started = self._inprocess.start(self.START_TIMEOUT_SECONDS)
+        if not started:
+            self.last_error = self._inprocess.last_error or "mitm 内置引擎启动失败"
+            logging.error(self.last_error)
+        return started
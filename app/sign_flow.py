@@ -0,0 +1,80 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Stage:
+    def __init__(self, name: str, func, deps=()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+
+
+class StageGraph:
+    """签到流程的阶段依赖图：无依赖关系的阶段在线程池中并发执行。
+
+    每个阶段的 func 接收已完成阶段的结果字典，返回值以阶段名写回该字典。
+    """
+
+    def __init__(self, max_workers: int = 4, poll_interval: float = 0.1):
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self._stages = {}
+        self.results = {}
+        self.timings = {}
+
+    def add(self, name: str, func, deps=()):
+        if name in self._stages:
+            raise ValueError(f"阶段重复: {name}")
+        missing = [dep for dep in deps if dep not in self._stages]
+        if missing:
+            raise ValueError(f"阶段 {name} 依赖未定义的阶段: {', '.join(missing)}")
+        self._stages[name] = Stage(name, func, deps)
+        return self
+
+    def _timed(self, stage: Stage, results: dict):
+        started = time.perf_counter()
+        try:
+            return stage.func(results)
+        finally:
+            self.timings[stage.name] = time.perf_counter() - started
+
+    def run(self, check_stop=None) -> dict:
+        """
+        按依赖关系执行全部阶段
+        :param check_stop: 停止检查回调，抛出异常即中止，未开始的阶段会被取消
+        :return: 阶段名 -> 结果
+        """
+        results = self.results
+        remaining = dict(self._stages)
+        running = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sign-stage")
+        try:
+            while remaining or running:
+                if check_stop:
+                    check_stop()
+                for name, stage in list(remaining.items()):
+                    if all(dep in results for dep in stage.deps):
+                        del remaining[name]
+                        running[executor.submit(self._timed, stage, dict(results))] = name
+                if not running:
+                    raise RuntimeError(f"阶段依赖无法满足: {', '.join(remaining)}")
+
+                done, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+            return results
+        finally:
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def timing_summary(self) -> str:
+        parts = [f"{name} {self.timings[name] * 1000:.0f}ms" for name in self._stages if name in self.timings]
+        return ", ".join(parts)
+
+    def log_timings(self):
+        summary = self.timing_summary()
+        if summary:
+            logging.info(f"⏱️ 阶段耗时: {summary}")
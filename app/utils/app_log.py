@@ -0,0 +1,207 @@
+import atexit
+import contextlib
+import gzip
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from app.config.common import APP_LOG_BACKUPS, APP_LOG_FILE, APP_LOG_LEVEL, APP_LOG_MAX_BYTES
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# 每条记录以完整时间戳开头，多行消息（异常堆栈）的后续行归属于上一条记录
+_RECORD_START = re.compile(rb"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})")
+
+
+class _RotatingFileHandler(RotatingFileHandler):
+    """Windows 上日志文件被其它进程占用时重命名会失败：继续写当前文件，稍后再尝试轮转"""
+
+    ROLLOVER_RETRY_SECONDS = 30
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._retry_at = 0.0
+
+    def shouldRollover(self, record):
+        if time.monotonic() < self._retry_at:
+            return False
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        try:
+            super().doRollover()
+        except PermissionError:
+            self._retry_at = time.monotonic() + self.ROLLOVER_RETRY_SECONDS
+            if self.stream is None:
+                self.stream = self._open()
+
+
+def _open_shared(path: str):
+    """只读打开日志文件；Windows 上带 FILE_SHARE_DELETE，导出期间监听线程仍可轮转（重命名）该文件"""
+    if sys.platform != "win32":
+        return open(path, "rb")
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateFileW.argtypes = [
+        wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+        wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE,
+    ]
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    generic_read, share_all, open_existing, attribute_normal = 0x80000000, 0x7, 3, 0x80
+    handle = kernel32.CreateFileW(path, generic_read, share_all, None, open_existing, attribute_normal, None)
+    if handle is None or handle == wintypes.HANDLE(-1).value:
+        raise ctypes.WinError(ctypes.get_last_error())
+    return os.fdopen(msvcrt.open_osfhandle(handle, os.O_RDONLY | os.O_BINARY), "rb")
+
+
+class AppLog:
+    """持久化应用日志：QueueHandler 入队，监听线程写入轮转文件"""
+
+    def __init__(self, path: str = APP_LOG_FILE, level=APP_LOG_LEVEL, max_bytes: int = APP_LOG_MAX_BYTES,
+                 backups: int = APP_LOG_BACKUPS):
+        self.path = path
+        self.level = level
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.handler = None
+        self._listener = None
+        self._logger = None
+        self._lock = threading.Lock()
+
+    def install(self, logger: logging.Logger | None = None):
+        with self._lock:
+            if self._listener is not None:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            file_handler = _RotatingFileHandler(
+                self.path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8", delay=True
+            )
+            file_handler.setFormatter(logging.Formatter(
+                "%(asctime)s.%(msecs)03d %(levelname)s [%(threadName)s] %(message)s", TIME_FORMAT
+            ))
+            log_queue = queue.SimpleQueue()
+            self.handler = QueueHandler(log_queue)
+            self.handler.setLevel(self.level)
+            self._listener = QueueListener(log_queue, file_handler)
+            self._listener.start()
+            self._logger = logger or logging.getLogger()
+            self._logger.addHandler(self.handler)
+        atexit.register(self.uninstall)
+
+    def uninstall(self):
+        """摘除 handler，等待队列中剩余记录写完"""
+        with self._lock:
+            listener, self._listener = self._listener, None
+            if listener is None:
+                return
+            self._logger.removeHandler(self.handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+    def files(self) -> list[str]:
+        """现有日志文件，按时间从旧到新"""
+        candidates = [f"{self.path}.{index}" for index in range(self.backups, 0, -1)] + [self.path]
+        return [path for path in candidates if os.path.exists(path)]
+
+    @staticmethod
+    def _seek_start(f, lower: bytes):
+        """二分查找第一条时间不早于 lower 的记录所在的行首，避免从头逐行扫描大文件"""
+        lo, hi = 0, os.fstat(f.fileno()).st_size
+        while hi - lo > 4096:
+            mid = (lo + hi) // 2
+            f.seek(mid)
+            f.readline()
+            stamp = None
+            while stamp is None:
+                line = f.readline()
+                if not line:
+                    break
+                match = _RECORD_START.match(line)
+                stamp = match.group(1) if match else None
+            if stamp is None or stamp >= lower:
+                hi = mid
+            else:
+                lo = mid
+        f.seek(lo)
+        if lo:
+            f.readline()
+
+    @staticmethod
+    def _wrap(raw, dest: str, compress: bool):
+        if not compress:
+            return contextlib.nullcontext(raw)
+        # gzip 头中记录的文件名使用目标文件名，而不是临时文件名
+        name = os.path.basename(dest)
+        return gzip.GzipFile(filename=name[:-3] if name.endswith(".gz") else name, mode="wb", fileobj=raw)
+
+    def export(self, dest: str, start: datetime | None = None, end: datetime | None = None,
+               compress: bool = False) -> int:
+        """
+        逐行把 [start, end] 内的记录写到 dest，不把日志整体读入内存
+        :param compress: 为 True 时以 gzip 格式写出
+        :return: 导出的记录条数
+        """
+        lower = start.strftime(TIME_FORMAT).encode() if start else None
+        upper = end.strftime(TIME_FORMAT).encode() if end else None
+        start_ts = start.timestamp() if start else None
+        part = f"{dest}.part"
+        count = 0
+        try:
+            with open(part, "wb") as raw, self._wrap(raw, dest, compress) as out:
+                finished = False
+                for path in self.files():
+                    if finished:
+                        break
+                    try:
+                        # 最后修改时间早于起点的文件不可能包含范围内的记录
+                        if start_ts is not None and os.path.getmtime(path) < start_ts:
+                            continue
+                        f = _open_shared(path)
+                    except OSError:
+                        continue
+                    with f:
+                        if lower is not None:
+                            self._seek_start(f, lower)
+                        keep = False
+                        for line in f:
+                            match = _RECORD_START.match(line)
+                            if match:
+                                stamp = match.group(1)
+                                if upper is not None and stamp > upper:
+                                    # 更新的文件只会更晚
+                                    finished = True
+                                    break
+                                keep = lower is None or stamp >= lower
+                                count += keep
+                            if keep:
+                                out.write(line)
+            os.replace(part, dest)
+        except BaseException:
+            try:
+                os.remove(part)
+            except OSError:
+                pass
+            raise
+        return count
+
+
+_app_log = None
+_app_log_lock = threading.Lock()
+
+
+def get_app_log() -> AppLog:
+    global _app_log
+    if _app_log is None:
+        with _app_log_lock:
+            if _app_log is None:
+                _app_log = AppLog()
+    return _app_log
@@ -1,21 +1,52 @@
 import json
 import logging
 import os
+import socket
 import threading
 import time
+from collections import deque
 
-from app.config.common import CODE_FILE
+from app.config.common import CODE_FILE, CODE_RECEIVER_HOST, CODE_RECEIVER_PORT
+
+XYB_SOURCE = "xyb_code"
+JIELONG_SOURCE = "jielong_token"
+SOURCES = (XYB_SOURCE, JIELONG_SOURCE)
+
+
+def code_file_for(source: str) -> str:
+    """每个来源单独一个回退文件，互不覆盖"""
+    base, ext = os.path.splitext(CODE_FILE)
+    return f"{base}_{source}{ext}"
 
 
 class CodeChannel:
-    """Read code/token payloads written by the mitm addon."""
+    """接收 mitm addon 推送的 code/token。
+
+    addon 优先通过本机 socket（CODE_RECEIVER_PORT）推送，收到即入队；
+    推送失败时 addon 原子写入按来源区分的文件，由文件监视线程按 mtime 变化读取；
+    监视线程只在有 wait_payload 等待时运行，最后一个等待方返回即停止轮询。
+    每个来源一个队列，等待方被条件变量直接唤醒。
+    """
+
+    WATCH_INTERVAL_SECONDS = 0.2
+    WAIT_SLICE_SECONDS = 0.1
 
     _instance = None
     _instance_lock = threading.Lock()
 
-    def __init__(self):
+    def __init__(self, host: str = CODE_RECEIVER_HOST, port: int = CODE_RECEIVER_PORT):
+        self.host = host
+        self.port = port
         self._code_file = CODE_FILE
+        self._watch_files = [code_file_for(source) for source in SOURCES] + [CODE_FILE]
+        self._queues = {source: deque() for source in SOURCES}
+        self._cond = threading.Condition()
         self._started = False
+        self._server = None
+        self._file_stats = {}
+        self._waiters = 0
+        self._watcher = None
+        self._watch_stop = threading.Event()
 
     @classmethod
     def instance(cls):
@@ -25,43 +56,184 @@ class CodeChannel:
             return cls._instance
 
     def start(self):
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
         os.makedirs(os.path.dirname(self._code_file), exist_ok=True)
-        if self._started:
+        self._start_receiver()
+
+    def _start_receiver(self):
+        try:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind((self.host, self.port))
+            server.listen(8)
+        except OSError as e:
+            logging.warning(f"⚠️ Code 接收端口 {self.port} 不可用，改用文件通道: {e}")
+            return
+        self._server = server
+        threading.Thread(target=self._accept_loop, name="code-receiver", daemon=True).start()
+        logging.info(f"Code channel listening on {self.host}:{self.port}")
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+
+    def _handle_connection(self, conn):
+        with conn:
+            conn.settimeout(2.0)
+            try:
+                reader = conn.makefile("rb")
+                for line in reader:
+                    try:
+                        payload = json.loads(line.decode("utf-8"))
+                    except ValueError:
+                        conn.sendall(b"error\n")
+                        continue
+                    conn.sendall(b"ok\n" if self._dispatch(payload) else b"ignored\n")
+            except OSError:
+                pass
+
+    def _begin_wait(self):
+        with self._cond:
+            self._waiters += 1
+            if self._waiters == 1:
+                # 上一个监视线程可能还在间隔等待中并会继续运行，必须清除停止标记，否则它会空转
+                self._watch_stop.clear()
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch_files_loop, name="code-file-watch", daemon=True)
+                self._watcher.start()
+
+    def _end_wait(self):
+        with self._cond:
+            self._waiters -= 1
+            if self._waiters <= 0:
+                self._waiters = 0
+                self._watch_stop.set()
+
+    def _watch_files_loop(self):
+        while True:
+            # 在条件锁内判断是否退出，与 _begin_wait 的启动判断互斥，不会漏掉新的等待方
+            with self._cond:
+                if self._waiters == 0:
+                    self._watcher = None
+                    return
+                self._watch_stop.clear()
+            for path in self._watch_files:
+                self._poll_file(path)
+            self._watch_stop.wait(self.WATCH_INTERVAL_SECONDS)
+
+    def _poll_file(self, path: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._file_stats.pop(path, None)
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._file_stats.get(path) == signature:
+            return
+        self._file_stats[path] = signature
+        # 先把文件原子改名认领再读取：读取期间 addon 新写入的文件不会被随后的删除误删
+        claimed = f"{path}.claimed"
+        try:
+            os.replace(path, claimed)
+        except OSError:
             return
-        self._started = True
-        logging.info(f"Code channel file: {self._code_file}")
+        self._file_stats.pop(path, None)
+        payload = self._read_file(claimed)
+        self._remove(claimed)
+        if payload is None or not self._dispatch(payload):
+            logging.warning(f"忽略无效的 code 文件: {path}")
+
+    @staticmethod
+    def _read_file(path: str) -> dict | None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (ValueError, OSError):
+            return None
+        return payload if isinstance(payload, dict) else None
 
-    def reset(self):
-        self._started = False
+    @staticmethod
+    def _remove(path: str):
         try:
-            if os.path.exists(self._code_file):
-                os.remove(self._code_file)
+            os.remove(path)
         except OSError:
             pass
 
+    def _dispatch(self, payload) -> bool:
+        if not isinstance(payload, dict):
+            return False
+        has_value = any(str(payload.get(key) or "").strip() for key in ("code", "token", "uuid"))
+        if not has_value:
+            return False
+        # 旧版 addon 不带 source 字段，只会写 xyb code
+        source = str(payload.get("source") or "").strip() or XYB_SOURCE
+        with self._cond:
+            self._queues.setdefault(source, deque()).append(payload)
+            self._cond.notify_all()
+        return True
+
+    def reset(self, source: str | None = None):
+        """清空指定来源（默认全部）尚未消费的 payload"""
+        sources = [source] if source else list(self._queues)
+        with self._cond:
+            for name in sources:
+                self._queues.get(name, deque()).clear()
+        for name in sources:
+            self._remove(code_file_for(name))
+        if not source or source == XYB_SOURCE:
+            self._remove(self._code_file)
+
+    def _pop(self, source: str | None) -> dict | None:
+        if source:
+            queue = self._queues.get(source)
+            return queue.popleft() if queue else None
+        for queue in self._queues.values():
+            if queue:
+                return queue.popleft()
+        return None
+
     def wait_payload(self, timeout_seconds: int, source: str | None = None, stop_check=None, heartbeat=None):
-        deadline = time.time() + timeout_seconds
-        while time.time() < deadline:
+        self.start()
+        self._begin_wait()
+        try:
+            return self._wait_payload(timeout_seconds, source, stop_check, heartbeat)
+        finally:
+            self._end_wait()
+
+    def _wait_payload(self, timeout_seconds: int, source: str | None, stop_check, heartbeat):
+        deadline = time.monotonic() + timeout_seconds
+        while True:
             if stop_check:
                 stop_check()
             if heartbeat:
                 heartbeat()
 
-            payload = self._try_read_payload(source=source)
-            if payload:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            with self._cond:
+                payload = self._pop(source)
+                if payload is None:
+                    self._cond.wait(min(self.WAIT_SLICE_SECONDS, remaining))
+                    payload = self._pop(source)
+            if payload is not None:
                 logging.info("Loaded mitm payload")
                 return payload
 
-            time.sleep(0.3)
-
-        if source == "xyb_code":
+        if source == XYB_SOURCE:
             raise RuntimeError("Timed out waiting for code")
         raise RuntimeError("Timed out waiting for login callback")
 
     def wait_code(self, timeout_seconds: int, stop_check=None, heartbeat=None):
         payload = self.wait_payload(
             timeout_seconds=timeout_seconds,
-            source="xyb_code",
+            source=XYB_SOURCE,
             stop_check=stop_check,
             heartbeat=heartbeat,
         )
@@ -70,41 +242,3 @@ class CodeChannel:
             logging.info("Loaded login code")
             return code
         raise RuntimeError("Timed out waiting for code")
-
-    def _try_read_payload(self, source: str | None = None) -> dict | None:
-        payload = self._peek_payload()
-        if not isinstance(payload, dict):
-            return None
-
-        payload_source = str(payload.get("source") or "").strip()
-        if source:
-            if payload_source and payload_source != source:
-                return None
-            if not payload_source and source != "xyb_code":
-                return None
-
-        has_value = any(str(payload.get(key) or "").strip() for key in ("code", "token", "uuid"))
-        if not has_value:
-            return None
-
-        self._consume_payload()
-        return payload
-
-    def _peek_payload(self) -> dict | None:
-        if not os.path.exists(self._code_file):
-            return None
-        try:
-            with open(self._code_file, "r", encoding="utf-8") as f:
-                payload = json.load(f)
-            if isinstance(payload, dict):
-                return payload
-        except (json.JSONDecodeError, OSError, KeyError):
-            pass
-        return None
-
-    def _consume_payload(self):
-        try:
-            if os.path.exists(self._code_file):
-                os.remove(self._code_file)
-        except OSError:
-            pass
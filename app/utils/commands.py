@@ -9,7 +9,10 @@ import sys
 import webbrowser
 from types import SimpleNamespace
 
-import psutil
+from app.config.common import PROXY_MODE
+from app.utils.lazy import libs
+from app.utils.pac import get_pac_server
+from app.utils.proxy_state import get_proxy_state
 
 
 def is_windows():
@@ -87,7 +90,7 @@ def flush_dns_cache():
 
 def get_network_type():
     try:
-        stats = psutil.net_if_stats()
+        stats = libs.psutil.net_if_stats()
         for iface, stat in stats.items():
             if stat.isup:
                 lower = iface.lower()
@@ -108,7 +111,7 @@ def get_network_type():
 
 def get_net_io():
     try:
-        return psutil.net_io_counters()
+        return libs.psutil.net_io_counters()
     except:
         return None
 
@@ -125,54 +128,12 @@ def get_local_ip():
 
 
 
-def get_system_proxy():
-    if is_macos():
-        return get_macos_system_proxy()
-    if not is_windows():
-        return None
-
-    # 获取是否开启代理
-    stdout_enable = bash(
-        r'reg query "HKEY_CURRENT_USER\Software\Microsoft\Windows\CurrentVersion\Internet Settings" /v ProxyEnable'
-    )
-    if not stdout_enable:
-        return None
-
-    m = re.search(r'ProxyEnable\s+REG_DWORD\s+0x(\d+)', stdout_enable)
-    if not m:
-        return None
-
-    enabled = (m.group(1) == "1")
-
-    # ⭐ 没开启代理 → 当作没有代理
-    if not enabled:
-        return None
-
-    # 获取代理地址
-    stdout_server = bash(
-        r'reg query "HKEY_CURRENT_USER\Software\Microsoft\Windows\CurrentVersion\Internet Settings" /v ProxyServer'
-    )
-    if not stdout_server:
-        return None
-
-    m2 = re.search(r'ProxyServer\s+REG_SZ\s+(.+)', stdout_server)
-    if not m2:
-        return None
-
-    proxy = m2.group(1).strip()
-    return proxy if proxy else None
-
-
-def get_macos_system_proxy():
-    for service in macos_network_services():
-        stdout = bash(f'networksetup -getwebproxy "{service}"')
-        if "Enabled: Yes" not in stdout:
-            continue
-        server_match = re.search(r"Server:\s*(.+)", stdout)
-        port_match = re.search(r"Port:\s*(\d+)", stdout)
-        if server_match and port_match:
-            return f"{server_match.group(1).strip()}:{port_match.group(1).strip()}"
-    return None
+def get_system_proxy(refresh: bool = False):
+    """
+    当前系统代理（host:port），未开启时为 None
+    :param refresh: 跳过缓存直接读取系统设置
+    """
+    return get_proxy_state().get(refresh=refresh)
 
 
 def macos_network_services():
@@ -200,49 +161,72 @@ def refresh_system_proxy():
         pass
 
 
-def set_proxy(proxy):
-    origin = get_system_proxy()
+def set_proxy(proxy, mode: str = PROXY_MODE):
+    """
+    把系统代理指向 mitm
+    :param mode: "global" 设置全局 HTTP/HTTPS 代理；"pac" 设置自动代理配置，只有抓取域名走 mitm
+    :return: 原来的全局代理，交给 reset_proxy 恢复；PAC 模式不改全局代理，返回 None
+    """
+    if mode == "pac":
+        return set_pac_proxy(proxy)
+    state = get_proxy_state()
+    origin = state.get(refresh=True)
     if origin == proxy: return None
-    if is_macos():
-        services = macos_network_services()
-        if not services:
-            raise RuntimeError("macOS 获取网络服务失败，无法自动设置系统代理")
-        host, port = proxy.split(":", 1)
-        for service in services:
-            bash(f'networksetup -setwebproxy "{service}" {host} {port}')
-            bash(f'networksetup -setsecurewebproxy "{service}" {host} {port}')
-        if get_system_proxy() != proxy:
-            raise RuntimeError(f"macOS 系统代理设置失败，请手动设置 HTTP/HTTPS 代理为 {proxy}")
-        return origin
-    if not is_windows():
-        return origin
-    bash(
-        r'reg add "HKCU\Software\Microsoft\Windows\CurrentVersion\Internet Settings" /v ProxyEnable /t REG_DWORD /d 1 /f >nul 2>nul')
-    bash(
-        rf'reg add "HKCU\Software\Microsoft\Windows\CurrentVersion\Internet Settings" /v ProxyServer /d "{proxy}" /f >nul 2>nul')
-    refresh_system_proxy()
+    state.set(proxy)
+    if is_macos() and state.get(refresh=True) != proxy:
+        raise RuntimeError(f"macOS 系统代理设置失败，请手动设置 HTTP/HTTPS 代理为 {proxy}")
     return origin
 
 
-def reset_proxy(proxy, target_proxy):
-    if is_macos():
-        if proxy and proxy != target_proxy:
-            set_proxy(proxy)
+def set_pac_proxy(proxy):
+    """由本机提供 PAC 脚本并让系统使用它；全局代理保持不变"""
+    server = get_pac_server()
+    state = get_proxy_state()
+    current = state.pac_url(refresh=True)
+    if not server.owns(current):
+        server.previous_url = current
+    state.set_pac(server.serve(proxy))
+    if is_macos() and not server.owns(state.pac_url(refresh=True)):
+        raise RuntimeError(f"macOS 自动代理设置失败，请手动设置自动代理 URL 为 {server.base_url}")
+
+
+def reset_pac_proxy():
+    """撤销本程序设置的 PAC（恢复之前的 PAC 地址）；系统当前不是本程序的 PAC 时不做修改"""
+    server = get_pac_server()
+    state = get_proxy_state()
+    if server.owns(state.pac_url(refresh=True)):
+        previous, server.previous_url = server.previous_url, None
+        if previous:
+            state.set_pac(previous)
         else:
-            for service in macos_network_services():
-                bash(f'networksetup -setwebproxystate "{service}" off')
-                bash(f'networksetup -setsecurewebproxystate "{service}" off')
-        return
-    if not is_windows():
+            state.disable_pac()
+    server.stop()
+
+
+def is_proxy_active(proxy, mode: str = PROXY_MODE) -> bool:
+    """系统代理当前是否仍指向 mitm（抓取 code 时的心跳检查）"""
+    if mode == "pac":
+        return get_pac_server().owns(get_proxy_state().pac_url())
+    return get_system_proxy() == proxy
+
+
+def describe_proxy(mode: str = PROXY_MODE) -> str:
+    """当前系统代理的简短描述，用于心跳告警"""
+    if mode == "pac":
+        return f"自动代理 {get_proxy_state().pac_url(refresh=True) or '未设置'}"
+    return get_system_proxy() or "直连"
+
+
+def reset_proxy(proxy, target_proxy, mode: str = PROXY_MODE):
+    """撤销 set_proxy：PAC 模式只恢复 PAC 设置，全局代理保持原样"""
+    reset_pac_proxy()
+    if mode == "pac":
         return
-    if proxy and proxy != '' and proxy != target_proxy:
-        set_proxy(proxy)
+    if proxy and proxy != target_proxy:
+        get_proxy_state().set(proxy)
     else:
-        bash(
-            r'reg add "HKCU\Software\Microsoft\Windows\CurrentVersion\Internet Settings" /v ProxyEnable /t REG_DWORD /d 0 /f >nul 2>nul')
-        bash(
-            r'reg add "HKCU\Software\Microsoft\Windows\CurrentVersion\Internet Settings" /v ProxyServer /d "" /f >nul 2>nul')
-    refresh_system_proxy()
+        get_proxy_state().disable()
+
 
 def get_process_by_port(port: int):
     proc = get_process_by_port_psutil(port)
@@ -253,7 +237,7 @@ def get_process_by_port(port: int):
 
 def get_process_by_port_psutil(port: int):
     try:
-        iterator = psutil.process_iter(['pid', 'name'])
+        iterator = libs.psutil.process_iter(['pid', 'name'])
     except Exception:
         return None
     try:
@@ -261,7 +245,7 @@ def get_process_by_port_psutil(port: int):
             try:
                 connections = proc.net_connections()
                 for conn in connections:
-                    if getattr(conn.laddr, 'port', None) == port and conn.status == psutil.CONN_LISTEN:
+                    if getattr(conn.laddr, 'port', None) == port and conn.status == libs.psutil.CONN_LISTEN:
                         return proc
             except:
                 pass
@@ -280,7 +264,7 @@ def get_process_by_port_lsof(port: int):
             continue
         pid = int(line)
         try:
-            return psutil.Process(pid)
+            return libs.psutil.Process(pid)
         except Exception:
             return SimpleNamespace(pid=pid)
     return None
@@ -321,12 +305,12 @@ def kill_process_tree(pid: int):
         bash(f"taskkill /PID {pid} /F /T >nul 2>&1")
         return
     try:
-        parent = psutil.Process(pid)
+        parent = libs.psutil.Process(pid)
         children = parent.children(recursive=True)
         for child in children:
             child.terminate()
         parent.terminate()
-        _, alive = psutil.wait_procs(children + [parent], timeout=2)
+        _, alive = libs.psutil.wait_procs(children + [parent], timeout=2)
         for proc in alive:
             proc.kill()
     except Exception:
@@ -347,7 +331,20 @@ def check_cert():
     return bool(stdout and "mitmproxy" in stdout)
 
 
+def _invalidate_cert_state():
+    # cert_state 依赖本模块，延迟导入避免循环引用
+    from app.mitm.cert_state import invalidate_cert_state
+    invalidate_cert_state()
+
+
 def remove_mitmproxy_certs():
+    try:
+        return _remove_mitmproxy_certs()
+    finally:
+        _invalidate_cert_state()
+
+
+def _remove_mitmproxy_certs():
     if is_macos():
         stdout = bash('security find-certificate -a -c mitmproxy -Z ~/Library/Keychains/login.keychain-db')
         hashes = re.findall(r"SHA-1 hash:\s*([0-9A-Fa-f]+)", stdout or "")
@@ -372,6 +369,13 @@ def remove_mitmproxy_certs():
 
 
 def install_mitmproxy_cert(file_name):
+    try:
+        _install_mitmproxy_cert(file_name)
+    finally:
+        _invalidate_cert_state()
+
+
+def _install_mitmproxy_cert(file_name):
     removed = remove_mitmproxy_certs()
     if removed > 0:
         logging.info(f"已清理 {removed} 个旧 mitmproxy 证书")
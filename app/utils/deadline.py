@@ -0,0 +1,100 @@
+import socket
+import threading
+import time
+import weakref
+
+
+class DeadlineCancelled(RuntimeError):
+    def __init__(self, message: str = "用户停止执行"):
+        super().__init__(message)
+
+
+class DeadlineExceeded(RuntimeError):
+    def __init__(self, message: str = "任务执行超时"):
+        super().__init__(message)
+
+
+class Deadline:
+    """贯穿整个任务的时间预算。
+
+    每次 HTTP 请求以剩余预算作为超时；cancel() 会立即关闭所有在途连接的 socket，
+    阻塞在读写上的请求线程随即返回。
+    """
+
+    def __init__(self, budget_seconds: float | None = None):
+        self.budget_seconds = budget_seconds
+        self._expires_at = None if budget_seconds is None else time.monotonic() + budget_seconds
+        self._cancelled = threading.Event()
+        self._connections = set()
+        self._children = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self) -> float | None:
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def check(self):
+        if self.cancelled:
+            raise DeadlineCancelled()
+        if self.expired():
+            raise DeadlineExceeded()
+
+    def clamp_timeout(self, timeout):
+        """把请求超时（数字或 (connect, read) 元组）限制在剩余预算内"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        remaining = max(remaining, 0.001)
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+        return min(timeout, remaining)
+
+    def child(self) -> "Deadline":
+        """派生子预算：不超过当前剩余时间，本预算 cancel() 时一并取消；子预算可单独取消"""
+        child = Deadline(self.remaining())
+        with self._lock:
+            self._children.add(child)
+        if self.cancelled:
+            child.cancel()
+        return child
+
+    def track(self, connection):
+        with self._lock:
+            self._connections.add(connection)
+        if self.cancelled:
+            self._abort(connection)
+
+    def untrack(self, connection):
+        with self._lock:
+            self._connections.discard(connection)
+
+    def cancel(self):
+        self._cancelled.set()
+        with self._lock:
+            connections = list(self._connections)
+            children = list(self._children)
+        for connection in connections:
+            self._abort(connection)
+        for child in children:
+            child.cancel()
+
+    @staticmethod
+    def _abort(connection):
+        sock = getattr(connection, "sock", None)
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
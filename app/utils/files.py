@@ -6,7 +6,8 @@ import shutil
 from datetime import datetime
 from typing import Dict, List
 
-from app.config.common import IMAGE_DIR, JOURNAL_DIR, JOURNAL_HISTORY_FILE, SESSION_CACHE_FILE
+from app.config.common import IMAGE_DIR, JOURNAL_DIR, JOURNAL_HISTORY_FILE, REGEO_RACE_MODES, SESSION_CACHE_FILE
+from app.utils.session_store import get_session_store
 
 IMAGE_EXTS = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'}
 
@@ -104,6 +105,10 @@ def validate_config(data: dict):
     if map_provider not in ("amap", "tencent"):
         return "mapProvider must be amap or tencent."
 
+    map_race_mode = str(input_data.get("mapRaceMode", "off") or "off").strip().lower()
+    if map_race_mode not in REGEO_RACE_MODES:
+        return "mapRaceMode must be off, hedge or race."
+
     map_api_keys = input_data.get("mapApiKeys")
     if map_api_keys not in (None, ""):
         if not isinstance(map_api_keys, dict):
@@ -217,13 +222,12 @@ def check_img(img_path: str):
 
 
 def get_img_file(timestamp, img_path: str):
-    target = check_img(img_path)
-    mime, _ = mimetypes.guess_type(target)
-    if not mime:
-        mime = "image/jpeg"
-    ext = os.path.splitext(target)[1] or ".jpg"
+    from app.utils.image_prep import get_image_preparer
+
+    prepared = get_image_preparer().prepare(check_img(img_path))
+    mime = prepared.mime or mimetypes.guess_type(prepared.path)[0] or "image/jpeg"
     return {
-        "file": (f"{timestamp}{ext}", open(target, "rb"), mime)
+        "file": (prepared.file_name(timestamp), open(prepared.path, "rb"), mime)
     }
 
 
@@ -266,14 +270,8 @@ def clear_journal_history(section: str = None) -> None:
 
 
 def load_session_cache() -> dict:
-    """加载会话缓存"""
-    if not os.path.exists(SESSION_CACHE_FILE):
-        return {}
-    try:
-        with open(SESSION_CACHE_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception:
-        return {}
+    """加载会话缓存（内存副本，写入后自动失效）"""
+    return get_session_store().get()
 
 
 def save_session_cache(session_id: str, encrypt_value: str, open_id: str, union_id: str, trainee_id: str = None):
@@ -290,6 +288,7 @@ def save_session_cache(session_id: str, encrypt_value: str, open_id: str, union_
     }
     ensure_dir(os.path.dirname(SESSION_CACHE_FILE))
     save_json_file(SESSION_CACHE_FILE, cache)
+    get_session_store().invalidate()
 
 
 def get_valid_session_cache() -> dict:
@@ -311,11 +310,36 @@ def get_valid_session_cache() -> dict:
         "encryptValue": cache.get("encryptValue"),
         "openId": cache.get("openId"),
         "unionId": cache.get("unionId"),
-        "traineeId": cache.get("traineeId")
+        "traineeId": cache.get("traineeId"),
+        "plan": cache.get("plan"),
+        "planTimestamp": cache.get("planTimestamp"),
     }
 
 
+def session_valid_until() -> float:
+    """会话缓存的过期时间戳，没有缓存时返回 0"""
+    cache = load_session_cache()
+    if not cache or not cache.get("sessionId"):
+        return 0
+    return cache.get("timestamp", 0) + cache.get("expire_seconds", 24 * 3600)
+
+
+def save_session_plan(session_id: str, trainee_id, plan: list) -> bool:
+    """把实习计划摘要写入当前会话缓存；会话已变更或已清除时不写入"""
+    import time
+    cache = load_session_cache()
+    if not cache or cache.get("sessionId") != session_id:
+        return False
+    cache["traineeId"] = trainee_id
+    cache["plan"] = plan
+    cache["planTimestamp"] = int(time.time())
+    save_json_file(SESSION_CACHE_FILE, cache)
+    get_session_store().invalidate()
+    return True
+
+
 def clear_session_cache():
     """清除会话缓存"""
     if os.path.exists(SESSION_CACHE_FILE):
         os.remove(SESSION_CACHE_FILE)
+    get_session_store().invalidate()
@@ -0,0 +1,236 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app.config.common import (
+    REGEO_CACHE_FILE,
+    REGEO_CACHE_MAX_ENTRIES,
+    REGEO_CACHE_PRECISION,
+    REGEO_CACHE_TTL_SECONDS,
+    REGEO_LATENCY_FILE,
+)
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        target, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (target[0] + target[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            target[0] = mid
+        else:
+            target[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def compact_regeocode(regeocode: dict) -> dict:
+    """只保留签到流程用到的字段：formatted_address 与 addressComponent.adcode。"""
+    component = regeocode.get("addressComponent") or {}
+    return {
+        "formatted_address": str(regeocode.get("formatted_address") or ""),
+        "addressComponent": {"adcode": str(component.get("adcode") or "")},
+    }
+
+
+class RegeoCache:
+    """按 geohash 网格缓存逆地理解析结果，带 TTL、LRU 淘汰和容量上限，持久化到磁盘。
+
+    命中只在内存中调整 LRU 顺序，随下一次写入（put/过期）或退出时的 flush 落盘。
+    """
+
+    def __init__(
+        self,
+        file_path: str = REGEO_CACHE_FILE,
+        precision: int = REGEO_CACHE_PRECISION,
+        ttl_seconds: int = REGEO_CACHE_TTL_SECONDS,
+        max_entries: int = REGEO_CACHE_MAX_ENTRIES,
+    ):
+        self.file_path = file_path
+        self.precision = max(1, min(int(precision), 12))
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, int(max_entries))
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def cell_key(self, provider: str, location: dict) -> str:
+        cell = geohash_encode(float(location["latitude"]), float(location["longitude"]), self.precision)
+        return f"{provider}:{cell}"
+
+    def _load(self) -> OrderedDict:
+        if self._entries is not None:
+            return self._entries
+        entries = OrderedDict()
+        if os.path.exists(self.file_path):
+            try:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+                for item in raw.get("entries", []):
+                    entries[item["key"]] = item
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                entries = OrderedDict()
+        self._entries = entries
+        return entries
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        tmp_path = f"{self.file_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": list(self._entries.values())}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.file_path)
+            self._dirty = False
+        except OSError as e:
+            logging.debug(f"逆地理缓存写入失败: {e}")
+
+    def get(self, provider: str, location: dict) -> dict | None:
+        try:
+            key = self.cell_key(provider, location)
+        except (KeyError, TypeError, ValueError):
+            return None
+        with self._lock:
+            entries = self._load()
+            item = entries.get(key)
+            if not item:
+                return None
+            if time.time() - item.get("stored_at", 0) > self.ttl_seconds:
+                entries.pop(key, None)
+                self._save()
+                return None
+            entries.move_to_end(key)
+            self._dirty = True
+            return {
+                "formatted_address": item["formatted_address"],
+                "addressComponent": {"adcode": item["adcode"]},
+            }
+
+    def put(self, provider: str, location: dict, regeocode: dict):
+        try:
+            key = self.cell_key(provider, location)
+        except (KeyError, TypeError, ValueError):
+            return
+        record = compact_regeocode(regeocode)
+        if not record["formatted_address"] or not record["addressComponent"]["adcode"]:
+            return
+        with self._lock:
+            entries = self._load()
+            entries[key] = {
+                "key": key,
+                "formatted_address": record["formatted_address"],
+                "adcode": record["addressComponent"]["adcode"],
+                "stored_at": int(time.time()),
+            }
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._save()
+
+    def flush(self):
+        """把仅在内存中调整过的 LRU 顺序写回磁盘"""
+        with self._lock:
+            if self._dirty and self._entries is not None:
+                self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()
+            self._dirty = False
+            if os.path.exists(self.file_path):
+                os.remove(self.file_path)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_regeo_cache() -> RegeoCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RegeoCache()
+                atexit.register(_cache.flush)
+    return _cache
+
+
+class ProviderLatency:
+    """记录各地图服务的平滑耗时（EWMA），用于决定竞速时优先请求哪个服务。"""
+
+    ALPHA = 0.3
+    FAILURE_PENALTY_SECONDS = 5.0
+
+    def __init__(self, file_path: str = REGEO_LATENCY_FILE):
+        self.file_path = file_path
+        self._stats = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._stats is not None:
+            return self._stats
+        stats = {}
+        if os.path.exists(self.file_path):
+            try:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+                stats = {str(k): float(v) for k, v in raw.items()}
+            except (OSError, ValueError, TypeError, AttributeError):
+                stats = {}
+        self._stats = stats
+        return stats
+
+    def record(self, provider: str, seconds: float | None):
+        """记录一次耗时；seconds 为 None 表示请求失败，按惩罚耗时计入。"""
+        sample = self.FAILURE_PENALTY_SECONDS if seconds is None else float(seconds)
+        with self._lock:
+            stats = self._load()
+            previous = stats.get(provider)
+            stats[provider] = sample if previous is None else previous + self.ALPHA * (sample - previous)
+            try:
+                os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+                with open(self.file_path, "w", encoding="utf-8") as f:
+                    json.dump(stats, f)
+            except OSError as e:
+                logging.debug(f"地图耗时统计写入失败: {e}")
+
+    def rank(self, providers: list) -> list:
+        """按平滑耗时从快到慢排序；缺少统计时保持传入顺序（首选服务在前）。"""
+        with self._lock:
+            stats = dict(self._load())
+        if not all(p in stats for p in providers):
+            return list(providers)
+        return sorted(providers, key=lambda p: stats[p])
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._load())
+
+
+_latency = None
+
+
+def get_provider_latency() -> ProviderLatency:
+    global _latency
+    if _latency is None:
+        with _cache_lock:
+            if _latency is None:
+                _latency = ProviderLatency()
+    return _latency
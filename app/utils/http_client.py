@@ -0,0 +1,200 @@
+import threading
+import urllib.request
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from app.config.common import (
+    HTTP_DEFAULT_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_TRUST_ENV,
+    MITM_PROXY,
+)
+from app.utils.deadline import Deadline
+
+# 当前线程正在执行的请求所属的 Deadline，供连接池登记在途连接
+_active = threading.local()
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+def system_proxies() -> dict:
+    """读取系统代理，并剔除指向本机 mitm 的条目。"""
+    proxies = {}
+    for scheme, proxy_url in urllib.request.getproxies().items():
+        if scheme not in ("http", "https"):
+            continue
+        if MITM_PROXY in str(proxy_url or ""):
+            continue
+        proxies[scheme] = proxy_url
+    return proxies
+
+
+class _DeadlineTrackingMixin:
+    """从连接池取出连接时登记到当前请求的 Deadline，归还时注销。"""
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        deadline = getattr(_active, "deadline", None)
+        if deadline is not None:
+            deadline.track(conn)
+            _active.connections.append(conn)
+        return conn
+
+    def _put_conn(self, conn):
+        deadline = getattr(_active, "deadline", None)
+        if deadline is not None and conn is not None:
+            deadline.untrack(conn)
+        super()._put_conn(conn)
+
+
+class _TrackingHTTPConnectionPool(_DeadlineTrackingMixin, HTTPConnectionPool):
+    pass
+
+
+class _TrackingHTTPSConnectionPool(_DeadlineTrackingMixin, HTTPSConnectionPool):
+    pass
+
+
+class _TrackingHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TrackingHTTPConnectionPool,
+            "https": _TrackingHTTPSConnectionPool,
+        }
+
+
+class HttpTransport:
+    """按 host 维护 keep-alive 连接池的共享 HTTP 传输层。
+
+    每个 host 一个 ``requests.Session``，连接在多次请求间复用，省去重复的
+    DNS/TCP/TLS 握手。Session 不保存服务端下发的 cookie，调用方仍需显式传入
+    cookies，行为与裸 ``requests.get/post`` 保持一致。
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = HTTP_POOL_MAXSIZE,
+        timeout=HTTP_DEFAULT_TIMEOUT,
+        trust_env: bool = HTTP_TRUST_ENV,
+        max_retries: int = HTTP_MAX_RETRIES,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.trust_env = trust_env
+        self.max_retries = max_retries
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        # 代理由 request() 统一决定，Session 自身从不读取环境变量
+        session.trust_env = False
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = _TrackingHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=self.max_retries,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def session_for(self, url: str) -> requests.Session:
+        key = _host_key(url)
+        session = self._sessions.get(key)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._build_session()
+                self._sessions[key] = session
+            return session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        trust_env: bool | None = None,
+        deadline: Deadline | None = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        发送请求
+        :param trust_env: 是否使用系统代理（会剔除本机 mitm 代理），默认沿用传输层配置
+        :param deadline: 任务时间预算；超时取剩余预算，cancel() 时立即断开在途连接
+        :return: requests.Response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if "proxies" not in kwargs:
+            use_env = self.trust_env if trust_env is None else trust_env
+            kwargs["proxies"] = system_proxies() if use_env else {}
+        session = self.session_for(url)
+        if deadline is None:
+            return session.request(method.upper(), url, **kwargs)
+
+        deadline.check()
+        kwargs["timeout"] = deadline.clamp_timeout(kwargs["timeout"])
+        _active.deadline = deadline
+        _active.connections = []
+        try:
+            return session.request(method.upper(), url, **kwargs)
+        except requests.RequestException:
+            # 连接被 cancel() 主动断开时，以取消/超时异常替代底层连接错误
+            deadline.check()
+            raise
+        finally:
+            for conn in _active.connections:
+                deadline.untrack(conn)
+            _active.deadline = None
+            _active.connections = []
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HttpTransport()
+    return _transport
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    return get_transport().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return get_transport().get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return get_transport().post(url, **kwargs)
@@ -0,0 +1,213 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.config.common import (
+    IMAGE_PREP_CACHE_DIR,
+    IMAGE_PREP_CACHE_MAX_FILES,
+    IMAGE_PREP_JPEG_QUALITY,
+    IMAGE_PREP_MAX_EDGE,
+    IMAGE_PREP_MAX_WORKERS,
+)
+
+# 预处理算法变化时递增，使旧缓存失效
+_PIPELINE_VERSION = 1
+_HASH_CHUNK = 1024 * 1024
+
+
+def _encode_jpeg(source: str, target: str, max_edge: int, quality: int):
+    """在子进程中执行：按 EXIF 方向摆正、缩放、转 RGB 后写出不含元数据的 JPEG。"""
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        if max_edge and max(image.size) > max_edge:
+            image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        # 不传 exif/icc_profile，输出即不带任何元数据
+        image.save(tmp_path, "JPEG", quality=quality, optimize=True, progressive=True)
+    os.replace(tmp_path, target)
+    return image.size
+
+
+class PreparedImage:
+    def __init__(self, source: str, path: str, original_size: int, size: int, elapsed: float, cached: bool):
+        self.source = source
+        self.path = path
+        self.original_size = original_size
+        self.size = size
+        self.elapsed = elapsed
+        self.cached = cached
+        self.mime = "image/jpeg" if path != source else None
+
+    def file_name(self, stem: str) -> str:
+        """上传用的文件名：预处理后统一为 .jpg，回退原图时沿用原扩展名"""
+        ext = ".jpg" if self.path != self.source else (os.path.splitext(self.source)[1] or ".jpg")
+        return f"{stem}{ext}"
+
+    def report(self) -> str:
+        source = os.path.basename(self.source)
+        if self.path == self.source:
+            return f"{source} 未预处理，按原图上传 {self.original_size / 1024:.0f}KB"
+        suffix = "缓存命中" if self.cached else f"耗时 {self.elapsed * 1000:.0f}ms"
+        return f"{source} {self.original_size / 1024:.0f}KB → {self.size / 1024:.0f}KB（{suffix}）"
+
+
+class ImagePreparer:
+    """上传前的图片预处理：缩放、重新编码为 JPEG、去除元数据。
+
+    结果按「原图内容哈希 + 参数」缓存到磁盘，同一张图重复签到直接复用；
+    编码在进程池中执行，不占用调用线程的 GIL。
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = IMAGE_PREP_CACHE_DIR,
+        max_edge: int = IMAGE_PREP_MAX_EDGE,
+        quality: int = IMAGE_PREP_JPEG_QUALITY,
+        max_files: int = IMAGE_PREP_CACHE_MAX_FILES,
+        max_workers: int = IMAGE_PREP_MAX_WORKERS,
+    ):
+        self.cache_dir = cache_dir
+        self.max_edge = int(max_edge)
+        self.quality = max(1, min(int(quality), 95))
+        self.max_files = max(1, int(max_files))
+        self.max_workers = max(1, int(max_workers))
+        self._executor = None
+        self._lock = threading.Lock()
+        # (路径, mtime, 大小) -> 内容哈希，避免每次都完整读一遍原图
+        self._digests = {}
+
+    def _content_digest(self, path: str, stat: os.stat_result) -> str:
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(key)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            self._digests[key] = digest
+        return digest
+
+    def cache_path(self, path: str) -> str:
+        stat = os.stat(path)
+        content = self._content_digest(path, stat)
+        settings = f"v{_PIPELINE_VERSION}:{self.max_edge}:{self.quality}"
+        key = hashlib.sha256(f"{content}:{settings}".encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{key}.jpg")
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _prune(self):
+        try:
+            files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)]
+        except OSError:
+            return
+        files = [f for f in files if f.endswith(".jpg")]
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=lambda f: os.path.getmtime(f) if os.path.exists(f) else 0)
+        for stale in files[:len(files) - self.max_files]:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+    def prepare_many(self, paths: list) -> list:
+        """
+        预处理多张图片，未命中缓存的图片在进程池中并行编码
+        :return: 与 paths 一一对应的 PreparedImage；预处理失败时回退为原图
+        """
+        started = time.perf_counter()
+        results = [None] * len(paths)
+        jobs = {}
+        for index, path in enumerate(paths):
+            original_size = os.path.getsize(path)
+            try:
+                target = self.cache_path(path)
+            except OSError as e:
+                logging.warning(f"⚠️ 读取图片失败，按原图上传: {e}")
+                results[index] = PreparedImage(path, path, original_size, original_size, 0.0, False)
+                continue
+            if os.path.exists(target):
+                # 刷新 mtime，作为 LRU 淘汰依据
+                os.utime(target)
+                results[index] = PreparedImage(path, target, original_size, os.path.getsize(target), 0.0, True)
+            else:
+                jobs.setdefault(target, []).append((index, path, original_size))
+
+        if jobs:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            futures = {}
+            try:
+                executor = self._get_executor()
+                for target, items in jobs.items():
+                    futures[target] = executor.submit(
+                        _encode_jpeg, items[0][1], target, self.max_edge, self.quality)
+            except (OSError, RuntimeError) as e:
+                logging.debug(f"图片预处理进程池不可用，改为当前线程处理: {e}")
+            for target, items in jobs.items():
+                try:
+                    if target in futures:
+                        try:
+                            futures[target].result()
+                        except BrokenProcessPool:
+                            self._reset_executor()
+                            _encode_jpeg(items[0][1], target, self.max_edge, self.quality)
+                    else:
+                        _encode_jpeg(items[0][1], target, self.max_edge, self.quality)
+                    size = os.path.getsize(target)
+                    elapsed = time.perf_counter() - started
+                    for index, path, original_size in items:
+                        results[index] = PreparedImage(path, target, original_size, size, elapsed, False)
+                except Exception as e:
+                    # 未安装 Pillow 或图片无法解码时不阻断上传
+                    logging.warning(f"⚠️ 图片预处理失败，按原图上传: {e}")
+                    for index, path, original_size in items:
+                        results[index] = PreparedImage(path, path, original_size, original_size, 0.0, False)
+            self._prune()
+
+        for prepared in results:
+            logging.info(f"🖼️ 图片预处理: {prepared.report()}")
+        return results
+
+    def prepare(self, path: str) -> PreparedImage:
+        return self.prepare_many([path])[0]
+
+    def close(self):
+        self._reset_executor()
+
+
+_preparer = None
+_preparer_lock = threading.Lock()
+
+
+def get_image_preparer() -> ImagePreparer:
+    global _preparer
+    if _preparer is None:
+        with _preparer_lock:
+            if _preparer is None:
+                _preparer = ImagePreparer()
+    return _preparer
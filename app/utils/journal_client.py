@@ -2,7 +2,7 @@ import json
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin
 
-import requests
+from app.utils import http_client
 
 
 class JournalServerError(RuntimeError):
@@ -24,7 +24,7 @@ def _request_json(method: str, url: str, *, token: Optional[str] = None, data: O
     kwargs = {"headers": headers, "timeout": 10}
     if data is not None:
         kwargs["json"] = data
-    response = requests.request(method.upper(), url, **kwargs)
+    response = http_client.request(method, url, **kwargs)
     try:
         payload = response.json()
     except json.JSONDecodeError:
@@ -0,0 +1,57 @@
+import importlib
+import logging
+import threading
+import time
+
+
+class LazyRegistry:
+    """按名称登记 "模块" 或 "模块:属性"，首次访问属性时才导入并缓存。
+
+    用于把对话框、工作线程和较重的第三方库推迟到第一次使用时加载，缩短启动到首帧的时间。
+    """
+
+    def __init__(self, entries: dict[str, str] | None = None):
+        self._targets = dict(entries or {})
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, target: str):
+        with self._lock:
+            self._targets[name] = target
+            self._loaded.pop(name, None)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def load(self, name: str):
+        try:
+            return self._loaded[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name in self._loaded:
+                return self._loaded[name]
+            try:
+                target = self._targets[name]
+            except KeyError:
+                raise AttributeError(name) from None
+            module_name, _, attr = target.partition(":")
+            started = time.perf_counter()
+            value = importlib.import_module(module_name)
+            if attr:
+                value = getattr(value, attr)
+            self._loaded[name] = value
+        logging.debug(f"延迟加载 {target} 耗时 {(time.perf_counter() - started) * 1000:.0f}ms")
+        return value
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.load(name)
+
+
+# 较重的第三方库：只在真正用到的函数里通过 libs.xxx 访问
+libs = LazyRegistry({
+    "psutil": "psutil",
+    "sm3": "gmssl.sm3",
+})
@@ -1,6 +1,6 @@
 import json
 
-import requests
+from app.utils import http_client
 
 
 class ModelConfigurationError(RuntimeError):
@@ -53,8 +53,9 @@ def call_chat_model(
 
     chunks = []
 
-    with requests.post(
+    with http_client.post(
         endpoint,
+        trust_env=True,
         headers=headers,
         json=payload,
         timeout=(10, 120),
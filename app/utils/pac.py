@@ -0,0 +1,130 @@
+import ast
+import json
+import logging
+import os
+import threading
+import time
+
+from app.config.common import ADDONS_DIR, PAC_SERVER_HOST, PAC_SERVER_PORT
+
+PAC_PATH = "/proxy.pac"
+PAC_CONTENT_TYPE = "application/x-ns-proxy-autoconfig"
+# get_code.py 中定义需要抓取的域名的常量
+_ADDON_HOST_CONSTANTS = ("INTERCEPT_HOST_SUFFIXES", "ONBOARDING_HOSTS")
+
+
+def capture_hosts(addon: str = os.path.join(ADDONS_DIR, "get_code.py")) -> tuple:
+    """从 addon 源码中读取抓取域名（不导入 addon，GUI 进程不必加载 mitmproxy）"""
+    hosts = []
+    try:
+        with open(addon, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError) as e:
+        logging.error(f"读取 addon 抓取域名失败: {e}")
+        return ()
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id in _ADDON_HOST_CONSTANTS for target in node.targets
+        ):
+            hosts.extend(ast.literal_eval(node.value))
+    return tuple(hosts)
+
+
+def build_pac_script(proxy: str, hosts) -> str:
+    """只有抓取域名（按后缀匹配，与 addon 一致）走 mitm，其余直连。
+
+    只用 ES3 语法，兼容 Windows WinHTTP 等较旧的 PAC 解释器。
+    """
+    return (
+        "function FindProxyForURL(url, host) {\n"
+        f"    var suffixes = {json.dumps([str(h).lower() for h in hosts])};\n"
+        "    host = host.toLowerCase();\n"
+        "    for (var i = 0; i < suffixes.length; i++) {\n"
+        "        var s = suffixes[i];\n"
+        "        if (host.length >= s.length && host.substring(host.length - s.length) === s) {\n"
+        f"            return \"PROXY {proxy}\";\n"
+        "        }\n"
+        "    }\n"
+        "    return \"DIRECT\";\n"
+        "}\n"
+    )
+
+
+class PacServer:
+    """在本机提供 PAC 脚本。系统代理指向 url 后，只有抓取域名经过 mitm。"""
+
+    def __init__(self, host: str = PAC_SERVER_HOST, port: int = PAC_SERVER_PORT):
+        self.host = host
+        self.port = port
+        self.script = ""
+        self.previous_url = None
+        self._server = None
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}{PAC_PATH}"
+
+    def owns(self, url: str | None) -> bool:
+        return bool(url) and url.split("?", 1)[0] == self.base_url
+
+    def _make_handler(self):
+        from http.server import BaseHTTPRequestHandler
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != PAC_PATH:
+                    self.send_error(404)
+                    return
+                body = server.script.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PAC_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def serve(self, proxy: str, hosts=None) -> str:
+        """
+        生成 PAC 并确保服务已启动
+        :return: 带版本号的 PAC 地址（避免系统沿用缓存的旧脚本）
+        """
+        with self._lock:
+            self.script = build_pac_script(proxy, capture_hosts() if hosts is None else hosts)
+            if self._server is None:
+                # http.server 只在启用 PAC 模式时需要，不在启动阶段导入
+                from http.server import ThreadingHTTPServer
+
+                server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+                server.daemon_threads = True
+                threading.Thread(target=server.serve_forever, name="pac-server", daemon=True).start()
+                self._server = server
+                logging.info(f"PAC 服务已启动: {self.base_url}")
+        return f"{self.base_url}?v={int(time.time())}"
+
+    def stop(self):
+        with self._lock:
+            server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_pac_server() -> PacServer:
+    global _server
+    if _server is None:
+        with _server_lock:
+            if _server is None:
+                _server = PacServer()
+    return _server
@@ -5,17 +5,17 @@ import re
 import time
 import urllib.parse
 
-from gmssl import sm2
-
 from app.config.common import (
     XYB_APP_ID,
     XYB_EXCLUDED_KEYS,
     XYB_KEY,
-    XYB_N_HEADER,
+    XYB_REFERER,
     XYB_SM2_MODE,
     XYB_SM2_PUBLIC_KEY,
+    XYB_VERSION,
 )
 from app.utils.common import rand_str
+from app.utils.sm2_engine import get_encryptor
 
 
 def _normalize_header_token_value(value):
@@ -32,71 +32,102 @@ def _normalize_header_token_value(value):
 
 
 def get_device_code(openId, device):
-    sm2_crypt = sm2.CryptSM2(
-        public_key=XYB_SM2_PUBLIC_KEY,
-        private_key=None,
-        mode=XYB_SM2_MODE,
-    )
+    sm2_crypt = get_encryptor(XYB_SM2_PUBLIC_KEY, XYB_SM2_MODE)
     return sm2_crypt.encrypt(
             f'b|_{device["brand"]},{device["model"]},{device["system"]},{device["platform"]}aid|_{XYB_APP_ID}t|_{int(time.time() * 1000)}uid|_{rand_str()}oid|_{openId}'.encode()).hex().strip()
 
 
-def get_header_token(e):
-    # 映射列表
-    n = list(XYB_KEY)
-
-    # 初始化o列表
-    o = [str(i) for i in range(62)]
-
-    # 获取当前时间戳（秒）
-    l = int(time.time())
-
-    # 随机打乱o列表并选取前20个元素
-    p = random.sample(o, 20)
-
-    # 拼接字符串g
-    g = "".join(n[int(e)] for e in p)
-
-    # 排序传入字典e的键
-    u = {k: e[k] for k in sorted(e)}
-
-    # 初始化结果字符串d
-    d = ""
+class XybRequestSigner:
+    """校友邦请求签名器：正则、排除字段、清理表和静态请求头只在构造时准备一次。"""
+
+    # 匹配特殊字符：字段值包含这些字符时不参与签名
+    SPECIAL_CHAR_PATTERN = r"[`~!@#$%^&*()+=|{}':;',\[\].<>/?~！@#￥%……&*（）——+|{}【】‘；：”“’。，、？]"
+    # 签名串需要删除的字符
+    STRIP_CHARS = " \n\r<>&-"
+    SAMPLE_SIZE = 20
+
+    def __init__(self, key=XYB_KEY, excluded_keys=XYB_EXCLUDED_KEYS, version=XYB_VERSION, referer=XYB_REFERER):
+        self._key = key
+        self._indices = [str(i) for i in range(len(key))]
+        self._special_char_regex = re.compile(self.SPECIAL_CHAR_PATTERN)
+        self._excluded_keys = frozenset(excluded_keys)
+        self._strip_table = str.maketrans("", "", self.STRIP_CHARS)
+        self._n_header = ",".join(excluded_keys)
+        self._static_headers = {
+            "content-type": "application/x-www-form-urlencoded",
+            "referer": referer,
+            "v": version,
+            "wechat": "1",
+            "xweb_xhr": "1",
+        }
+
+    def header_token(self, data, timestamp=None, sample=None):
+        """
+        计算签名头 m/t/s/n
+        :param data: 请求表单
+        :param timestamp: 秒级时间戳，默认取当前时间
+        :param sample: 随机选取的 key 下标（字符串列表），默认随机 20 个
+        :return: {"m", "t", "s", "n"}
+        """
+        l = int(time.time()) if timestamp is None else int(timestamp)
+        p = random.sample(self._indices, self.SAMPLE_SIZE) if sample is None else list(sample)
+        g = "".join(self._key[int(i)] for i in p)
+
+        parts = []
+        for c in sorted(data):
+            if c in self._excluded_keys:
+                continue
+            value_text = _normalize_header_token_value(data[c])
+            if not self._special_char_regex.search(value_text):
+                parts.append(value_text)
+
+        d = f"{''.join(parts)}{l}{g}".translate(self._strip_table)
+        md5_value = hashlib.md5(urllib.parse.quote(d).encode('utf-8')).hexdigest()
+
+        return {
+            "m": md5_value,
+            "t": str(l),
+            "s": "_".join(p),
+            "n": self._n_header,
+        }
+
+    def build_headers(self, data, user_agent, encrypt_value, device_code=None):
+        """
+        构建可直接发送的请求头
+        :param data: 请求表单，用于计算签名
+        :param user_agent: 配置中的 userAgent
+        :param encrypt_value: 登录返回的 encryptValue
+        :param device_code: 设备码，不传则不携带 devicecode 头
+        :return: 请求头字典
+        """
+        token = self.header_token(data)
+        headers = {"content-type": self._static_headers["content-type"]}
+        if device_code is not None:
+            headers["devicecode"] = device_code
+        headers.update({
+            "encryptvalue": encrypt_value,
+            "m": token["m"],
+            "n": token["n"],
+            "referer": self._static_headers["referer"],
+            "s": token["s"],
+            "t": token["t"],
+            "user-agent": user_agent,
+            "v": self._static_headers["v"],
+            "wechat": self._static_headers["wechat"],
+            "xweb_xhr": self._static_headers["xweb_xhr"],
+        })
+        return headers
+
+
+_signer = None
+
+
+def get_request_signer() -> XybRequestSigner:
+    global _signer
+    if _signer is None:
+        _signer = XybRequestSigner()
+    return _signer
 
-    # 正则表达式：匹配特殊字符
-    special_char_regex = re.compile(r"[`~!@#$%^&*()+=|{}':;',\[\].<>/?~！@#￥%……&*（）——+|{}【】‘；：”“’。，、？]")
-
-    # 遍历u字典，构建d字符串
-    for c in u:
-        value_text = _normalize_header_token_value(u[c])
-        # 如果字段值不包含特殊字符且不在排除字段中
-        if c not in XYB_EXCLUDED_KEYS and not special_char_regex.search(value_text):
-            d += value_text
-
-    # 拼接最终的字符串
-    d = f"{d}{l}{g}"
-
-    # 清理掉不需要的字符
-    d = (d.replace(" ", "")
-         .replace("\n", "")
-         .replace("\r", "")
-         .replace("<", "")
-         .replace(">", "")
-         .replace("&", "")
-         .replace("-", "")
-         .replace(r"\uD83C[\uDF00-\uDFFF]", "")
-         .replace(r"\uD83D[\uDC00-\uDE4F]", ""))
-
-    # URL 编码
-    d = urllib.parse.quote(d)
-
-    # 计算MD5值
-    md5_value = hashlib.md5(d.encode('utf-8')).hexdigest()
-
-    return {
-        "m": md5_value,
-        "t": str(l),
-        "s": "_".join(p) if len(p) > 0 else "",
-        "n": XYB_N_HEADER
-    }
 
+def get_header_token(e):
+    return get_request_signer().header_token(e)
@@ -0,0 +1,412 @@
+import logging
+import sys
+import threading
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+from app.config.common import PROXY_STATE_NOTIFY_REFRESH_SECONDS, PROXY_STATE_REFRESH_SECONDS
+
+INTERNET_SETTINGS_KEY = r"Software\Microsoft\Windows\CurrentVersion\Internet Settings"
+
+
+class ProxyBackend:
+    """系统代理读写后端。read() 返回 "host:port"（未开启代理时为 None），
+    read_pac() 返回自动代理配置（PAC）地址（未设置时为 None）。
+
+    supports_notifications 为 True 的后端需实现 wait_for_change，
+    ProxyState 会在后台线程中等待变更通知，而不是定时重新读取。
+    """
+
+    supports_notifications = False
+
+    def read(self) -> str | None:
+        raise NotImplementedError
+
+    def write(self, proxy: str):
+        raise NotImplementedError
+
+    def disable(self):
+        raise NotImplementedError
+
+    def read_pac(self) -> str | None:
+        raise NotImplementedError
+
+    def write_pac(self, url: str):
+        raise NotImplementedError
+
+    def disable_pac(self):
+        raise NotImplementedError
+
+    def wait_for_change(self, timeout: float) -> bool:
+        time.sleep(timeout)
+        return False
+
+
+class NullProxyBackend(ProxyBackend):
+    """不支持系统代理的平台（Linux 等）"""
+
+    def read(self):
+        return None
+
+    def write(self, proxy: str):
+        pass
+
+    def disable(self):
+        pass
+
+    def read_pac(self):
+        return None
+
+    def write_pac(self, url: str):
+        pass
+
+    def disable_pac(self):
+        pass
+
+
+class WindowsRegistryProxyBackend(ProxyBackend):
+    """通过 winreg 直接读写注册表，不再启动 reg.exe；用 RegNotifyChangeKeyValue 监听变更。"""
+
+    REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+    WAIT_OBJECT_0 = 0
+
+    def __init__(self):
+        import winreg
+
+        self._winreg = winreg
+        self._notify_key = None
+        self._event = None
+        self.supports_notifications = self._init_notifications()
+
+    def _init_notifications(self) -> bool:
+        try:
+            import ctypes
+
+            self._kernel32 = ctypes.windll.kernel32
+            self._advapi32 = ctypes.windll.advapi32
+            self._advapi32.RegNotifyChangeKeyValue.argtypes = [
+                ctypes.c_void_p, ctypes.c_bool, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_bool,
+            ]
+            self._kernel32.CreateEventW.restype = ctypes.c_void_p
+            self._kernel32.WaitForSingleObject.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+            self._event = self._kernel32.CreateEventW(None, False, False, None)
+            self._notify_key = self._winreg.OpenKey(
+                self._winreg.HKEY_CURRENT_USER, INTERNET_SETTINGS_KEY, 0, self._winreg.KEY_NOTIFY,
+            )
+            return bool(self._event)
+        except (OSError, AttributeError) as e:
+            logging.debug(f"注册表变更通知不可用，改为定时刷新代理状态: {e}")
+            return False
+
+    def read(self):
+        winreg = self._winreg
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, INTERNET_SETTINGS_KEY) as key:
+                enabled, _ = winreg.QueryValueEx(key, "ProxyEnable")
+                if int(enabled) != 1:
+                    return None
+                server, _ = winreg.QueryValueEx(key, "ProxyServer")
+        except OSError:
+            return None
+        server = str(server or "").strip()
+        return server or None
+
+    def _set_values(self, enabled: int, server: str):
+        from app.utils.commands import refresh_system_proxy
+
+        winreg = self._winreg
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, INTERNET_SETTINGS_KEY, 0, winreg.KEY_SET_VALUE) as key:
+            winreg.SetValueEx(key, "ProxyEnable", 0, winreg.REG_DWORD, enabled)
+            winreg.SetValueEx(key, "ProxyServer", 0, winreg.REG_SZ, server)
+        refresh_system_proxy()
+
+    def write(self, proxy: str):
+        self._set_values(1, proxy)
+
+    def disable(self):
+        self._set_values(0, "")
+
+    def read_pac(self):
+        winreg = self._winreg
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, INTERNET_SETTINGS_KEY) as key:
+                url, _ = winreg.QueryValueEx(key, "AutoConfigURL")
+        except OSError:
+            return None
+        return str(url or "").strip() or None
+
+    def write_pac(self, url: str):
+        from app.utils.commands import refresh_system_proxy
+
+        winreg = self._winreg
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, INTERNET_SETTINGS_KEY, 0, winreg.KEY_SET_VALUE) as key:
+            winreg.SetValueEx(key, "AutoConfigURL", 0, winreg.REG_SZ, url)
+        refresh_system_proxy()
+
+    def disable_pac(self):
+        from app.utils.commands import refresh_system_proxy
+
+        winreg = self._winreg
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, INTERNET_SETTINGS_KEY, 0, winreg.KEY_SET_VALUE) as key:
+                winreg.DeleteValue(key, "AutoConfigURL")
+        except FileNotFoundError:
+            return
+        refresh_system_proxy()
+
+    def wait_for_change(self, timeout: float) -> bool:
+        # 通知是一次性的，每次等待前重新登记
+        status = self._advapi32.RegNotifyChangeKeyValue(
+            self._notify_key.handle, False, self.REG_NOTIFY_CHANGE_LAST_SET, self._event, True,
+        )
+        if status != 0:
+            time.sleep(timeout)
+            return False
+        return self._kernel32.WaitForSingleObject(self._event, int(timeout * 1000)) == self.WAIT_OBJECT_0
+
+
+class MacOSProxyBackend(ProxyBackend):
+    """读取走 SystemConfiguration（urllib 的 _scproxy），写入仍使用 networksetup。"""
+
+    def read(self):
+        try:
+            proxies = urllib.request.getproxies_macosx_sysconf()
+        except Exception:
+            return None
+        value = proxies.get("http")
+        if not value:
+            return None
+        netloc = urlsplit(value if "://" in value else f"http://{value}").netloc
+        return netloc or None
+
+    def write(self, proxy: str):
+        from app.utils.commands import bash, macos_network_services
+
+        services = macos_network_services()
+        if not services:
+            raise RuntimeError("macOS 获取网络服务失败，无法自动设置系统代理")
+        host, port = proxy.split(":", 1)
+        for service in services:
+            bash(f'networksetup -setwebproxy "{service}" {host} {port}')
+            bash(f'networksetup -setsecurewebproxy "{service}" {host} {port}')
+
+    def disable(self):
+        from app.utils.commands import bash, macos_network_services
+
+        for service in macos_network_services():
+            bash(f'networksetup -setwebproxystate "{service}" off')
+            bash(f'networksetup -setsecurewebproxystate "{service}" off')
+
+    def read_pac(self):
+        from app.utils.commands import bash, macos_network_services
+
+        services = macos_network_services()
+        if not services:
+            return None
+        fields = {}
+        for line in bash(f'networksetup -getautoproxyurl "{services[0]}"').splitlines():
+            name, _, value = line.partition(":")
+            fields[name.strip()] = value.strip()
+        if fields.get("Enabled") != "Yes":
+            return None
+        url = fields.get("URL", "")
+        return url if url and url != "(null)" else None
+
+    def write_pac(self, url: str):
+        from app.utils.commands import bash, macos_network_services
+
+        services = macos_network_services()
+        if not services:
+            raise RuntimeError("macOS 获取网络服务失败，无法自动设置 PAC 代理")
+        for service in services:
+            bash(f'networksetup -setautoproxyurl "{service}" "{url}"')
+
+    def disable_pac(self):
+        from app.utils.commands import bash, macos_network_services
+
+        for service in macos_network_services():
+            bash(f'networksetup -setautoproxystate "{service}" off')
+
+
+class FakeProxyBackend(ProxyBackend):
+    """内存中的代理后端，用于在任意平台上测试/基准测试缓存与心跳逻辑。"""
+
+    def __init__(self, proxy: str | None = None, read_delay: float = 0.0, supports_notifications: bool = False):
+        self.proxy = proxy
+        self.pac = None
+        self.read_delay = read_delay
+        self.supports_notifications = supports_notifications
+        self.reads = 0
+        self.writes = 0
+        self._changed = threading.Event()
+
+    def read(self):
+        self.reads += 1
+        if self.read_delay:
+            time.sleep(self.read_delay)
+        return self.proxy
+
+    def write(self, proxy: str):
+        self.writes += 1
+        self.proxy = proxy
+        self._changed.set()
+
+    def disable(self):
+        self.writes += 1
+        self.proxy = None
+        self._changed.set()
+
+    def read_pac(self):
+        self.reads += 1
+        if self.read_delay:
+            time.sleep(self.read_delay)
+        return self.pac
+
+    def write_pac(self, url: str):
+        self.writes += 1
+        self.pac = url
+        self._changed.set()
+
+    def disable_pac(self):
+        self.writes += 1
+        self.pac = None
+        self._changed.set()
+
+    def set_external(self, proxy: str | None):
+        """模拟其它程序修改了系统代理"""
+        self.proxy = proxy
+        self._changed.set()
+
+    def wait_for_change(self, timeout: float) -> bool:
+        if not self.supports_notifications:
+            return super().wait_for_change(timeout)
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed
+
+
+def default_backend() -> ProxyBackend:
+    try:
+        if sys.platform == "win32":
+            return WindowsRegistryProxyBackend()
+        if sys.platform == "darwin":
+            return MacOSProxyBackend()
+    except Exception as e:
+        logging.debug(f"系统代理后端初始化失败: {e}")
+    return NullProxyBackend()
+
+
+class ProxyState:
+    """缓存最近一次读取的系统代理。
+
+    get() 默认返回缓存值；缓存在以下情况刷新：收到后端变更通知、超过刷新间隔、
+    经本类写入代理后，或调用方显式 refresh=True。
+    """
+
+    def __init__(self, backend: ProxyBackend | None = None, refresh_interval: float | None = None):
+        self.backend = backend or default_backend()
+        if refresh_interval is None:
+            refresh_interval = (
+                PROXY_STATE_NOTIFY_REFRESH_SECONDS if self.backend.supports_notifications
+                else PROXY_STATE_REFRESH_SECONDS
+            )
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._value = None
+        self._read_at = None
+        self._dirty = True
+        self._pac = None
+        self._pac_read_at = None
+        self._pac_dirty = True
+        self._listeners = []
+        self._stopped = threading.Event()
+        if self.backend.supports_notifications:
+            threading.Thread(target=self._watch, name="proxy-state-watch", daemon=True).start()
+
+    def _watch(self):
+        while not self._stopped.is_set():
+            try:
+                if self.backend.wait_for_change(self.refresh_interval):
+                    self.invalidate()
+            except Exception as e:
+                logging.debug(f"代理变更监听异常: {e}")
+                self._stopped.wait(self.refresh_interval)
+
+    def _refresh_locked(self):
+        self._value = self.backend.read()
+        self._read_at = time.monotonic()
+        self._dirty = False
+
+    def get(self, refresh: bool = False) -> str | None:
+        with self._lock:
+            stale = self._read_at is None or time.monotonic() - self._read_at >= self.refresh_interval
+            changed = refresh or self._dirty or stale
+            if changed:
+                before = self._value
+                self._refresh_locked()
+                changed = self._value != before
+            value = self._value
+            listeners = list(self._listeners) if changed else []
+        for callback in listeners:
+            try:
+                callback(value)
+            except Exception as e:
+                logging.debug(f"代理状态回调异常: {e}")
+        return value
+
+    def set(self, proxy: str):
+        self.backend.write(proxy)
+        self.invalidate()
+
+    def disable(self):
+        self.backend.disable()
+        self.invalidate()
+
+    def pac_url(self, refresh: bool = False) -> str | None:
+        """当前自动代理配置（PAC）地址，缓存策略与 get() 相同"""
+        with self._lock:
+            stale = self._pac_read_at is None or time.monotonic() - self._pac_read_at >= self.refresh_interval
+            if refresh or self._pac_dirty or stale:
+                self._pac = self.backend.read_pac()
+                self._pac_read_at = time.monotonic()
+                self._pac_dirty = False
+            return self._pac
+
+    def set_pac(self, url: str):
+        self.backend.write_pac(url)
+        self.invalidate()
+
+    def disable_pac(self):
+        self.backend.disable_pac()
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._dirty = True
+            self._pac_dirty = True
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def close(self):
+        self._stopped.set()
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def get_proxy_state() -> ProxyState:
+    global _state
+    if _state is None:
+        with _state_lock:
+            if _state is None:
+                _state = ProxyState()
+    return _state
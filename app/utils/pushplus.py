@@ -1,6 +1,6 @@
 import json
 
-import requests
+from app.utils import http_client
 
 
 def notify_pushplus(title: str, content: str, token: str) -> str:
@@ -17,6 +17,6 @@ def notify_pushplus(title: str, content: str, token: str) -> str:
     }
     body = json.dumps(data, ensure_ascii=False).encode("utf-8")
     headers = {"Content-Type": "application/json"}
-    resp = requests.post(url, data=body, headers=headers, timeout=15)
+    resp = http_client.post(url, data=body, headers=headers, timeout=15)
     resp.raise_for_status()
     return (resp.text or "").strip()
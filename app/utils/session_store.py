@@ -0,0 +1,60 @@
+import json
+import logging
+import os
+import threading
+
+from app.config.common import SESSION_CACHE_FILE
+
+
+class SessionStore:
+    """session_cache.json 的内存副本。
+
+    首次读取时从磁盘加载，之后直接返回内存中的数据；
+    files.save_session_cache / save_session_plan / clear_session_cache 写入后调用 invalidate，
+    下一次读取重新加载。version 在每次失效时递增，界面据此判断是否需要重绘。
+    """
+
+    def __init__(self, path: str = SESSION_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._cache = None
+        self._version = 0
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.debug(f"读取会话缓存失败: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self) -> dict:
+        with self._lock:
+            if self._cache is None:
+                self._cache = self._load()
+            return dict(self._cache)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self):
+        with self._lock:
+            self._cache = None
+            self._version += 1
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SessionStore()
+    return _store
@@ -0,0 +1,166 @@
+import hashlib
+import secrets
+import threading
+
+from app.utils.lazy import libs
+
+# SM2 推荐曲线参数（与 gmssl.sm2.default_ecc_table 一致）
+SM2_P = 0xFFFFFFFEFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF00000000FFFFFFFFFFFFFFFF
+SM2_N = 0xFFFFFFFEFFFFFFFFFFFFFFFFFFFFFFFF7203DF6B21C6052B53BBF40939D54123
+SM2_GX = 0x32C4AE2C1F1981195F9904466A39C9948FE30BBFF2660BE1715A4589334C74C7
+SM2_GY = 0xBC3736A2F4F6779C59BDCEE36B692153D0A9877CC62A474002DF32E52139F0A0
+
+WINDOW_BITS = 4
+WINDOW_COUNT = 256 // WINDOW_BITS
+WINDOW_MASK = (1 << WINDOW_BITS) - 1
+
+
+def _sm3_digest(data: bytes) -> bytes:
+    try:
+        return hashlib.new("sm3", data).digest()
+    except ValueError:
+        return bytes.fromhex(libs.sm3.sm3_hash(list(data)))
+
+
+def _sm3_kdf(z: bytes, klen: int) -> bytes:
+    blocks = []
+    for counter in range(1, (klen + 31) // 32 + 1):
+        blocks.append(_sm3_digest(z + counter.to_bytes(4, "big")))
+    return b"".join(blocks)[:klen]
+
+
+def _jacobian_double(point):
+    x1, y1, z1 = point
+    if not y1 or not z1:
+        return 0, 1, 0
+    p = SM2_P
+    # a = -3: M = 3 * (X - Z^2) * (X + Z^2)
+    zz = z1 * z1 % p
+    m = 3 * (x1 - zz) * (x1 + zz) % p
+    yy = y1 * y1 % p
+    s = 4 * x1 * yy % p
+    x3 = (m * m - 2 * s) % p
+    y3 = (m * (s - x3) - 8 * yy * yy) % p
+    z3 = 2 * y1 * z1 % p
+    return x3, y3, z3
+
+
+def _jacobian_add_affine(point, x2, y2):
+    x1, y1, z1 = point
+    if not z1:
+        return x2, y2, 1
+    p = SM2_P
+    z1z1 = z1 * z1 % p
+    u2 = x2 * z1z1 % p
+    s2 = y2 * z1 * z1z1 % p
+    h = (u2 - x1) % p
+    r = (s2 - y1) % p
+    if not h:
+        if not r:
+            return _jacobian_double(point)
+        return 0, 1, 0
+    hh = h * h % p
+    hhh = h * hh % p
+    v = x1 * hh % p
+    x3 = (r * r - hhh - 2 * v) % p
+    y3 = (r * (v - x3) - y1 * hhh) % p
+    z3 = z1 * h % p
+    return x3, y3, z3
+
+
+def _to_affine(point):
+    x, y, z = point
+    if not z:
+        raise ValueError("point at infinity")
+    p = SM2_P
+    z_inv = pow(z, -1, p)
+    z_inv2 = z_inv * z_inv % p
+    return x * z_inv2 % p, y * z_inv2 * z_inv % p
+
+
+class FixedPointTable:
+    """固定点的窗口预计算表：table[i][j] = (j + 1) * 16^i * P（仿射坐标）。
+
+    标量乘法只需 64 次混合点加，不再需要倍点运算。
+    """
+
+    def __init__(self, x: int, y: int):
+        rows = []
+        base = (x, y, 1)
+        for _ in range(WINDOW_COUNT):
+            row = []
+            acc = base
+            row.append(_to_affine(acc))
+            for _ in range(WINDOW_MASK - 1):
+                acc = _jacobian_add_affine(acc, *row[0])
+                row.append(_to_affine(acc))
+            rows.append(row)
+            for _ in range(WINDOW_BITS):
+                base = _jacobian_double(base)
+        self._rows = rows
+
+    def multiply(self, k: int):
+        acc = (0, 1, 0)
+        for row in self._rows:
+            digit = k & WINDOW_MASK
+            if digit:
+                acc = _jacobian_add_affine(acc, *row[digit - 1])
+            k >>= WINDOW_BITS
+            if not k:
+                break
+        return _to_affine(acc)
+
+
+class SM2Encryptor:
+    """针对固定公钥的 SM2 加密引擎，输出与 ``gmssl.sm2.CryptSM2.encrypt`` 字节兼容。"""
+
+    def __init__(self, public_key: str, mode: int = 1):
+        assert mode in (0, 1), 'mode must be one of (0, 1)'
+        public_key = public_key[2:] if len(public_key) == 130 and public_key.startswith("04") else public_key
+        self.mode = mode
+        self._g_table = FixedPointTable(SM2_GX, SM2_GY)
+        self._p_table = FixedPointTable(int(public_key[:64], 16), int(public_key[64:128], 16))
+
+    def encrypt(self, data: bytes, k: int | None = None) -> bytes:
+        """
+        加密
+        :param data: 明文
+        :param k: 随机数，仅用于与 gmssl 做一致性校验，正常调用不要传
+        :return: C1C3C2（mode=1）或 C1C2C3（mode=0）
+        """
+        while True:
+            nonce = k if k is not None else secrets.randbelow(SM2_N - 1) + 1
+            c1x, c1y = self._g_table.multiply(nonce)
+            x2, y2 = self._p_table.multiply(nonce)
+            x2_bytes = x2.to_bytes(32, "big")
+            y2_bytes = y2.to_bytes(32, "big")
+            t = _sm3_kdf(x2_bytes + y2_bytes, len(data))
+            if any(t):
+                break
+            if k is not None:
+                raise ValueError("kdf derived an all-zero key")
+
+        c1 = c1x.to_bytes(32, "big") + c1y.to_bytes(32, "big")
+        c2 = (int.from_bytes(data, "big") ^ int.from_bytes(t, "big")).to_bytes(len(data), "big")
+        c3 = _sm3_digest(x2_bytes + data + y2_bytes)
+        if self.mode:
+            return c1 + c3 + c2
+        return c1 + c2 + c3
+
+
+_encryptors = {}
+_encryptors_lock = threading.Lock()
+
+
+def get_encryptor(public_key: str, mode: int = 1) -> SM2Encryptor:
+    """进程内按 (公钥, mode) 复用加密引擎，预计算表只构建一次。"""
+    key = (public_key, mode)
+    encryptor = _encryptors.get(key)
+    if encryptor is not None:
+        return encryptor
+    with _encryptors_lock:
+        encryptor = _encryptors.get(key)
+        if encryptor is None:
+            encryptor = SM2Encryptor(public_key, mode)
+            _encryptors[key] = encryptor
+        return encryptor
@@ -0,0 +1,141 @@
+import json
+import logging
+import re
+
+from app.config.common import HTTP_TRACE_BODY_LIMIT, HTTP_TRACE_ENABLED, HTTP_TRACE_REDACT_KEYS
+
+_REDACT_KEYS = frozenset(key.lower() for key in HTTP_TRACE_REDACT_KEYS)
+# 文本中的 "key":"value" / key=value 形式
+_REDACT_PATTERN = re.compile(
+    r"""(?P<prefix>\b(?:%s)["']?\s*[:=]\s*["']?)(?P<value>[^"'&;,\s}]+)"""
+    % "|".join(re.escape(key) for key in sorted(_REDACT_KEYS, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+
+def mask(value) -> str:
+    text = str(value or "")
+    if len(text) <= 8:
+        return "***"
+    return f"{text[:4]}***"
+
+
+def redact(value):
+    """递归脱敏：键名命中 HTTP_TRACE_REDACT_KEYS 的值只保留前几位"""
+    if isinstance(value, dict):
+        return {
+            k: mask(v) if str(k).lower() in _REDACT_KEYS else redact(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return type(value)(redact(item) for item in value)
+    return value
+
+
+def redact_text(text: str) -> str:
+    # 逐个子串查找比直接跑正则快得多，大多数响应体不含敏感字段
+    lowered = text.lower()
+    if not any(key in lowered for key in _REDACT_KEYS):
+        return text
+    return _REDACT_PATTERN.sub(lambda match: match.group("prefix") + mask(match.group("value")), text)
+
+
+def truncate(text: str, limit: int = HTTP_TRACE_BODY_LIMIT) -> str:
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return f"{text[:limit]}…(共 {len(text)} 字符)"
+
+
+def tracing(level: int = logging.DEBUG, logger: logging.Logger | None = None) -> bool:
+    """是否有 handler 会接收该级别的记录；都不接收时调用方连日志记录都不必创建"""
+    if not HTTP_TRACE_ENABLED:
+        return False
+    logger = logger or logging.getLogger()
+    if not logger.isEnabledFor(level):
+        return False
+    current = logger
+    while current:
+        if any(level >= handler.level for handler in current.handlers):
+            return True
+        if not current.propagate:
+            break
+        current = current.parent
+    return False
+
+
+class _LazyParts:
+    """请求参数，只有在日志真正被格式化时才脱敏、拼接"""
+
+    __slots__ = ("parts", "limit")
+
+    def __init__(self, parts: dict, limit: int):
+        self.parts = parts
+        self.limit = limit
+
+    def __str__(self):
+        return ", ".join(
+            f"{name}:{truncate(str(redact(value)), self.limit)}" for name, value in self.parts.items()
+        )
+
+
+class _LazyJson:
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit: int):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self):
+        value = redact(self.value)
+        try:
+            text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        except TypeError:
+            text = str(value)
+        return truncate(text, self.limit)
+
+
+def lazy_json(value, limit: int = HTTP_TRACE_BODY_LIMIT):
+    """作为日志参数传入：格式化时才脱敏并序列化为紧凑 JSON"""
+    return _LazyJson(value, limit)
+
+
+class _LazyBody:
+    """响应体，只解码前 limit 字节，避免对大响应做完整解码"""
+
+    __slots__ = ("response", "limit")
+
+    def __init__(self, response, limit: int):
+        self.response = response
+        self.limit = limit
+
+    def __str__(self):
+        content = getattr(self.response, "content", None)
+        if content is None:
+            return ""
+        if isinstance(content, str):
+            text, size = content, len(content)
+        else:
+            size = len(content)
+            head = content if self.limit <= 0 else content[:self.limit]
+            text = head.decode(self.response.encoding or "utf-8", errors="replace")
+        text = redact_text(text)
+        if self.limit > 0 and size > self.limit:
+            text = f"{text}…(共 {size} 字节)"
+        return text
+
+
+def trace_request(url: str, level: int = logging.DEBUG, limit: int = HTTP_TRACE_BODY_LIMIT, **parts):
+    """
+    记录即将发出的请求
+    :param parts: headers / params / data / cookies / files 等，值为 None 的项不输出
+    """
+    if not tracing(level):
+        return
+    parts = {name: value for name, value in parts.items() if value is not None}
+    logging.log(level, "🛩️ 准备发起请求。url:%s, %s", url, _LazyParts(parts, limit))
+
+
+def trace_response(response, level: int = logging.DEBUG, limit: int = HTTP_TRACE_BODY_LIMIT):
+    if not tracing(level):
+        return
+    logging.log(level, "📡 收到响应:%s %s", response, _LazyBody(response, limit))
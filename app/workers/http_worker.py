@@ -1,8 +1,9 @@
 from typing import Any, Dict, Optional
 
-import requests
 from PySide6.QtCore import QThread, Signal
 
+from app.utils import http_client
+
 
 class HttpWorker(QThread):
     result_signal = Signal(bool, str)
@@ -16,7 +17,7 @@ class HttpWorker(QThread):
 
     def run(self):
         try:
-            response = requests.post(self.url, json=self.data, headers=self.headers, timeout=self.timeout)
+            response = http_client.post(self.url, json=self.data, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
             text = (response.text or "").strip()
             self.result_signal.emit(True, text[:200] or "success")
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from PySide6.QtCore import QThread, Signal
+
+from app.utils.app_log import get_app_log
+
+
+class LogExportWorker(QThread):
+    result_signal = Signal(bool, str)
+
+    def __init__(self, dest: str, start: datetime | None, end: datetime | None, compress: bool):
+        super().__init__()
+        self.dest = dest
+        self.start_time = start
+        self.end_time = end
+        self.compress = compress
+
+    def run(self):
+        try:
+            count = get_app_log().export(self.dest, start=self.start_time, end=self.end_time, compress=self.compress)
+            self.result_signal.emit(True, f"日志导出成功，共 {count} 条")
+        except Exception as exc:
+            self.result_signal.emit(False, f"导出失败: {exc}")
@@ -1,89 +1,201 @@
 import logging
+import os
+import threading
 import time
+from datetime import datetime
 
 from PySide6.QtCore import QThread, Signal
 
 from app.config.common import MITM_PROXY
-from app.mitm.cert_state import summarize_cert_state
+from app.mitm.cert_state import get_cert_state_service, summarize_cert_state
 from app.utils.commands import (
     get_net_io, get_network_type, get_local_ip, get_system_proxy,
     check_port_listening
 )
 
 
+class MonitorMetric:
+    """
+    一个监控项及其采样间隔（秒）
+    :param hidden: 窗口隐藏时的间隔，None 表示暂停
+    :param capture: 抓取 code / 执行任务期间的间隔，None 表示沿用 visible/hidden
+    """
+
+    def __init__(self, name: str, sampler, visible: float, hidden: float | None = None, capture: float | None = None):
+        self.name = name
+        self.sampler = sampler
+        self.visible = visible
+        self.hidden = hidden
+        self.capture = capture
+
+    def interval(self, visible: bool, capturing: bool) -> float | None:
+        if capturing and self.capture is not None:
+            return self.capture
+        return self.visible if visible else self.hidden
+
+
 class MonitorThread(QThread):
+    """按监控项各自的间隔采样，只发送发生变化的字段。
+
+    窗口隐藏到托盘时仅保留 mitm 守护（低频），其余只用于界面展示的监控项暂停；
+    获取 code / 执行任务期间加快 mitm 端口和代理的检查。
+    """
+
     data_signal = Signal(dict)
+    # 证书状态变化事件 (cert_ok, detail)，由 CertStateService 发布
+    cert_signal = Signal(bool, str)
 
-    def __init__(self, mitm):
+    def __init__(self, lifecycle):
         super().__init__()
-        self.mitm = mitm
+        self.lifecycle = lifecycle
         self._running = True
+        self._visible = True
+        self._capturing = False
+        self._wake = threading.Event()
+        self._last_run = {}
+        self._last_values = {}
+        self._last_io = None
+        self._last_io_time = None
+        host, port = MITM_PROXY.split(":")
+        self._host = host
+        self._port = int(port)
+        self.metrics = [
+            MonitorMetric("time", self._sample_time, visible=1),
+            MonitorMetric("pid", self._sample_pid, visible=3600),
+            MonitorMetric("speed", self._sample_speed, visible=1),
+            MonitorMetric("mitm", self._sample_mitm, visible=2, hidden=10, capture=0.5),
+            MonitorMetric("proxy", self._sample_proxy, visible=2, capture=1),
+            MonitorMetric("cert", self._sample_cert, visible=5),
+            MonitorMetric("net", self._sample_net, visible=10),
+            MonitorMetric("ip", self._sample_ip, visible=30),
+        ]
+        get_cert_state_service().subscribe(self._on_cert_changed)
+
+    def _on_cert_changed(self, cert_ok: bool, detail: str):
+        self.cert_signal.emit(cert_ok, detail)
 
     def stop(self):
         """Stop monitoring loop so the thread can exit cleanly."""
         self._running = False
+        get_cert_state_service().unsubscribe(self._on_cert_changed)
         self.requestInterruption()
+        self._wake.set()
+
+    def set_visible(self, visible: bool):
+        """主窗口显示/隐藏（含最小化）时调用"""
+        if self._visible != visible:
+            self._visible = visible
+            if not visible:
+                # 速率暂停采样，恢复后重新计算，避免显示隐藏期间的平均值
+                self._last_io = None
+            self._wake.set()
+
+    def set_capture_active(self, active: bool):
+        """获取 code 或执行任务期间调用，加快 mitm/代理检查"""
+        if self._capturing != active:
+            self._capturing = active
+            self._wake.set()
+
+    # ----------------------------- 采样 -----------------------------
+
+    @staticmethod
+    def _sample_time():
+        return {"time": datetime.now().strftime("%H:%M:%S")}
+
+    @staticmethod
+    def _sample_pid():
+        return {"pid": os.getpid()}
+
+    def _sample_speed(self):
+        cur_io = get_net_io()
+        now = time.monotonic()
+        speed_d = speed_u = 0
+        if self._last_io and cur_io:
+            dt = now - self._last_io_time
+            if dt > 0:
+                speed_d = (cur_io.bytes_recv - self._last_io.bytes_recv) / 1024 / dt
+                speed_u = (cur_io.bytes_sent - self._last_io.bytes_sent) / 1024 / dt
+        self._last_io = cur_io
+        self._last_io_time = now
+        # 界面按整数 K 显示，取整后相同的速率不重复发送
+        return {"speed_d": round(speed_d), "speed_u": round(speed_u)}
+
+    def _sample_mitm(self):
+        if self.lifecycle.stop_if_idle():
+            return {"mitm": False}
+        listening = check_port_listening(self._host, self._port)
+        # on_demand 模式下无人使用时不自动拉起
+        if not listening and self.lifecycle.wanted():
+            logging.warning("⚠️ Mitm 未运行，尝试自动启动...")
+            # start() 返回前已确认端口监听（子进程模式）或收到就绪通知（内置引擎）
+            started = self.lifecycle.ensure_running()
+            if started:
+                logging.info("🛡️ Mitm 自动启动成功")
+            else:
+                detail = self.lifecycle.service.last_error or "请检查程序目录或权限"
+                logging.error(f"❌ Mitm 自动启动失败: {detail}")
+            listening = started
+        return {"mitm": listening}
+
+    @staticmethod
+    def _sample_proxy():
+        return {"proxy": get_system_proxy()}
+
+    @staticmethod
+    def _sample_cert():
+        cert_ok, cert_detail = summarize_cert_state()
+        return {"cert": cert_ok, "cert_detail": cert_detail}
+
+    @staticmethod
+    def _sample_net():
+        return {"net": get_network_type()}
+
+    @staticmethod
+    def _sample_ip():
+        return {"ip": get_local_ip()}
+
+    # ----------------------------- 调度 -----------------------------
+
+    def _next_delay(self, now: float) -> float | None:
+        delays = []
+        for metric in self.metrics:
+            interval = metric.interval(self._visible, self._capturing)
+            if interval is None:
+                continue
+            last = self._last_run.get(metric.name)
+            delays.append(0.0 if last is None else last + interval - now)
+        return max(0.0, min(delays)) if delays else None
+
+    def _run_due_metrics(self) -> dict:
+        changed = {}
+        for metric in self.metrics:
+            if not self._running or self.isInterruptionRequested():
+                break
+            interval = metric.interval(self._visible, self._capturing)
+            if interval is None:
+                continue
+            now = time.monotonic()
+            last = self._last_run.get(metric.name)
+            if last is not None and now - last < interval:
+                continue
+            self._last_run[metric.name] = now
+            try:
+                values = metric.sampler()
+            except Exception as e:
+                logging.debug(f"监控项 {metric.name} 采样失败: {e}")
+                continue
+            for key, value in values.items():
+                if key not in self._last_values or self._last_values[key] != value:
+                    self._last_values[key] = value
+                    changed[key] = value
+        return changed
 
     def run(self):
-        host, port = MITM_PROXY.split(":")
-        port = int(port)
-
-        last_io = get_net_io()
-        last_time = time.time()
-
         while self._running and not self.isInterruptionRequested():
-            # =======================
-            # ① 监控 mitm 是否运行
-            # =======================
-            if not check_port_listening(host, port):
-                logging.warning("⚠️ Mitm 未运行，尝试自动启动...")
-                self.mitm.start()
-
-                # 等待 mitm 启动：最多等 2 秒，每 100ms 检查一次
-                started = False
-                for _ in range(20):
-                    if check_port_listening(host, port):
-                        started = True
-                        break
-                    time.sleep(0.1)
-
-                if started:
-                    logging.info("🛡️ Mitm 自动启动成功")
-                else:
-                    detail = getattr(self.mitm, "last_error", "") or "请检查程序目录或权限"
-                    logging.error(f"❌ Mitm 自动启动失败: {detail}")
-
-            # =======================
-            # ② 更新状态数据
-            # =======================
-            cur_io = get_net_io()
-            now = time.time()
-            speed_d = speed_u = 0
-
-            if last_io and cur_io:
-                dt = now - last_time
-                if dt > 0:
-                    speed_d = (cur_io.bytes_recv - last_io.bytes_recv) / 1024 / dt
-                    speed_u = (cur_io.bytes_sent - last_io.bytes_sent) / 1024 / dt
-
-            last_io = cur_io
-            last_time = now
-
-            cert_ok, cert_detail = summarize_cert_state()
-
-            data = {
-                "net": get_network_type(),
-                "speed_d": speed_d,
-                "speed_u": speed_u,
-                "ip": get_local_ip(),
-                "proxy": get_system_proxy(),
-                "mitm": check_port_listening(host, port),
-                "cert": cert_ok,
-                "cert_detail": cert_detail,
-            }
-
-            self.data_signal.emit(data)
-            for _ in range(10):
-                if not self._running or self.isInterruptionRequested():
-                    return
-                time.sleep(0.1)
+            changed = self._run_due_metrics()
+            if changed:
+                self.data_signal.emit(changed)
+
+            delay = self._next_delay(time.monotonic())
+            self._wake.wait(delay)
+            self._wake.clear()
@@ -8,14 +8,23 @@ import time
 import requests
 from PySide6.QtCore import QThread, Signal
 
-from app.apis.xybsyw import login, get_plan, regeo, photo_sign_in_or_out, simple_sign_in_or_out
-from app.config.common import CERT_FILE, MITM_PROXY, XYB_APP_ID
+from app.apis.xybsyw import (
+    commonPostPolicy,
+    get_plan_cached,
+    login,
+    photo_sign_in_or_out,
+    regeo,
+    simple_sign_in_or_out,
+)
+from app.config.common import CERT_FILE, MITM_PROXY, SIGN_TASK_BUDGET_SECONDS, XYB_APP_ID
 from app.mitm.cert_state import remember_current_cert_installed, summarize_cert_state
+from app.mitm.lifecycle import get_mitm_lifecycle
+from app.sign_flow import StageGraph
 from app.utils.code_channel import CodeChannel
 from app.utils.commands import (
-    get_system_proxy,
+    describe_proxy,
+    is_proxy_active,
     set_proxy,
-    check_port_listening,
     reset_proxy,
     install_mitmproxy_cert,
     is_windows,
@@ -23,7 +32,22 @@ from app.utils.commands import (
     open_path_or_url,
     subprocess_creationflags,
 )
+from app.utils.deadline import Deadline
 from app.utils.files import read_config, check_img
+from app.utils.image_prep import get_image_preparer
+
+
+def acquire_mitm():
+    """抓取 code 前确保 mitm 在监听（按需模式下在此启动）"""
+    lifecycle = get_mitm_lifecycle()
+    if not lifecycle.acquire():
+        detail = lifecycle.service.last_error or "请检查程序目录或权限"
+        raise RuntimeError(f"mitmdump 启动失败: {detail}")
+    logging.info("🛡️ 代理服务正常")
+
+
+def release_mitm():
+    get_mitm_lifecycle().release()
 
 
 class SignTaskThread(QThread):
@@ -39,6 +63,15 @@ class SignTaskThread(QThread):
         self.target_host = proxy_split[0]
         self.target_port = proxy_split[1]
         self.cert_file = CERT_FILE
+        self._deadline = None
+        self._mitm_held = False
+
+    def requestInterruption(self):
+        super().requestInterruption()
+        # 立即断开在途的 HTTP 连接，阻塞在 socket 上的阶段随即返回
+        deadline = self._deadline
+        if deadline is not None:
+            deadline.cancel()
 
     def run(self):
         try:
@@ -69,22 +102,19 @@ class SignTaskThread(QThread):
             else:
                 # 没有有效缓存，需要重新获取 code
                 channel = CodeChannel.instance()
-                channel.start()
                 channel.reset()
+                channel.start()
 
                 ### 代理
                 target_proxy = f"{self.target_host}:{self.target_port}"
                 # 获取当前代理
-                logging.info(f"🔍 检测代理... 当前: {get_system_proxy() or '直连'}")
+                logging.info(f"🔍 检测代理... 当前: {describe_proxy()}")
                 self.origin_proxy = set_proxy(target_proxy)
-                logging.info(f"🔍 代理切换后: {get_system_proxy() or '直连'}")
+                logging.info(f"🔍 代理切换后: {describe_proxy()}")
 
                 ### mitmdump
-                if not check_port_listening(self.target_host, int(self.target_port)):
-                    # 不再在这里强行启动，让后台 MonitorThread 负责自启
-                    raise RuntimeError("mitmdump未运行，请稍等几秒后重新点击开始（后台会自动尝试启动mitmdump）")
-                else:
-                    logging.info("🛡️ 代理服务正常")
+                acquire_mitm()
+                self._mitm_held = True
 
                 ### cert
                 self.do_cert()
@@ -97,6 +127,7 @@ class SignTaskThread(QThread):
 
                 logging.info("🛑 恢复网络...")
                 reset_proxy(self.origin_proxy, target_proxy)
+                self._release_mitm()
 
             self.check_stop()
 
@@ -106,17 +137,28 @@ class SignTaskThread(QThread):
 
         except RuntimeError as e:
             msg = str(e)
-            if msg == "用户停止执行":
+            # 接口函数会把连接被断开的异常包装成其它提示，以中断标记为准
+            if msg == "用户停止执行" or self.isInterruptionRequested():
                 logging.info("🚫 任务手动停止")
                 self.finished_signal.emit(False, "任务已停止")
             else:
                 logging.error(f"❌ 错误: {msg}")
                 self.finished_signal.emit(False, msg)
         except Exception as e:
-            logging.error(f"❌ 异常: {e}")
-            self.finished_signal.emit(False, str(e))
+            if self.isInterruptionRequested():
+                logging.info("🚫 任务手动停止")
+                self.finished_signal.emit(False, "任务已停止")
+            else:
+                logging.error(f"❌ 异常: {e}")
+                self.finished_signal.emit(False, str(e))
         finally:
             reset_proxy(self.origin_proxy, f"{self.target_host}:{self.target_port}")
+            self._release_mitm()
+
+    def _release_mitm(self):
+        if self._mitm_held:
+            self._mitm_held = False
+            release_mitm()
 
     @staticmethod
     def _jitter_location(latitude: float, longitude: float, radius_meters: float) -> tuple[float, float]:
@@ -176,6 +218,7 @@ class SignTaskThread(QThread):
 
     def check_stop(self):
         if self.isInterruptionRequested(): raise RuntimeError("用户停止执行")
+        if self._deadline is not None: self._deadline.check()
 
     def wait_code(self, proxy):
         last = time.time()
@@ -185,8 +228,8 @@ class SignTaskThread(QThread):
             nonlocal last
             self.check_stop()
             if time.time() - last > 1.0:
-                if get_system_proxy() != proxy:
-                    logging.warning(f"⚠️ 系统代理被改为 {get_system_proxy() or '直连'}，重新设置为 {proxy}")
+                if not is_proxy_active(proxy):
+                    logging.warning(f"⚠️ 系统代理被改为 {describe_proxy()}，重新设置为 {proxy}")
                     set_proxy(proxy)
                 last = time.time()
 
@@ -195,44 +238,65 @@ class SignTaskThread(QThread):
     def execute_logic(self, config):
         logging.info("🚀 开始业务逻辑...")
 
-        self.check_stop()
-        # 使用缓存的登录信息，如果缓存过期则使用新获取的code
-        args = login(config, use_cache=True)
+        action = self.sign_option['action']
+        is_photo = action in ['拍照签到', '拍照签退']
 
-        self.check_stop()
-        plan_data = get_plan(userAgent=config['userAgent'], args=args)
+        # 预算只覆盖拿到 code 之后的网络流程；停止按钮会经由 deadline 断开在途连接
+        deadline = Deadline(SIGN_TASK_BUDGET_SECONDS)
+        self._deadline = deadline
+        if self.isInterruptionRequested():
+            deadline.cancel()
 
-        self.check_stop()
-        geo = regeo(
+        # login -> plan；regeo 与登录无关，可并发；拍照签到的上传凭证只依赖登录参数
+        graph = StageGraph()
+        # 使用缓存的登录信息，如果缓存过期则使用新获取的code
+        graph.add("login", lambda r: login(config, use_cache=True, deadline=deadline))
+        graph.add("plan", lambda r: get_plan_cached(userAgent=config['userAgent'], args=r["login"], deadline=deadline),
+                  deps=("login",))
+        graph.add("geo", lambda r: regeo(
             config['userAgent'],
             config['location'],
             config.get('mapProvider', 'amap'),
             config.get('mapApiKeys', {}),
-        )
+            race_mode=config.get('mapRaceMode', 'off'),
+            deadline=deadline,
+        ))
+        sign_deps = ["login", "plan", "geo"]
+        if is_photo:
+            graph.add("policy", lambda r: commonPostPolicy(args=r["login"], config=config, deadline=deadline),
+                      deps=("login",))
+            # 与登录并行预处理图片，上传时直接命中磁盘缓存
+            graph.add("image", lambda r: get_image_preparer().prepare(check_img(self.sign_option.get("image_path"))))
+            sign_deps.extend(["policy", "image"])
+        graph.add("sign", lambda r: self._sign_stage(config, r, deadline), deps=sign_deps)
 
+        try:
+            graph.run(check_stop=self.check_stop)
+        finally:
+            graph.log_timings()
+
+    def _sign_stage(self, config, results, deadline=None):
         self.check_stop()
+        args = results["login"]
+        geo = results["geo"]
+        trainee_id = results["plan"][0]['dateList'][0]['traineeId']
 
         action = self.sign_option['action']
         if action in ['普通签到', '普通签退']:
-            simple_sign_in_or_out(args=args, config=config, geo=geo, traineeId=plan_data[0]['dateList'][0]['traineeId'],
-                                  opt=self.sign_option)
+            simple_sign_in_or_out(args=args, config=config, geo=geo, traineeId=trainee_id, opt=self.sign_option,
+                                  deadline=deadline)
         elif action == '普通签到签退':
             for step in self.sign_option.get('steps', []):
                 self.check_stop()
-                simple_sign_in_or_out(
-                    args=args,
-                    config=config,
-                    geo=geo,
-                    traineeId=plan_data[0]['dateList'][0]['traineeId'],
-                    opt=step,
-                )
+                simple_sign_in_or_out(args=args, config=config, geo=geo, traineeId=trainee_id, opt=step,
+                                      deadline=deadline)
         elif action in ['拍照签到', '拍照签退']:
-            photo_sign_in_or_out(args=args, config=config, geo=geo, traineeId=plan_data[0]['dateList'][0]['traineeId'],
-                                 opt=self.sign_option)
+            photo_sign_in_or_out(args=args, config=config, geo=geo, traineeId=trainee_id,
+                                 opt=self.sign_option, policyData=results["policy"], deadline=deadline)
 
     def do_cert(self):
         ### 检查是否安装证书
-        cert_ok, cert_detail = summarize_cert_state()
+        cert_ok, cert_detail = summarize_cert_state(force=True)
         if cert_ok:
             logging.info("CA证书状态正常")
             return
@@ -298,6 +362,7 @@ class GetCodeAndSessionThread(QThread):
         self.target_host = proxy_split[0]
         self.target_port = proxy_split[1]
         self.cert_file = CERT_FILE
+        self._mitm_held = False
 
     def run(self):
         try:
@@ -307,20 +372,18 @@ class GetCodeAndSessionThread(QThread):
             config = read_config(self.config_file)
 
             channel = CodeChannel.instance()
-            channel.start()
             channel.reset()
+            channel.start()
 
             ### 代理
             target_proxy = f"{self.target_host}:{self.target_port}"
-            logging.info(f"🔍 检测代理... 当前: {get_system_proxy() or '直连'}")
+            logging.info(f"🔍 检测代理... 当前: {describe_proxy()}")
             self.origin_proxy = set_proxy(target_proxy)
-            logging.info(f"🔍 代理切换后: {get_system_proxy() or '直连'}")
+            logging.info(f"🔍 代理切换后: {describe_proxy()}")
 
             ### mitmdump
-            if not check_port_listening(self.target_host, int(self.target_port)):
-                raise RuntimeError("mitmdump未运行，请稍等几秒后重新点击（后台会自动尝试启动mitmdump）")
-            else:
-                logging.info("🛡️ 代理服务正常")
+            acquire_mitm()
+            self._mitm_held = True
 
             ### cert
             self.do_cert()
@@ -348,6 +411,7 @@ class GetCodeAndSessionThread(QThread):
 
             logging.info("🛑 恢复网络...")
             reset_proxy(self.origin_proxy, target_proxy)
+            self._release_mitm()
 
             self.check_stop()
 
@@ -372,6 +436,12 @@ class GetCodeAndSessionThread(QThread):
             self.finished_signal.emit(False, str(e))
         finally:
             reset_proxy(self.origin_proxy, f"{self.target_host}:{self.target_port}")
+            self._release_mitm()
+
+    def _release_mitm(self):
+        if self._mitm_held:
+            self._mitm_held = False
+            release_mitm()
 
     def check_stop(self):
         if self.isInterruptionRequested():
@@ -385,15 +455,15 @@ class GetCodeAndSessionThread(QThread):
             nonlocal last
             self.check_stop()
             if time.time() - last > 1.0:
-                if get_system_proxy() != proxy:
-                    logging.warning(f"⚠️ 系统代理被改为 {get_system_proxy() or '直连'}，重新设置为 {proxy}")
+                if not is_proxy_active(proxy):
+                    logging.warning(f"⚠️ 系统代理被改为 {describe_proxy()}，重新设置为 {proxy}")
                     set_proxy(proxy)
                 last = time.time()
 
         return channel.wait_code(timeout_seconds=120, stop_check=self.check_stop, heartbeat=heartbeat)
 
     def do_cert(self):
-        cert_ok, cert_detail = summarize_cert_state()
+        cert_ok, cert_detail = summarize_cert_state(force=True)
         if cert_ok:
             logging.info("CA证书状态正常")
             return
@@ -11,6 +11,7 @@ import requests
 from PySide6.QtCore import QThread, Signal
 
 from app.config.common import CONFIG_FILE, UPDATE_SETTINGS_FILE
+from app.utils import http_client
 from app.utils.files import read_config
 
 
@@ -50,7 +51,7 @@ class UpdateCheckWorker(QThread):
             self.result_signal.emit(False, {"error": str(exc)})
 
     def _check_from_backend(self, check_url: str, current_version: str) -> dict:
-        response = requests.get(check_url, params={"version": current_version}, timeout=self.timeout)
+        response = http_client.get(check_url, params={"version": current_version}, timeout=self.timeout, trust_env=True)
         response.raise_for_status()
         return response.json()
 
@@ -144,7 +145,7 @@ class UpdateCheckWorker(QThread):
         last_error: Optional[Exception] = None
         for candidate in self._build_request_urls(url):
             try:
-                response = requests.get(candidate, headers=self._github_headers(), timeout=self.timeout)
+                response = http_client.get(candidate, headers=self._github_headers(), timeout=self.timeout, trust_env=True)
                 response.raise_for_status()
                 return response.text
             except requests.RequestException as exc:
@@ -532,8 +533,9 @@ class UpdateDownloadWorker(QThread):
             partial_path = target_dir / f"{filename}.part"
             resume_from = partial_path.stat().st_size if partial_path.exists() else 0
             headers = {"Range": f"bytes={resume_from}-"} if resume_from > 0 else None
-            with requests.get(
+            with http_client.get(
                 self.download_url,
+                trust_env=True,
                 stream=True,
                 timeout=(10, self.timeout),
                 allow_redirects=True,
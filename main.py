@@ -1,27 +1,31 @@
 # -*- coding: utf-8 -*-
 import logging
+import multiprocessing
 import os
 import sys
 
-if sys.platform in ("darwin", "win32"):
-    qt_logging_rules = os.environ.get("QT_LOGGING_RULES", "")
-    qt_icc_rule = "qt.gui.icc.warning=false"
-    if qt_icc_rule not in qt_logging_rules.split(";"):
-        os.environ["QT_LOGGING_RULES"] = ";".join(filter(None, [qt_logging_rules, qt_icc_rule]))
 
-from PySide6.QtCore import QLoggingCategory
-from PySide6.QtGui import QFont, QIcon
-from PySide6.QtWidgets import (QApplication, QMessageBox)
-from app.config.common import ensure_resource_layout
-from app.gui.windows.modern_window import ModernWindow
-from app.mitm.embedded_runner import main as mitm_runner_main
-import traceback
+def _run_mitm_runner():
+    """mitm 子进程入口：在导入 Qt 和界面模块之前分发，只加载 embedded_runner"""
+    from app.mitm.embedded_runner import main as mitm_runner_main
+
+    runner_index = sys.argv.index('--mitm-runner')
+    return mitm_runner_main(sys.argv[runner_index + 1:])
+
+
+def _configure_qt_logging_env():
+    if sys.platform in ("darwin", "win32"):
+        qt_logging_rules = os.environ.get("QT_LOGGING_RULES", "")
+        qt_icc_rule = "qt.gui.icc.warning=false"
+        if qt_icc_rule not in qt_logging_rules.split(";"):
+            os.environ["QT_LOGGING_RULES"] = ";".join(filter(None, [qt_logging_rules, qt_icc_rule]))
 
-logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
 
 def exception_hook(exctype, value, tb):
     """全局异常捕获钩子"""
+    import traceback
+    from PySide6.QtWidgets import QMessageBox
+
     error_msg = "".join(traceback.format_exception(exctype, value, tb))
     logging.critical(f"Uncaught exception:\n{error_msg}")
     
@@ -38,18 +42,28 @@ def exception_hook(exctype, value, tb):
     # 调用默认的钩子（通常会打印到 stderr）
     sys.__excepthook__(exctype, value, tb)
 
-sys.excepthook = exception_hook
 
-if __name__ == '__main__':
-    if '--mitm-runner' in sys.argv:
-        runner_index = sys.argv.index('--mitm-runner')
-        raise SystemExit(mitm_runner_main(sys.argv[runner_index + 1:]))
+def main():
+    # Qt 与界面模块只在主进程中导入：进程池子进程会以 __mp_main__ 重新导入本文件
+    _configure_qt_logging_env()
+
+    from PySide6.QtCore import QLoggingCategory
+    from PySide6.QtGui import QFont, QIcon
+    from PySide6.QtWidgets import QApplication
+    from app.config.common import ensure_resource_layout
+    from app.utils.app_log import get_app_log
+    from app.gui.windows.modern_window import ModernWindow
+
+    logger = logging.getLogger()
+    logger.setLevel(logging.DEBUG)
+    sys.excepthook = exception_hook
 
     if sys.platform in ("darwin", "win32"):
         QLoggingCategory.setFilterRules(os.environ.get("QT_LOGGING_RULES", ""))
 
     if "QT_FONT_DPI" in os.environ: del os.environ["QT_FONT_DPI"]
     ensure_resource_layout()
+    get_app_log().install()
 
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
@@ -67,4 +81,13 @@ if __name__ == '__main__':
     if not app_icon.isNull():
         win.setWindowIcon(app_icon)
     win.show()
-    sys.exit(app.exec())
+    return app.exec()
+
+
+if __name__ == '__main__':
+    # 打包后图片预处理的进程池子进程同样从这里启动，必须最先经过 freeze_support，
+    # 之后才分发 mitm 子进程或导入界面
+    multiprocessing.freeze_support()
+    if '--mitm-runner' in sys.argv:
+        raise SystemExit(_run_mitm_runner())
+    sys.exit(main())
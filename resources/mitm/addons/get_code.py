@@ -1,5 +1,10 @@
+import atexit
 import json
 import os
+import re
+import socket
+import threading
+from collections import deque
 from datetime import datetime
 from urllib.parse import urlsplit
 
@@ -14,6 +19,10 @@ CODE_FILE = os.path.normpath(
         "mitm_code.json",
     )
 )
+# 与 app.config.common 中的 CODE_RECEIVER_HOST / CODE_RECEIVER_PORT 保持一致
+CODE_RECEIVER_HOST = "127.0.0.1"
+CODE_RECEIVER_PORT = 13141
+PUSH_TIMEOUT_SECONDS = 0.5
 PACKET_LOG_FILE = os.path.normpath(
     os.path.join(
         os.path.dirname(__file__),
@@ -23,18 +32,144 @@ PACKET_LOG_FILE = os.path.normpath(
         "mitm_packet.log",
     )
 )
+# 抓包日志超过该大小时轮转为 .1/.2…，最多保留 PACKET_LOG_BACKUPS 个旧文件
+PACKET_LOG_MAX_BYTES = 2 * 1024 * 1024
+PACKET_LOG_BACKUPS = 2
 
 
 XYB_SOURCE = "xyb_code"
 JIELONG_SOURCE = "jielong_token"
 SEEN_HOSTS = set()
 
+# 需要解密的目标域名（按后缀匹配）。embedded_runner 据此设置 mitmproxy 的 allow_hosts，
+# 其余域名的 TLS 连接直接透传，不做证书伪造和解密
+INTERCEPT_HOST_SUFFIXES = ("xybsyw.com", "servicewechat.com", "jielong.com")
+# 证书下载页 http://mitm.it 由 mitmproxy 自己应答，也必须放行
+ONBOARDING_HOSTS = ("mitm.it",)
+
+
+def is_target_host(host: str) -> bool:
+    host = (host or "").lower()
+    return any(host.endswith(suffix) for suffix in INTERCEPT_HOST_SUFFIXES)
+
+
+def allow_hosts_patterns() -> list:
+    """mitmproxy allow_hosts 按 "host:port" 做正则搜索"""
+    return [rf"{re.escape(host)}:\d+$" for host in INTERCEPT_HOST_SUFFIXES + ONBOARDING_HOSTS]
+
+
+def note_host(host: str):
+    host = (host or "").lower()
+    if host and host not in SEEN_HOSTS:
+        SEEN_HOSTS.add(host)
+        append_packet_log(f"[MITM][HOST] {host}")
+
+
+class PacketLogWriter:
+    """缓冲写入抓包日志。
+
+    append 只把行放进内存队列；后台线程在队列为空时无超时阻塞，首行入队后等待
+    FLUSH_INTERVAL_SECONDS（积累 FLUSH_BATCH_LINES 行时提前）一次性追加写入。队列超过 MAX_QUEUE_LINES 时丢弃新行并在下次写入时记录丢弃数量。
+    文件超过 max_bytes 时轮转。每次写入都重新打开文件，界面清空日志（截断）不受影响。
+    close() 只停止当前后台线程：内置引擎重启时复用同一 addon 模块，之后的 append 会重新启动线程。
+    """
+
+    FLUSH_INTERVAL_SECONDS = 0.5
+    FLUSH_BATCH_LINES = 64
+    MAX_QUEUE_LINES = 5000
+
+    def __init__(self, path: str, max_bytes: int = PACKET_LOG_MAX_BYTES, backups: int = PACKET_LOG_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._full = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._stop = None
+
+    def append(self, message: str):
+        line = f"{datetime.now().strftime('%H:%M:%S')} | {message}\n"
+        with self._lock:
+            if len(self._queue) >= self.MAX_QUEUE_LINES:
+                self.dropped += 1
+                return
+            self._queue.append(line)
+            pending = len(self._queue)
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop,), name="packet-log-writer", daemon=True
+                )
+                self._thread.start()
+        if pending == 1:
+            self._wake.set()
+        if pending >= self.FLUSH_BATCH_LINES:
+            self._full.set()
+
+    def _run(self, stop: threading.Event):
+        while True:
+            # 空闲时不定时唤醒；有行入队后才开始计时
+            self._wake.wait()
+            self._full.wait(self.FLUSH_INTERVAL_SECONDS)
+            self._wake.clear()
+            self._full.clear()
+            self.flush()
+            if stop.is_set():
+                return
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                lines = list(self._queue)
+                self._queue.clear()
+                dropped, self.dropped = self.dropped, 0
+            if dropped:
+                lines.append(f"{datetime.now().strftime('%H:%M:%S')} | [MITM] 日志过多，已丢弃 {dropped} 行\n")
+            if not lines:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._rotate_if_needed()
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+            except OSError as exc:
+                print(f"[addon] 写入抓包日志失败: {exc}")
+
+    def _rotate_if_needed(self):
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+        except OSError:
+            return
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups, 0, -1):
+            source = self.path if index == 1 else f"{self.path}.{index - 1}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index}")
+
+    def close(self):
+        with self._lock:
+            stop, self._stop = self._stop, None
+            self._thread = None
+        if stop is not None:
+            stop.set()
+        self._wake.set()
+        self._full.set()
+        self.flush()
+
+
+PACKET_LOG = PacketLogWriter(PACKET_LOG_FILE)
+atexit.register(PACKET_LOG.close)
+
 
 def append_packet_log(message: str):
-    os.makedirs(os.path.dirname(PACKET_LOG_FILE), exist_ok=True)
-    now = datetime.now().strftime("%H:%M:%S")
-    with open(PACKET_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{now} | {message}\n")
+    PACKET_LOG.append(message)
 
 
 def mask_value(value, keep: int = 6):
@@ -69,14 +204,11 @@ def flow_label(flow: http.HTTPFlow):
 
 
 def is_interesting_flow(flow: http.HTTPFlow):
-    host = (flow.request.host or "").lower()
     url = (flow.request.pretty_url or "").lower()
     return (
         "getopenid.action" in url
         or "/api/user/token" in url
-        or host.endswith("xybsyw.com")
-        or host.endswith("servicewechat.com")
-        or host.endswith("jielong.com")
+        or is_target_host(flow.request.host)
     )
 
 
@@ -138,10 +270,38 @@ def log_response_details(flow: http.HTTPFlow):
         append_packet_log(f"[MITM][RES][BODY] {snippet}")
 
 
-def write_payload(payload: dict):
-    os.makedirs(os.path.dirname(CODE_FILE), exist_ok=True)
-    with open(CODE_FILE, "w", encoding="utf-8") as f:
+def code_file_for(source: str) -> str:
+    base, ext = os.path.splitext(CODE_FILE)
+    return f"{base}_{source}{ext}"
+
+
+def push_payload(payload: dict) -> bool:
+    """通过本机 socket 推送给主程序，收到 ok 回执才算送达"""
+    line = json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n"
+    try:
+        with socket.create_connection((CODE_RECEIVER_HOST, CODE_RECEIVER_PORT), timeout=PUSH_TIMEOUT_SECONDS) as conn:
+            conn.sendall(line)
+            return conn.makefile("rb").readline().strip() == b"ok"
+    except OSError:
+        return False
+
+
+def write_payload(payload: dict) -> str:
+    """原子写入按来源区分的文件：先写临时文件再 rename，读取方不会读到半截内容"""
+    target = code_file_for(payload.get("source") or XYB_SOURCE)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, target)
+    return target
+
+
+def deliver_payload(payload: dict) -> str:
+    """优先 socket 推送，失败时回退为文件；返回实际使用的通道"""
+    if push_payload(payload):
+        return f"socket {CODE_RECEIVER_HOST}:{CODE_RECEIVER_PORT}"
+    return write_payload(payload)
 
 
 class GetCode:
@@ -158,12 +318,12 @@ class GetCode:
         append_packet_log(f"[MITM] ?? {flow.request.method} {flow.request.pretty_url} | code={code_preview}")
 
         try:
-            write_payload({"source": XYB_SOURCE, "code": code})
-            append_packet_log(f"[MITM] code 已写入: {CODE_FILE}")
-            print(f"[addon] 已保存抓包 code 文件: {CODE_FILE}")
+            channel = deliver_payload({"source": XYB_SOURCE, "code": code})
+            append_packet_log(f"[MITM] code 已送达: {channel}")
+            print(f"[addon] 已送达抓包 code: {channel}")
         except Exception as exc:
-            append_packet_log(f"[MITM] code 写入失败: {exc}")
-            print(f"[addon] code 写入失败: {exc}")
+            append_packet_log(f"[MITM] code 送达失败: {exc}")
+            print(f"[addon] code 送达失败: {exc}")
 
         flow.kill()
 
@@ -196,20 +356,23 @@ class GetCode:
         )
 
         try:
-            write_payload(payload)
-            append_packet_log(f"[MITM] 请求 payload 已写入: {CODE_FILE}")
-            print(f"[addon] 已保存 User/Token payload 文件: {CODE_FILE}")
+            channel = deliver_payload(payload)
+            append_packet_log(f"[MITM] 请求 payload 已送达: {channel}")
+            print(f"[addon] 已送达 User/Token payload: {channel}")
         except Exception as exc:
-            append_packet_log(f"[MITM] 请求 payload 写入失败: {exc}")
-            print(f"[addon] 请求 payload 写入失败: {exc}")
+            append_packet_log(f"[MITM] 请求 payload 送达失败: {exc}")
+            print(f"[addon] 请求 payload 送达失败: {exc}")
 
         flow.kill()
 
+    def server_connect(self, data):
+        # 透传的连接不会产生 HTTP flow，在建立上游连接时记录域名
+        address = data.server.address
+        if address:
+            note_host(str(address[0]))
+
     def request(self, flow: http.HTTPFlow):
-        host = (flow.request.host or "").lower()
-        if host and host not in SEEN_HOSTS:
-            SEEN_HOSTS.add(host)
-            append_packet_log(f"[MITM][HOST] {host}")
+        note_host(flow.request.host)
 
         if not is_interesting_flow(flow):
             return
@@ -229,6 +392,9 @@ class GetCode:
             return
         log_response_details(flow)
 
+    def done(self):
+        PACKET_LOG.close()
+
     def error(self, flow: http.HTTPFlow):
         if not is_interesting_flow(flow):
             return
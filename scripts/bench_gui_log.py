@@ -0,0 +1,115 @@
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QObject, Signal  # noqa: E402
+from PySide6.QtWidgets import QApplication, QTextEdit  # noqa: E402
+
+from app.gui.components.log_viewer import GuiLogPipeline, LogConsole  # noqa: E402
+
+BODY = '{"code":"200","msg":"success","data":' + '{"traineeId":1162161,"address":"某某市某某区"},' * 40 + '{}}'
+
+
+class LegacyHandler(logging.Handler, QObject):
+    """旧实现：每条记录经排队信号在 UI 线程 append 一段 HTML"""
+
+    append_signal = Signal(str, str)
+
+    def __init__(self, widget):
+        super().__init__()
+        QObject.__init__(self)
+        self.widget = widget
+        self.append_signal.connect(self.append_text)
+
+    def emit(self, record):
+        self.append_signal.emit(record.levelname, self.format(record))
+
+    def append_text(self, level, msg):
+        sb = self.widget.verticalScrollBar()
+        at_bottom = sb.value() >= (sb.maximum() - 10)
+        self.widget.append(f'<span style="color:#888888; font-family:Consolas; font-size:10pt;">{msg}</span>')
+        if at_bottom:
+            sb.setValue(sb.maximum())
+
+
+def burst(logger, count, threads):
+    """模拟签到线程：大量 debug 响应体夹杂少量 info"""
+
+    def work():
+        for index in range(count):
+            if index % 20 == 0:
+                logger.info(f"签到进度 {index}")
+            else:
+                logger.debug(f"response: {BODY}")
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def run(app, label, view, handler, install, uninstall, count, threads):
+    logger = logging.getLogger(f"bench.{label}")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    install(logger)
+    view.resize(700, 400)
+    view.show()
+    started = time.perf_counter()
+    burst(logger, count, threads)
+    produced = time.perf_counter() - started
+
+    # 统计 UI 线程把积压处理完所需的时间和最长一次事件循环阻塞
+    longest = 0.0
+    idle_rounds = 0
+    while idle_rounds < 5:
+        tick = time.perf_counter()
+        app.processEvents()
+        cost = time.perf_counter() - tick
+        longest = max(longest, cost)
+        idle_rounds = idle_rounds + 1 if cost < 0.001 else 0
+        time.sleep(0.02)
+    drained = time.perf_counter() - started
+    uninstall(logger)
+    print(
+        f"[bench] {label:<8} producers={produced * 1000:.0f}ms drained={drained * 1000:.0f}ms "
+        f"longest_ui_block={longest * 1000:.0f}ms blocks={view.document().blockCount()}"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="测量日志突发时界面日志通道对 UI 线程的影响")
+    parser.add_argument("--records", type=int, default=2000, help="每个线程写入的记录数")
+    parser.add_argument("--threads", type=int, default=2)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = QApplication.instance() or QApplication([])
+
+    view = QTextEdit()
+    view.setReadOnly(True)
+    legacy = LegacyHandler(view)
+    legacy.setFormatter(logging.Formatter('%(asctime)s - %(message)s', "%H:%M:%S"))
+    run(app, "legacy", view, legacy, lambda lg: lg.addHandler(legacy), lambda lg: lg.removeHandler(legacy),
+        args.records, args.threads)
+
+    console = LogConsole()
+    pipeline = GuiLogPipeline(console)
+    run(app, "pipeline", console, pipeline, pipeline.install, lambda lg: pipeline.uninstall(),
+        args.records, args.threads)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
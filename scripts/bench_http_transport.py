@@ -0,0 +1,80 @@
+import argparse
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import requests  # noqa: E402
+
+from app.utils.http_client import HttpTransport  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", "0") or "0")
+        if length:
+            self.rfile.read(length)
+        body = b'{"code":"200","msg":"success","data":{}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def measure(label, send, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        send()
+        samples.append((time.perf_counter() - started) * 1000)
+    print(
+        f"[bench] {label:<6} mean={statistics.mean(samples):.3f}ms "
+        f"p50={statistics.median(samples):.3f}ms max={max(samples):.3f}ms"
+    )
+    return statistics.mean(samples)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="对比裸 requests 与连接池传输层的请求延迟")
+    parser.add_argument("--rounds", type=int, default=300)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = start_stub_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/student/clock/GetPlan.action"
+    data = {"traineeId": "1"}
+    transport = HttpTransport()
+    try:
+        cold = measure("cold", lambda: requests.post(url, data=data, timeout=5), args.rounds)
+        transport.post(url, data=data)
+        warm = measure("warm", lambda: transport.post(url, data=data), args.rounds)
+    finally:
+        transport.close()
+        server.shutdown()
+    print(f"[bench] speedup x{cold / warm:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
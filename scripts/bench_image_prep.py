@@ -0,0 +1,117 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from PIL import Image  # noqa: E402
+
+from app.utils.http_client import HttpTransport  # noqa: E402
+from app.utils.image_prep import ImagePreparer  # noqa: E402
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    # 模拟上行带宽（字节/秒），0 表示不限速
+    bandwidth = 0
+
+    def do_POST(self):
+        remaining = int(self.headers.get("Content-Length", "0") or "0")
+        started = time.perf_counter()
+        received = 0
+        while remaining:
+            chunk = self.rfile.read(min(remaining, 64 * 1024))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            received += len(chunk)
+            if self.bandwidth:
+                lag = received / self.bandwidth - (time.perf_counter() - started)
+                if lag > 0:
+                    time.sleep(lag)
+        body = b'{"vo":{"key":"bench.jpg"}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_photo(path: str, width: int, height: int):
+    """生成带噪点和 EXIF 的手机照片尺寸样图，噪点让 JPEG 体积接近真实照片"""
+    image = Image.effect_noise((width, height), 64).convert("RGB")
+    exif = Image.Exif()
+    exif[0x010F] = "BenchPhone"
+    exif[0x0110] = "Model X"
+    exif[0x0112] = 6
+    image.save(path, "JPEG", quality=95, exif=exif.tobytes())
+
+
+def measure_upload(transport, url, path, rounds):
+    samples = []
+    for _ in range(rounds):
+        with open(path, "rb") as f:
+            started = time.perf_counter()
+            transport.post(url, files={"file": ("bench.jpg", f, "image/jpeg")})
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="测量图片预处理前后的上传体积与耗时")
+    parser.add_argument("--width", type=int, default=4032)
+    parser.add_argument("--height", type=int, default=3024)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--bandwidth-kbps", type=int, default=8000, help="模拟上行带宽，0 表示不限速")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    UploadHandler.bandwidth = args.bandwidth_kbps * 1000 // 8
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UploadHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/upload"
+    transport = HttpTransport(timeout=120)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        source = os.path.join(workdir, "photo.jpg")
+        make_photo(source, args.width, args.height)
+        preparer = ImagePreparer(cache_dir=os.path.join(workdir, "cache"))
+        try:
+            cold = preparer.prepare(source)
+            started = time.perf_counter()
+            warm = preparer.prepare(source)
+            warm_ms = (time.perf_counter() - started) * 1000
+            with Image.open(warm.path) as prepared:
+                has_exif = bool(prepared.getexif())
+                prepared_size = prepared.size
+
+            original_ms = measure_upload(transport, url, source, args.rounds)
+            prepared_ms = measure_upload(transport, url, warm.path, args.rounds)
+        finally:
+            preparer.close()
+            transport.close()
+            server.shutdown()
+
+    print(f"[bench] image     {args.width}x{args.height} -> {prepared_size[0]}x{prepared_size[1]} exif={has_exif}")
+    print(f"[bench] size      {cold.original_size / 1024:.0f}KB -> {cold.size / 1024:.0f}KB")
+    print(f"[bench] prepare   cold={cold.elapsed * 1000:.0f}ms cached={warm_ms:.1f}ms")
+    print(f"[bench] upload    original={original_ms:.0f}ms prepared={prepared_ms:.0f}ms "
+          f"@ {args.bandwidth_kbps}kbps")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
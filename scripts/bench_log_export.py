@@ -0,0 +1,124 @@
+import argparse
+import gzip
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.utils.app_log import TIME_FORMAT, AppLog  # noqa: E402
+
+MESSAGE = "📍 解析位置: 某某省某某市某某区某某路 100 号，traineeId=1162161，签到进度正常"
+
+
+def write_history(log: AppLog, days: int, per_file: int):
+    """按应用日志格式生成跨越 days 天的历史文件（app.log.N ... app.log）"""
+    files = [f"{log.path}.{index}" for index in range(log.backups, 0, -1)] + [log.path]
+    total = per_file * len(files)
+    step = timedelta(days=days) / total
+    stamp = datetime.now() - timedelta(days=days)
+    for path in files:
+        with open(path, "w", encoding="utf-8") as f:
+            for index in range(per_file):
+                f.write(f"{stamp.strftime(TIME_FORMAT)}.000 INFO [MainThread] {MESSAGE} #{index}\n")
+                if index % 500 == 0:
+                    f.write("Traceback (most recent call last):\n  File \"xybsyw.py\", line 1\nRuntimeError: boom\n")
+                stamp += step
+        mtime = (stamp - step).timestamp()
+        os.utime(path, (mtime, mtime))
+    return total
+
+
+def legacy_export(log: AppLog, dest: str, start: datetime):
+    """对照：把全部日志读入内存后过滤再写出"""
+    content = ""
+    for path in log.files():
+        with open(path, "r", encoding="utf-8") as f:
+            content += f.read()
+    lower = start.strftime(TIME_FORMAT)
+    lines = [line for line in content.splitlines(keepends=True) if line[:19] >= lower]
+    with open(dest, "w", encoding="utf-8") as f:
+        f.write("".join(lines))
+    return len(lines)
+
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def bench_emit(tmp: str, records: int):
+    """调用线程上每条日志的开销：直接写文件 vs 入队由后台线程写"""
+    logger = logging.getLogger("bench.emit")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    direct = logging.FileHandler(os.path.join(tmp, "direct.log"), encoding="utf-8")
+    direct.setFormatter(logging.Formatter("%(asctime)s.%(msecs)03d %(levelname)s [%(threadName)s] %(message)s"))
+    logger.addHandler(direct)
+    started = time.perf_counter()
+    for index in range(records):
+        logger.info("%s #%d", MESSAGE, index)
+    direct_us = (time.perf_counter() - started) / records * 1e6
+    logger.removeHandler(direct)
+    direct.close()
+
+    queued = AppLog(os.path.join(tmp, "queued", "app.log"))
+    queued.install(logger)
+    started = time.perf_counter()
+    for index in range(records):
+        logger.info("%s #%d", MESSAGE, index)
+    queued_us = (time.perf_counter() - started) / records * 1e6
+    queued.uninstall()
+    print(f"[bench] emit      direct_file={direct_us:.1f}us/record queue={queued_us:.1f}us/record")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="测量应用日志写入开销以及按时间范围流式导出的耗时与内存")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--records-per-file", type=int, default=20000)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_emit(tmp, 20000)
+
+        log = AppLog(os.path.join(tmp, "logs", "app.log"))
+        os.makedirs(os.path.dirname(log.path))
+        total = write_history(log, args.days, args.records_per_file)
+        size = sum(os.path.getsize(path) for path in log.files())
+        print(f"[bench] history   files={len(log.files())} records={total} size={size / 1024 / 1024:.1f}MB")
+
+        start = datetime.now() - timedelta(hours=1)
+        count, elapsed, peak = measure(legacy_export, log, os.path.join(tmp, "legacy.txt"), start)
+        print(f"[bench] legacy    last_hour lines={count} time={elapsed * 1000:.0f}ms peak={peak / 1024:.0f}KB")
+
+        count, elapsed, peak = measure(log.export, os.path.join(tmp, "stream.txt"), start=start)
+        print(f"[bench] stream    last_hour records={count} time={elapsed * 1000:.0f}ms peak={peak / 1024:.0f}KB")
+
+        dest = os.path.join(tmp, "all.txt.gz")
+        count, elapsed, peak = measure(log.export, dest, compress=True)
+        with gzip.open(dest, "rb") as f:
+            lines = sum(1 for _ in f)
+        print(
+            f"[bench] stream    all+gzip records={count} lines={lines} time={elapsed * 1000:.0f}ms "
+            f"peak={peak / 1024:.0f}KB gz={os.path.getsize(dest) / 1024:.0f}KB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
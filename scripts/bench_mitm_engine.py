@@ -0,0 +1,104 @@
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import psutil  # noqa: E402
+
+from app.config.common import ADDONS_DIR  # noqa: E402
+from app.mitm.inprocess_engine import InProcessMitmEngine  # noqa: E402
+
+ADDON = os.path.join(ADDONS_DIR, "get_code.py")
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def listening(port: int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.05)
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+
+
+def run_subprocess(confdir: str, timeout: float):
+    """与 MitmService 子进程模式一致：启动 runner 后每 100ms 检查一次端口"""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.mitm.embedded_runner", "--host", "127.0.0.1", "--port", str(port),
+         "--addon", ADDON, "--confdir", confdir],
+        cwd=str(ROOT), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if listening(port):
+                return time.perf_counter() - started, psutil.Process(process.pid).memory_info().rss
+            time.sleep(0.1)
+        raise RuntimeError("subprocess engine did not start")
+    finally:
+        process.kill()
+        process.wait()
+
+
+def run_inprocess(confdir: str, timeout: float):
+    port = free_port()
+    engine = InProcessMitmEngine("127.0.0.1", port, ADDON, confdir)
+    me = psutil.Process()
+    rss_before = me.memory_info().rss
+    started = time.perf_counter()
+    if not engine.start(timeout):
+        raise RuntimeError(engine.last_error)
+    elapsed = time.perf_counter() - started
+    rss_delta = me.memory_info().rss - rss_before
+    assert listening(port), "ready signalled but port is not listening"
+    stop_started = time.perf_counter()
+    engine.stop()
+    stop_elapsed = time.perf_counter() - stop_started
+    return elapsed, rss_delta, stop_elapsed, listening(port)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="对比 mitm 子进程模式与内置引擎的启动延迟和内存")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        import mitmproxy  # noqa: F401
+    except ImportError:
+        print("[bench] mitmproxy 未安装，无法启动 mitm")
+        return 1
+
+    with tempfile.TemporaryDirectory() as confdir:
+        # 预先生成 CA 证书，避免计入首轮
+        run_subprocess(confdir, args.timeout)
+
+        elapsed, rss = run_subprocess(confdir, args.timeout)
+        print(f"[bench] subprocess  ready={elapsed * 1000:.0f}ms child_rss={rss / 1024 / 1024:.1f}MB")
+
+        elapsed, rss_delta, stop_elapsed, still_listening = run_inprocess(confdir, args.timeout)
+        print(
+            f"[bench] in-process  ready={elapsed * 1000:.0f}ms rss_delta={rss_delta / 1024 / 1024:.1f}MB "
+            f"stop={stop_elapsed * 1000:.0f}ms port_released={not still_listening}"
+        )
+
+        # 已启动过一次后再次启动（模块已导入）
+        elapsed, _, _, _ = run_inprocess(confdir, args.timeout)
+        print(f"[bench] in-process  restart ready={elapsed * 1000:.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,145 @@
+import argparse
+import datetime
+import http.server
+import os
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import psutil  # noqa: E402
+import requests  # noqa: E402
+import urllib3  # noqa: E402
+
+from app.config.common import ADDONS_DIR  # noqa: E402
+
+urllib3.disable_warnings()
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def write_self_signed(directory: str):
+    """生成非目标域名(localhost)的自签名证书，用于判断连接是否被 mitm 解密"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "bench-origin")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1)).not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    cert_file = os.path.join(directory, "origin.pem")
+    key_file = os.path.join(directory, "origin.key")
+    with open(cert_file, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_file, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption()))
+    return cert_file, key_file
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b"x" * 32 * 1024
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_origin(cert_file, key_file) -> int:
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_file, key_file)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+
+def peer_issuer(proxy_port: int, origin_port: int) -> str:
+    """经代理 CONNECT 后读取对端证书的签发者"""
+    with socket.create_connection(("127.0.0.1", proxy_port), timeout=5) as sock:
+        sock.sendall(f"CONNECT localhost:{origin_port} HTTP/1.1\r\nHost: localhost:{origin_port}\r\n\r\n".encode())
+        sock.recv(4096)
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        with context.wrap_socket(sock, server_hostname="localhost") as tls:
+            from cryptography import x509
+
+            cert = x509.load_der_x509_certificate(tls.getpeercert(binary_form=True))
+            return cert.issuer.rfc4514_string()
+
+
+def run_case(label, extra_args, confdir, origin_port, requests_count):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.mitm.embedded_runner", "--host", "127.0.0.1", "--port", str(port),
+         "--addon", os.path.join(ADDONS_DIR, "get_code.py"), "--confdir", confdir, *extra_args],
+        cwd=str(ROOT), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            with socket.socket() as sock:
+                if sock.connect_ex(("127.0.0.1", port)) == 0:
+                    break
+            time.sleep(0.05)
+        issuer = peer_issuer(port, origin_port)
+        proc = psutil.Process(process.pid)
+        cpu_before = sum(proc.cpu_times()[:2])
+        proxies = {"https": f"http://127.0.0.1:{port}"}
+        started = time.perf_counter()
+        for _ in range(requests_count):
+            # 每次新建连接，模拟浏览器/微信的大量短连接
+            with requests.Session() as session:
+                session.get(f"https://localhost:{origin_port}/", proxies=proxies, verify=False, timeout=10)
+        elapsed = time.perf_counter() - started
+        cpu = sum(proc.cpu_times()[:2]) - cpu_before
+        print(f"[bench] {label:<12} issuer={issuer!r} wall={elapsed:.2f}s proxy_cpu={cpu:.2f}s")
+    finally:
+        process.kill()
+        process.wait()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="对比非目标域名 TLS 透传与全部解密时 mitm 的 CPU 开销")
+    parser.add_argument("--requests", type=int, default=100)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        origin_port = start_origin(*write_self_signed(tmp))
+        confdir = os.path.join(tmp, "conf")
+        run_case("intercept", ["--intercept-all"], confdir, origin_port, args.requests)
+        run_case("passthrough", [], confdir, origin_port, args.requests)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import psutil  # noqa: E402
+
+from app.config.common import ADDONS_DIR  # noqa: E402
+
+# 旧入口：main.py 在分发 --mitm-runner 之前已经导入了 Qt 和整个界面
+LEGACY_ENTRY = (
+    "import sys\n"
+    "from PySide6.QtWidgets import QApplication, QMessageBox\n"
+    "from app.gui.windows.modern_window import ModernWindow\n"
+    "from app.mitm.embedded_runner import main\n"
+    "raise SystemExit(main(sys.argv[1:]))\n"
+)
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def listening(port: int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.05)
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+
+
+def measure(entry: list, confdir: str, timeout: float):
+    port = free_port()
+    runner_args = ["--host", "127.0.0.1", "--port", str(port), "--addon",
+                   os.path.join(ADDONS_DIR, "get_code.py"), "--confdir", confdir]
+    env = dict(os.environ, PYTHONUTF8="1", QT_QPA_PLATFORM="offscreen")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [*entry, *runner_args], cwd=str(ROOT), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"runner exited with {process.returncode}")
+            if listening(port):
+                elapsed = time.perf_counter() - started
+                rss = psutil.Process(process.pid).memory_info().rss
+                return elapsed, rss
+            time.sleep(0.01)
+        raise RuntimeError("runner did not start listening in time")
+    finally:
+        process.kill()
+        process.wait()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="测量 mitm runner 从启动到监听端口的耗时与常驻内存")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        import mitmproxy  # noqa: F401
+    except ImportError:
+        print("[bench] mitmproxy 未安装，无法启动 runner")
+        return 1
+
+    cases = (
+        ("gui-stack", [sys.executable, "-c", LEGACY_ENTRY]),
+        ("runner", [sys.executable, "-m", "app.mitm.embedded_runner"]),
+    )
+    with tempfile.TemporaryDirectory() as confdir:
+        # 先跑一次生成 CA 证书，避免首轮计入证书生成时间
+        measure(cases[1][1], confdir, args.timeout)
+        for label, entry in cases:
+            samples = [measure(entry, confdir, args.timeout) for _ in range(args.runs)]
+            startup = statistics.median(s[0] for s in samples)
+            rss = statistics.median(s[1] for s in samples)
+            print(f"[bench] {label:<10} start_to_listen={startup * 1000:.0f}ms rss={rss / 1024 / 1024:.1f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
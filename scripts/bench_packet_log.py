@@ -0,0 +1,96 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.config.common import ADDONS_DIR  # noqa: E402
+from app.mitm.embedded_runner import load_addon_module  # noqa: E402
+
+
+def legacy_append(path):
+    """旧实现：每一行都 makedirs + 打开/追加/关闭文件"""
+
+    def append_packet_log(message: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        now = datetime.now().strftime("%H:%M:%S")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f"{now} | {message}\n")
+
+    return append_packet_log
+
+
+def make_flows(count):
+    from mitmproxy.test import tflow
+
+    flows = []
+    for index in range(count):
+        flow = tflow.tflow(resp=True)
+        flow.request.host = "xcx.xybsyw.com"
+        flow.request.path = f"/student/clock/list.action?traineeId={index}&page=1"
+        flow.request.headers["user-agent"] = "Mozilla/5.0 MicroMessenger/8.0.49"
+        flow.request.urlencoded_form = [("traineeId", str(index)), ("openId", "oAbCdEfGhIjK")]
+        flows.append(flow)
+    return flows
+
+
+def run(addon, flows):
+    get_code = addon.GetCode()
+    started = time.perf_counter()
+    for flow in flows:
+        get_code.request(flow)
+        get_code.response(flow)
+    return time.perf_counter() - started
+
+
+def line_count(path):
+    total = 0
+    for name in os.listdir(os.path.dirname(path)):
+        if name.startswith(os.path.basename(path)):
+            with open(os.path.join(os.path.dirname(path), name), encoding="utf-8") as f:
+                total += sum(1 for _ in f)
+    return total
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="测量 GetCode addon 每个目标 flow 的日志写入开销")
+    parser.add_argument("--flows", type=int, default=2000)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        addon = load_addon_module(os.path.join(ADDONS_DIR, "get_code.py"))
+    except ImportError:
+        print("[bench] mitmproxy 未安装，无法加载 addon")
+        return 1
+    flows = make_flows(args.flows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "legacy", "mitm_packet.log")
+        addon.append_packet_log = legacy_append(path)
+        elapsed = run(addon, flows)
+        print(f"[bench] legacy    per_flow={elapsed / args.flows * 1e6:.0f}us lines={line_count(path)}")
+
+        path = os.path.join(tmp, "buffered", "mitm_packet.log")
+        writer = addon.PacketLogWriter(path, max_bytes=256 * 1024)
+        addon.PACKET_LOG = writer
+        addon.append_packet_log = writer.append
+        elapsed = run(addon, flows)
+        writer.close()
+        files = sorted(os.listdir(os.path.dirname(path)))
+        print(
+            f"[bench] buffered  per_flow={elapsed / args.flows * 1e6:.0f}us lines={line_count(path)} "
+            f"dropped={writer.dropped} files={files}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication, QTextEdit  # noqa: E402
+
+from app.gui.components.packet_log_console import LogTail, PacketLogConsole  # noqa: E402
+
+SAMPLE = (
+    "12:00:00 | [MITM][REQ] POST xcx.xybsyw.com/student/clock/PostNew.action",
+    "12:00:00 | [MITM][REQ] content-type=application/x-www-form-urlencoded | ua=Mozilla/5.0",
+    "12:00:00 | [MITM][REQ][FORM] traineeId=1162161, openId=oAbCdE...",
+    "12:00:00 | [MITM][RESP] 200 xcx.xybsyw.com/student/clock/PostNew.action",
+    "12:00:00 | [MITM][HOST] res.servicewechat.com",
+)
+
+
+class LegacyView:
+    """旧实现：每个 tick 读取偏移后的全部内容，逐行 append HTML"""
+
+    def __init__(self, path):
+        self.path = path
+        self.pos = 0
+        self.view = QTextEdit()
+        self.view.setReadOnly(True)
+
+    def tick(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            f.seek(self.pos)
+            content = f.read()
+            self.pos = f.tell()
+        for line in content.splitlines():
+            self.view.append(f'<span style="color:#7FDBFF; font-family:Consolas; font-size:9.5pt;">{line}</span>')
+
+
+class ConsoleView:
+    def __init__(self, path):
+        self.tail = LogTail(path)
+        self.view = PacketLogConsole()
+
+    def tick(self):
+        truncated, text = self.tail.read()
+        if truncated:
+            self.view.clear()
+        self.view.append_lines(text)
+
+
+def run(app, label, view_cls, ticks, lines_per_tick):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mitm_packet.log")
+        open(path, "w").close()
+        view = view_cls(path)
+        view.view.resize(600, 140)
+        view.view.show()
+        costs = []
+        for tick in range(ticks):
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{SAMPLE[i % len(SAMPLE)]} #{tick}-{i}\n" for i in range(lines_per_tick)))
+            started = time.perf_counter()
+            view.tick()
+            app.processEvents()
+            costs.append(time.perf_counter() - started)
+        blocks = view.view.document().blockCount()
+        first = sum(costs[:5]) / 5 * 1000
+        last = sum(costs[-5:]) / 5 * 1000
+        print(f"[bench] {label:<8} first_ticks={first:.1f}ms last_ticks={last:.1f}ms blocks={blocks}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="测量抓包日志控制台每次刷新的 UI 线程耗时")
+    parser.add_argument("--ticks", type=int, default=40)
+    parser.add_argument("--lines-per-tick", type=int, default=500)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = QApplication.instance() or QApplication([])
+    run(app, "legacy", LegacyView, args.ticks, args.lines_per_tick)
+    run(app, "console", ConsoleView, args.ticks, args.lines_per_tick)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.utils.proxy_state import FakeProxyBackend, ProxyState  # noqa: E402
+
+TARGET_PROXY = "127.0.0.1:13140"
+
+
+def simulate(state, backend, duration, tick, hijack_at):
+    """模拟 MonitorThread 读取 + wait_code 心跳：代理被外部改掉后重新设置。"""
+    reasserted_after = None
+    hijacked_at = None
+    calls = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        now = time.perf_counter() - started
+        if hijacked_at is None and now >= hijack_at:
+            backend.set_external("10.0.0.1:7890")
+            hijacked_at = time.perf_counter()
+        state.get()  # MonitorThread
+        if state.get() != TARGET_PROXY:  # heartbeat
+            state.set(TARGET_PROXY)
+            if hijacked_at is not None and reasserted_after is None:
+                reasserted_after = time.perf_counter() - hijacked_at
+        calls += 2
+        time.sleep(tick)
+    return calls, reasserted_after
+
+
+def run_case(label, state, backend, args):
+    calls, reasserted = simulate(state, backend, args.duration, args.tick, args.duration / 2)
+    reassert_text = f"{reasserted * 1000:.0f}ms" if reasserted is not None else "never"
+    print(
+        f"[bench] {label:<14} calls={calls} backend_reads={backend.reads} "
+        f"read_cost≈{backend.reads * backend.read_delay * 1000:.0f}ms reassert={reassert_text}"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="用内存代理后端测量代理状态缓存的读取次数与心跳响应")
+    parser.add_argument("--duration", type=float, default=4.0)
+    parser.add_argument("--tick", type=float, default=0.02)
+    parser.add_argument("--read-delay", type=float, default=0.03, help="模拟一次 reg/networksetup 查询的耗时")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    backend = FakeProxyBackend(TARGET_PROXY, read_delay=args.read_delay)
+    run_case("uncached", ProxyState(backend, refresh_interval=0), backend, args)
+
+    backend = FakeProxyBackend(TARGET_PROXY, read_delay=args.read_delay)
+    run_case("timer", ProxyState(backend, refresh_interval=0.5), backend, args)
+
+    backend = FakeProxyBackend(TARGET_PROXY, read_delay=args.read_delay, supports_notifications=True)
+    state = ProxyState(backend, refresh_interval=60)
+    try:
+        run_case("notifications", state, backend, args)
+    finally:
+        state.close()
+    print(f"[bench] threads alive: {threading.active_count()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
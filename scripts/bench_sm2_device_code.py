@@ -0,0 +1,71 @@
+import argparse
+import secrets
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from gmssl import sm2  # noqa: E402
+
+from app.config.common import XYB_SM2_MODE, XYB_SM2_PUBLIC_KEY  # noqa: E402
+from app.utils.sm2_engine import SM2_N, SM2Encryptor, get_encryptor  # noqa: E402
+
+SAMPLE = (
+    "b|_OnePlus,PHP110,Android 15,androidaid|_wx9f1c2e0bbc10673ct|_1763557557282"
+    "uid|_AbCdEfGhIjKlMnOpoid|_oAbCdEfGhIjKlMnOpQrStUvWxYz0"
+).encode()
+
+
+def gmssl_encrypt(data: bytes) -> bytes:
+    crypt = sm2.CryptSM2(public_key=XYB_SM2_PUBLIC_KEY, private_key=None, mode=XYB_SM2_MODE)
+    return crypt.encrypt(data)
+
+
+def check_compatibility(rounds: int):
+    engine = get_encryptor(XYB_SM2_PUBLIC_KEY, XYB_SM2_MODE)
+    for i in range(rounds):
+        k = secrets.randbelow(SM2_N - 1) + 1
+        data = SAMPLE[: 1 + i * 7 % len(SAMPLE)]
+        with mock.patch("gmssl.func.random_hex", return_value=f"{k:064x}"):
+            expected = gmssl_encrypt(data)
+        actual = engine.encrypt(data, k=k)
+        if actual != expected:
+            raise AssertionError(f"SM2 输出不一致: k={k:064x}")
+    print(f"[bench] compatibility ok ({rounds} samples)")
+
+
+def measure(label, func, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    per_call = (time.perf_counter() - started) * 1000 / rounds
+    print(f"[bench] {label:<8} {per_call:.3f}ms/call")
+    return per_call
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="对比 gmssl 与预计算 SM2 引擎的设备码加密耗时")
+    parser.add_argument("--rounds", type=int, default=50)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    check_compatibility(20)
+
+    started = time.perf_counter()
+    SM2Encryptor(XYB_SM2_PUBLIC_KEY, XYB_SM2_MODE)
+    print(f"[bench] table build {(time.perf_counter() - started) * 1000:.1f}ms (once per process)")
+
+    engine = get_encryptor(XYB_SM2_PUBLIC_KEY, XYB_SM2_MODE)
+    before = measure("gmssl", lambda: gmssl_encrypt(SAMPLE), args.rounds)
+    after = measure("engine", lambda: engine.encrypt(SAMPLE), args.rounds)
+    print(f"[bench] speedup x{before / after:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
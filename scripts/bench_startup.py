@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+WINDOW_MODULE = "app.gui.windows.modern_window"
+# 这些模块只应在首次使用对应功能时加载，出现在启动阶段即视为回退
+DEFERRED_MODULES = (
+    "requests",
+    "urllib3",
+    "psutil",
+    "gmssl",
+    "qrcode",
+    "PIL",
+    "asyncio",
+    "http.server",
+    "app.apis",
+    "app.workers.sign_task",
+    "app.workers.update_worker",
+    "app.gui.dialogs",
+)
+
+# 子进程：从导入到窗口第一次收到 Paint 事件的耗时；mitm 设为按需模式，避免基准测试拉起 mitm。
+# modules 记录导入窗口模块之后、创建窗口之前已加载的模块（监控线程随后在后台加载 psutil 属于预期）
+FIRST_PAINT_SCRIPT = r"""
+import json, os, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from app.mitm.lifecycle import ON_DEMAND, get_mitm_lifecycle
+get_mitm_lifecycle().mode = ON_DEMAND
+from app.gui.windows.modern_window import ModernWindow
+imported = time.perf_counter()
+import_modules = sorted(sys.modules)
+win = ModernWindow()
+constructed = time.perf_counter()
+
+class PaintProbe(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            print(json.dumps({
+                "import_ms": (imported - started) * 1000,
+                "construct_ms": (constructed - imported) * 1000,
+                "first_paint_ms": (time.perf_counter() - started) * 1000,
+                "modules": import_modules,
+            }), flush=True)
+            os._exit(0)
+        return False
+
+probe = PaintProbe()
+app.installEventFilter(probe)
+win.show()
+QTimer.singleShot(15000, lambda: os._exit(2))
+app.exec()
+"""
+
+
+def child_env():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def import_time_us(python: str) -> int:
+    """-X importtime 输出中窗口模块的累计导入耗时（微秒）"""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {WINDOW_MODULE}"],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\S+)$", line)
+        if match and match.group(2) == WINDOW_MODULE:
+            return int(match.group(1))
+    raise RuntimeError(f"importtime 输出中没有 {WINDOW_MODULE}")
+
+
+def first_paint(python: str) -> dict:
+    result = subprocess.run(
+        [python, "-c", FIRST_PAINT_SCRIPT, str(ROOT)],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True, timeout=60,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"未捕获到首帧绘制（退出码 {result.returncode}）: {result.stderr[-2000:]}")
+
+
+def deferred_loaded(modules) -> list:
+    """已加载的延迟模块（按 DEFERRED_MODULES 中的前缀汇总）"""
+    return [
+        prefix for prefix in DEFERRED_MODULES
+        if any(name == prefix or name.startswith(prefix + ".") for name in modules)
+    ]
+
+
+def check(condition, message):
+    print(f"[check] {'ok  ' if condition else 'FAIL'} {message}")
+    return bool(condition)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="启动导入预算：-X importtime 与首帧绘制耗时，超出预算时返回非零")
+    parser.add_argument("--runs", type=int, default=3, help="取多次运行中的最小值以降低抖动")
+    parser.add_argument("--import-budget-ms", type=float, default=350, help="窗口模块累计导入耗时上限")
+    parser.add_argument("--paint-budget-ms", type=float, default=1000, help="进程内从导入到首帧绘制的耗时上限")
+    parser.add_argument("--python", default=sys.executable)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    imports = [import_time_us(args.python) / 1000 for _ in range(args.runs)]
+    paints = [first_paint(args.python) for _ in range(args.runs)]
+    best = min(paints, key=lambda item: item["first_paint_ms"])
+    print(f"[bench] importtime {WINDOW_MODULE} min={min(imports):.0f}ms runs={[round(v) for v in imports]}")
+    print(
+        f"[bench] first_paint min={best['first_paint_ms']:.0f}ms "
+        f"(import={best['import_ms']:.0f}ms construct={best['construct_ms']:.0f}ms) modules={len(best['modules'])}"
+    )
+
+    ok = True
+    ok &= check(min(imports) <= args.import_budget_ms, f"import {min(imports):.0f}ms <= {args.import_budget_ms:.0f}ms")
+    ok &= check(
+        best["first_paint_ms"] <= args.paint_budget_ms,
+        f"first paint {best['first_paint_ms']:.0f}ms <= {args.paint_budget_ms:.0f}ms",
+    )
+    loaded = deferred_loaded(best["modules"])
+    ok &= check(not loaded, f"deferred modules not imported with the window: {loaded or 'none'}")
+    print(f"[check] {'all passed' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
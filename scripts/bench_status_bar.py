@@ -0,0 +1,132 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt  # noqa: E402
+from PySide6.QtWidgets import QApplication, QLabel  # noqa: E402
+
+from app.gui.components.status_bar_model import StatusBarModel  # noqa: E402
+from app.utils.session_store import SessionStore  # noqa: E402
+
+KEYS = ["time", "pid", "net", "speed", "proxy", "mitm", "cert", "ip", "session"]
+
+
+def make_labels():
+    labels = {}
+    for key in KEYS:
+        label = QLabel("-")
+        label.setTextFormat(Qt.RichText)
+        labels[key] = label
+    return labels
+
+
+def full_tick(second, tick):
+    """旧版 MonitorThread 每秒发送的完整字段"""
+    return {
+        "time": (datetime(2026, 1, 1) + timedelta(seconds=second)).strftime("%H:%M:%S"),
+        "pid": os.getpid(),
+        "net": "WiFi",
+        "speed_d": tick % 3,
+        "speed_u": 0,
+        "ip": "192.168.1.10",
+        "proxy": "127.0.0.1:13140",
+        "mitm": True,
+        "cert": True,
+        "cert_detail": "匹配当前 mitm 证书",
+    }
+
+
+def legacy_tick(labels, data, session_file):
+    """旧版 update_status：每个标签重新 setText，且每秒从磁盘读取 session_cache.json"""
+    labels['time'].setText(f"🕔 当前时间: <span style='color:#FFF'>{data['time']}</span>")
+    labels['pid'].setText(f"🟢 PID: <span style='color:#58D68D'>{data['pid']}</span>")
+    labels['net'].setText(f"📶 网络: <span style='color:#58D68D'>{data['net']}</span>")
+    labels['speed'].setText(
+        f"🚀 速率: <span style='color:#58D68D'>↓ {data['speed_d']:.0f}K</span>"
+        f" <span style='color:#58D68D'>↑ {data['speed_u']:.0f}K</span>"
+    )
+    labels['ip'].setText(f"💻 IP: <span style='color:#FFF'>{data['ip']}</span>")
+    labels['proxy'].setText(f"🔗 代理: <span style='color:#58D68D'>{data['proxy']}</span>")
+    labels['mitm'].setText("🛡️ Mitm: <span style='color:#58D68D'>运行中</span>")
+    labels['cert'].setText(f"🔒 证书: <span style='color:#58D68D'>正常（{data['cert_detail']}）</span>")
+    with open(session_file, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    session_id = cache['sessionId']
+    time_str = datetime.fromtimestamp(cache['timestamp']).strftime("%Y-%m-%d %H:%M")
+    labels['session'].setText(
+        f"🗝️ SESSION: <span style='color:#58D68D'>...{session_id[-4:]}</span> "
+        f"<span style='color:#58D68D'>({time_str})</span>"
+    )
+    return len(KEYS)
+
+
+def diff_payloads(ticks):
+    """新版 MonitorThread：只发送变化字段（时间每秒变，速率偶尔变）"""
+    last = {}
+    for tick in range(ticks):
+        data = full_tick(tick, tick // 5)
+        yield {key: value for key, value in data.items() if last.get(key) != value}
+        last = data
+
+
+def run_legacy(app, ticks, session_file):
+    labels = make_labels()
+    set_texts = 0
+    started = time.perf_counter()
+    for tick in range(ticks):
+        set_texts += legacy_tick(labels, full_tick(tick, tick // 5), session_file)
+        app.processEvents()
+    return time.perf_counter() - started, set_texts
+
+
+def run_model(app, ticks, session_file):
+    labels = make_labels()
+    model = StatusBarModel(labels)
+    store = SessionStore(session_file)
+    session_version = None
+    set_texts = 0
+    started = time.perf_counter()
+    for data in diff_payloads(ticks):
+        set_texts += model.apply(data)
+        if 'time' in data and store.version != session_version:
+            session_version = store.version
+            set_texts += model.apply({'session': store.get()})
+        app.processEvents()
+    return time.perf_counter() - started, set_texts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="测量状态栏每次刷新在 GUI 线程上的耗时")
+    parser.add_argument("--ticks", type=int, default=2000)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = QApplication.instance() or QApplication([])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        session_file = os.path.join(tmp, "session_cache.json")
+        with open(session_file, "w", encoding="utf-8") as f:
+            json.dump({"sessionId": "ABCDEF123456", "timestamp": int(time.time()), "expire_seconds": 86400}, f)
+
+        for label, runner in (("legacy", run_legacy), ("view-model", run_model)):
+            elapsed, set_texts = runner(app, args.ticks, session_file)
+            print(
+                f"[bench] {label:<10} per_tick={elapsed / args.ticks * 1e6:.0f}us "
+                f"setText/tick={set_texts / args.ticks:.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+import argparse
+import io
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import requests  # noqa: E402
+
+from app.utils.trace import trace_request, trace_response  # noqa: E402
+
+
+def make_response(size_kb: int) -> requests.Response:
+    items = [{"traineeId": 1162161, "address": "某某省某某市某某区某某路", "index": i} for i in range(size_kb * 10)]
+    response = requests.Response()
+    response.status_code = 200
+    # 与服务端一致不带 charset，response.text 需要先做编码探测
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps({"code": "200", "data": items}, ensure_ascii=False).encode("utf-8")
+    return response
+
+
+def make_call():
+    url = "https://xcx.xybsyw.com/student/clock/PostNew.action"
+    headers = {"v": "1.6.39", "user-agent": "Mozilla/5.0 MicroMessenger/8.0.49", "encryptvalue": "a1b2c3d4e5f6" * 4,
+               "devicecode": "d" * 32}
+    data = {"traineeId": "1162161", "adcode": "440305", "lat": "22.54", "lng": "113.93", "address": "某某路"}
+    cookies = {"JSESSIONID": "0123456789ABCDEF0123456789ABCDEF"}
+    return url, headers, data, cookies
+
+
+def legacy(response, url, headers, data, cookies):
+    logging.debug(f"🛩️ 准备发起请求。url:{url}, headers:{headers}, data:{data}, cookies:{cookies}")
+    logging.debug(f"📡 收到响应:{response} {response.text}")
+
+
+def traced(response, url, headers, data, cookies):
+    trace_request(url, headers=headers, data=data, cookies=cookies)
+    trace_response(response)
+
+
+def measure(func, calls, response_kb):
+    url, headers, data, cookies = make_call()
+    total = 0.0
+    for _ in range(calls):
+        # 每次调用都是新的响应对象，response.text 不会命中上次的解码结果
+        response = make_response(response_kb)
+        started = time.perf_counter()
+        func(response, url, headers, data, cookies)
+        total += time.perf_counter() - started
+    return total / calls * 1e6
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="测量 API 请求跟踪日志的单次调用开销")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--response-kb", type=int, default=64, help="模拟响应体大小（约）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    sink = logging.StreamHandler(io.StringIO())
+    sink.setFormatter(logging.Formatter('%(asctime)s - %(message)s', "%H:%M:%S"))
+    root.addHandler(sink)
+
+    for label, level in (("gui-info", logging.INFO), ("debug-on", logging.DEBUG)):
+        sink.setLevel(level)
+        before = sink.stream.tell()
+        legacy_us = measure(legacy, args.calls, args.response_kb)
+        legacy_bytes = (sink.stream.tell() - before) // args.calls
+        before = sink.stream.tell()
+        traced_us = measure(traced, args.calls, args.response_kb)
+        traced_bytes = (sink.stream.tell() - before) // args.calls
+        print(
+            f"[bench] {label:<8} legacy={legacy_us:.0f}us/call ({legacy_bytes}B logged) "
+            f"trace={traced_us:.1f}us/call ({traced_bytes}B logged)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
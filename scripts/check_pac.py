@@ -0,0 +1,109 @@
+import argparse
+import shutil
+import socket
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.config.common import MITM_PROXY  # noqa: E402
+from app.utils import commands, pac, proxy_state  # noqa: E402
+from app.utils.pac import PAC_CONTENT_TYPE, PacServer, capture_hosts  # noqa: E402
+from app.utils.proxy_state import FakeProxyBackend, ProxyState  # noqa: E402
+
+EXPECTED = {
+    "xcx.xybsyw.com": f"PROXY {MITM_PROXY}",
+    "servicewechat.com": f"PROXY {MITM_PROXY}",
+    "API.JIELONG.COM": f"PROXY {MITM_PROXY}",
+    "mitm.it": f"PROXY {MITM_PROXY}",
+    "www.baidu.com": "DIRECT",
+    "xybsyw.com.example.org": "DIRECT",
+}
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def fetch(url: str):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.headers.get("Content-Type"), response.read().decode("utf-8")
+
+
+def evaluate_with_node(script: str) -> dict | None:
+    node = shutil.which("node")
+    if not node:
+        return None
+    program = script + "".join(
+        f"console.log(FindProxyForURL('https://{host}/', '{host}'));\n" for host in EXPECTED
+    )
+    output = subprocess.run([node, "-e", program], capture_output=True, text=True, check=True).stdout
+    return dict(zip(EXPECTED, output.splitlines()))
+
+
+def check(condition, message):
+    print(f"[check] {'ok  ' if condition else 'FAIL'} {message}")
+    return bool(condition)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="在任意平台上检查 PAC 生成、本机服务以及设置/恢复流程")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    parse_args(argv)
+    ok = True
+    # 用内存后端和随机端口替换全局单例，不会改动本机真实代理设置
+    backend = FakeProxyBackend(proxy="10.0.0.1:7890")
+    backend.pac = "http://corp.example/proxy.pac"
+    proxy_state._state = ProxyState(backend, refresh_interval=60)
+    server = PacServer(port=free_port())
+    pac._server = server
+
+    ok &= check(capture_hosts(), f"addon capture hosts: {capture_hosts()}")
+
+    origin = commands.set_proxy(MITM_PROXY, mode="pac")
+    ok &= check(origin is None, f"nothing to restore for the global proxy, returned origin={origin}")
+    ok &= check(backend.proxy == "10.0.0.1:7890", f"global proxy untouched: {backend.proxy}")
+    ok &= check(server.owns(backend.pac), f"system PAC -> {backend.pac}")
+    ok &= check(commands.is_proxy_active(MITM_PROXY, mode="pac"), "heartbeat sees PAC active")
+
+    content_type, script = fetch(backend.pac)
+    ok &= check(content_type == PAC_CONTENT_TYPE, f"served with Content-Type {content_type}")
+
+    results = evaluate_with_node(script)
+    if results is None:
+        print("[check] skip node 未安装，跳过 PAC 脚本求值")
+    else:
+        for host, expected in EXPECTED.items():
+            ok &= check(results[host] == expected, f"FindProxyForURL({host}) = {results[host]}")
+
+    commands.reset_proxy(origin, MITM_PROXY, mode="pac")
+    ok &= check(backend.pac == "http://corp.example/proxy.pac", f"previous PAC restored: {backend.pac}")
+    ok &= check(backend.proxy == "10.0.0.1:7890", f"global proxy after reset: {backend.proxy}")
+    try:
+        fetch(server.base_url)
+        stopped = False
+    except OSError:
+        stopped = True
+    ok &= check(stopped, "PAC server stopped after reset")
+
+    # 没有先前 PAC 时，reset 清除 PAC
+    backend.pac = None
+    origin = commands.set_proxy(MITM_PROXY, mode="pac")
+    ok &= check("自动代理" in commands.describe_proxy(mode="pac"), f"heartbeat label: {commands.describe_proxy(mode='pac')}")
+    commands.reset_proxy(origin, MITM_PROXY, mode="pac")
+    ok &= check(backend.pac is None, "PAC cleared when none was set before")
+
+    print(f"[check] {'all passed' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+import argparse
+import hashlib
+import random
+import re
+import sys
+import time
+import urllib.parse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.config.common import XYB_EXCLUDED_KEYS, XYB_KEY, XYB_N_HEADER  # noqa: E402
+from app.utils.params import XybRequestSigner, _normalize_header_token_value  # noqa: E402
+
+CORPUS = [
+    {},
+    {"traineeId": "11621617"},
+    {"openId": "oAbCdEfGhIjKlMnOp", "unionId": "oUnIoN-1234 5678"},
+    {"customerType": "STUDENT", "uploadType": "UPLOAD_STUDENT_CLOCK_IMGAGES", "publicRead": "true"},
+    {
+        "traineeId": "11621617", "adcode": "440305", "lat": "22.543096", "lng": "113.934528",
+        "address": "广东省深圳市南山区粤海街道科技园", "deviceName": "PHP110", "punchInStatus": "0",
+        "clockStatus": "2", "imgUrl": "temp/20251119/school/14422/xcx/student/clock/1.jpg",
+        "reason": "", "addressId": "null",
+    },
+    {
+        "punchInStatus": "0", "clockStatus": "1", "traineeId": "1", "adcode": "110105",
+        "model": "PHP110", "brand": "OnePlus", "platform": "android", "system": "Android 15",
+        "openId": "o1", "unionId": "u1", "lng": "116.397128", "lat": "39.916527",
+        "address": "北京市朝阳区", "deviceName": "PHP110",
+    },
+    {"year": "2025", "month": "11", "traineeId": "1", "id": ""},
+    {
+        "blogType": "1", "blogTitle": "第一周", "blogBody": "本周<b>完成</b> & 学习\r\n", "blogOpenType": "2",
+        "traineeId": "1", "isDraft": "0", "startDate": "2025-11-17", "endDate": "2025-11-23",
+        "backgroundTemplateId": "0", "fileJson": "[{\"fileName\":\"\"}]", "blogId": "undefined",
+    },
+    {"processType": "0", "content": "写一篇周记", "questionType": "0", "type": "0", "aiSessionMsgType": "4"},
+    {"blogType": "1", "planId": "", "reviewStatus": "null", "page": "1"},
+    {"a": "x<y>z", "b": "1-2-3", "c": " spaced  out ", "d": "line\nbreak\r"},
+    {"a": "中文，标点", "b": "100%", "c": "ok", "d": "emoji😀", "e": "\\uD83C[\\uDF00-\\uDFFF]"},
+    {"list": [3, 1, 2], "dict": {"b": 2, "a": "x"}, "none": None, "int": 42, "float": 1.5, "bool": True},
+    {"set": {"only"}, "tuple": ("a", "b"), "nested": {"k": [1, {"z": None}]}},
+    {key: f"value-{index}" for index, key in enumerate(XYB_EXCLUDED_KEYS)},
+]
+
+
+def legacy_header_token(e, l, p):
+    """重构前 get_header_token 的逐行拷贝，时间戳和随机下标改为参数传入。"""
+    n = list(XYB_KEY)
+    g = "".join(n[int(e)] for e in p)
+    u = {k: e[k] for k in sorted(e)}
+    d = ""
+    special_char_regex = re.compile(r"[`~!@#$%^&*()+=|{}':;',\[\].<>/?~！@#￥%……&*（）——+|{}【】‘；：”“’。，、？]")
+    for c in u:
+        value_text = _normalize_header_token_value(u[c])
+        if c not in XYB_EXCLUDED_KEYS and not special_char_regex.search(value_text):
+            d += value_text
+    d = f"{d}{l}{g}"
+    d = (d.replace(" ", "")
+         .replace("\n", "")
+         .replace("\r", "")
+         .replace("<", "")
+         .replace(">", "")
+         .replace("&", "")
+         .replace("-", "")
+         .replace(r"\uD83C[\uDF00-\uDFFF]", "")
+         .replace(r"\uD83D[\uDC00-\uDE4F]", ""))
+    d = urllib.parse.quote(d)
+    md5_value = hashlib.md5(d.encode('utf-8')).hexdigest()
+    return {
+        "m": md5_value,
+        "t": str(l),
+        "s": "_".join(p) if len(p) > 0 else "",
+        "n": XYB_N_HEADER
+    }
+
+
+def check_corpus(signer, rounds):
+    rng = random.Random(20251119)
+    indices = [str(i) for i in range(62)]
+    checked = 0
+    for data in CORPUS:
+        for _ in range(rounds):
+            timestamp = rng.randint(1_600_000_000, 1_900_000_000)
+            sample = rng.sample(indices, XybRequestSigner.SAMPLE_SIZE)
+            expected = legacy_header_token(data, timestamp, sample)
+            actual = signer.header_token(data, timestamp=timestamp, sample=sample)
+            if actual != expected:
+                raise AssertionError(f"签名不一致: data={data!r} t={timestamp} s={sample}")
+            checked += 1
+    print(f"[check] {checked} signatures identical across {len(CORPUS)} payloads")
+
+
+def measure(signer, rounds):
+    data = CORPUS[4]
+    sample = [str(i) for i in range(XybRequestSigner.SAMPLE_SIZE)]
+    timestamp = int(time.time())
+    for label, func in (
+        ("legacy", lambda: legacy_header_token(data, timestamp, sample)),
+        ("signer", lambda: signer.header_token(data, timestamp=timestamp, sample=sample)),
+    ):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        print(f"[bench] {label:<6} {(time.perf_counter() - started) * 1e6 / rounds:.1f}us/call")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="校验 XybRequestSigner 与旧版 get_header_token 输出一致")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--bench-rounds", type=int, default=20000)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    signer = XybRequestSigner()
+    check_corpus(signer, args.rounds)
+    measure(signer, args.bench_rounds)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())